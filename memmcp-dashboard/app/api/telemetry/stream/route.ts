@@ -0,0 +1,16 @@
+import { streamOrchestrator } from "@/lib/orchestrator";
+
+export const dynamic = "force-dynamic";
+
+export async function GET(req: Request) {
+  const upstream = await streamOrchestrator("/telemetry/stream", {
+    signal: req.signal,
+  });
+  return new Response(upstream.body, {
+    headers: {
+      "content-type": "text/event-stream",
+      "cache-control": "no-cache",
+      connection: "keep-alive",
+    },
+  });
+}
@@ -1,8 +1,6 @@
 import { ProjectsPanel } from "../components/ProjectsPanel";
 import { NewEntryForm } from "../components/NewEntryForm";
-import { TelemetryPanel } from "../components/TelemetryPanel";
-import { CompoundingPanel } from "../components/CompoundingPanel";
-import { StrategyPanel } from "../components/StrategyPanel";
+import { LiveTelemetry } from "../components/LiveTelemetry";
 
 async function fetchStatus() {
   const res = await fetch("/api/memory/status", { cache: "no-store" });
@@ -79,9 +77,7 @@ export default async function DashboardPage() {
           ))}
         </div>
       </section>
-      <CompoundingPanel trading={trading} />
-      <StrategyPanel strategies={strategies} />
-      <TelemetryPanel queueMetrics={telemetry} tradingMetrics={trading} />
+      <LiveTelemetry telemetry={telemetry} trading={trading} strategies={strategies} />
       <ProjectsPanel />
       <NewEntryForm />
     </div>
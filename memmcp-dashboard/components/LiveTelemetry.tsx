@@ -0,0 +1,50 @@
+"use client";
+
+import { useEffect, useState } from "react";
+import { applyTelemetryDelta } from "../lib/telemetryDelta";
+import { CompoundingPanel } from "./CompoundingPanel";
+import { StrategyPanel } from "./StrategyPanel";
+import { TelemetryPanel } from "./TelemetryPanel";
+
+type Section = Record<string, any> | null;
+
+interface Props {
+  telemetry: Section;
+  trading: Section;
+  strategies: Section;
+}
+
+/**
+ * Renders the telemetry panels from the server-fetched props, then keeps
+ * them current from `/api/telemetry/stream`: the `snapshot` event replaces
+ * the live state and each `delta` event is folded in. History arrays only
+ * come from the initial fetch, since the stream carries current state.
+ */
+export function LiveTelemetry({ telemetry, trading, strategies }: Props) {
+  const [live, setLive] = useState<Record<string, any> | null>(null);
+
+  useEffect(() => {
+    const source = new EventSource("/api/telemetry/stream");
+    source.addEventListener("snapshot", (event) => {
+      setLive(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener("delta", (event) => {
+      const delta = JSON.parse((event as MessageEvent).data);
+      setLive((state) => (state ? applyTelemetryDelta(state, delta) : state));
+    });
+    // EventSource reconnects by itself and the server resends a snapshot
+    return () => source.close();
+  }, []);
+
+  const tradingNow = live ? { ...live.trading, history: trading?.history ?? [] } : trading;
+  const strategiesNow = live ? { ...live.strategies, history: strategies?.history ?? [] } : strategies;
+  const telemetryNow = live ? live.metrics : telemetry;
+
+  return (
+    <>
+      <CompoundingPanel trading={tradingNow} />
+      <StrategyPanel strategies={strategiesNow} />
+      <TelemetryPanel queueMetrics={telemetryNow} tradingMetrics={tradingNow} />
+    </>
+  );
+}
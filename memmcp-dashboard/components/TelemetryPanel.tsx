@@ -8,6 +8,20 @@ interface QueueMetrics {
     batches?: number;
     flushedEvents?: number;
   };
+  writeBehind?: {
+    enabled?: boolean;
+    queues?: Record<string, WriteBehindQueue>;
+  };
+}
+
+interface WriteBehindQueue {
+  queueDepth?: number;
+  lagMs?: number;
+  totals?: {
+    completed?: number;
+    retries?: number;
+    deadLettered?: number;
+  };
 }
 
 interface TradingMetrics {
@@ -52,6 +66,7 @@ export function TelemetryPanel({
 
   const queue = queueMetrics ?? {};
   const totals = queue.totals ?? {};
+  const writeBehind = queue.writeBehind?.enabled ? Object.entries(queue.writeBehind.queues ?? {}) : [];
   const trading = tradingMetrics ?? {};
   const positions = trading.positions ?? [];
   const recentHistory = Array.isArray(trading.history)
@@ -78,6 +93,18 @@ export function TelemetryPanel({
         <MetricCard label="Enqueued" value={totals.enqueued ?? 0} />
         <MetricCard label="Dropped" value={totals.dropped ?? 0} highlight={Boolean(totals.dropped)} />
       </div>
+      {writeBehind.map(([name, stats]) => (
+        <div key={`write-behind-${name}`} className="grid md:grid-cols-4 gap-4 mt-4 text-sm">
+          <MetricCard label={`${name} write-behind depth`} value={stats.queueDepth ?? 0} />
+          <MetricCard label="Lag" value={stats.lagMs ?? 0} suffix="ms" />
+          <MetricCard label="Completed" value={stats.totals?.completed ?? 0} />
+          <MetricCard
+            label="Dead-lettered"
+            value={stats.totals?.deadLettered ?? 0}
+            highlight={Boolean(stats.totals?.deadLettered)}
+          />
+        </div>
+      ))}
       {tradingMetrics && (
         <div className="mt-6 space-y-4">
           <div className="flex items-center justify-between">
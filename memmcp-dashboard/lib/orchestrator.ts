@@ -1,22 +1,64 @@
 const ORCHESTRATOR_URL =
   process.env.MEMMCP_ORCHESTRATOR_URL ?? "http://127.0.0.1:8075";
 
+// Last body per GET path, revalidated with If-None-Match so unchanged
+// telemetry comes back as an empty 304 instead of the full document.
+const ETAG_CACHE_MAX = 64;
+const etagCache = new Map<string, { etag: string; data: any }>();
+
 export async function callOrchestrator(
   path: string,
   init?: RequestInit,
 ): Promise<any> {
   const target = `${ORCHESTRATOR_URL}${path}`;
+  const isGet = (init?.method ?? "GET").toUpperCase() === "GET";
+  const cached = isGet ? etagCache.get(path) : undefined;
   const res = await fetch(target, {
     ...init,
     headers: {
       "content-type": "application/json",
+      ...(cached ? { "if-none-match": cached.etag } : {}),
       ...(init?.headers ?? {}),
     },
     cache: "no-store",
   });
+  if (res.status === 304 && cached) {
+    return cached.data;
+  }
   if (!res.ok) {
     const detail = await res.text();
     throw new Error(`Orchestrator ${path} failed: ${res.status} ${detail}`);
   }
-  return res.json();
+  const data = await res.json();
+  const etag = res.headers.get("etag");
+  if (isGet && etag) {
+    etagCache.delete(path);
+    if (etagCache.size >= ETAG_CACHE_MAX) {
+      etagCache.delete(etagCache.keys().next().value as string);
+    }
+    etagCache.set(path, { etag, data });
+  }
+  return data;
+}
+
+/**
+ * Open the orchestrator's Server-Sent Events telemetry stream. The body
+ * carries a `snapshot` event followed by `delta` events; fold them into
+ * state with `applyTelemetryDelta` from `lib/telemetryDelta`.
+ */
+export async function streamOrchestrator(
+  path: string,
+  init?: RequestInit,
+): Promise<Response> {
+  const target = `${ORCHESTRATOR_URL}${path}`;
+  const res = await fetch(target, {
+    ...init,
+    headers: { accept: "text/event-stream", ...(init?.headers ?? {}) },
+    cache: "no-store",
+  });
+  if (!res.ok || !res.body) {
+    const detail = await res.text();
+    throw new Error(`Orchestrator ${path} failed: ${res.status} ${detail}`);
+  }
+  return res;
 }
@@ -0,0 +1,35 @@
+type KeyedDelta = { upsert?: { key: string; item: any }[]; remove?: string[] };
+
+/**
+ * Apply one `delta` event from `/telemetry/stream` to the state received in
+ * its `snapshot` event. Returns a new object; sections that did not change
+ * keep their identity. Collection keys always come from the server: the
+ * snapshot's `keys` lists them in item order and deltas name them per item,
+ * and this function keeps `state.keys` in step.
+ */
+export function applyTelemetryDelta(
+  state: Record<string, any>,
+  delta: Record<string, any>,
+): Record<string, any> {
+  const next = { ...state };
+  for (const [section, change] of Object.entries(delta)) {
+    const current = { ...(state[section] ?? {}), ...(change.fields ?? {}) };
+    for (const [collection, keyed] of Object.entries(change)) {
+      if (collection === "fields") continue;
+      const keys: string[] = state.keys?.[section]?.[collection] ?? [];
+      const { upsert = [], remove = [] } = keyed as KeyedDelta;
+      const items = new Map<string, any>(
+        (current[collection] ?? []).map((item: any, i: number) => [keys[i], item]),
+      );
+      remove.forEach((key) => items.delete(key));
+      upsert.forEach(({ key, item }) => items.set(key, item));
+      current[collection] = Array.from(items.values());
+      next.keys = {
+        ...next.keys,
+        [section]: { ...next.keys?.[section], [collection]: Array.from(items.keys()) },
+      };
+    }
+    next[section] = current;
+  }
+  return next;
+}
@@ -1,8 +1,16 @@
-import os, httpx
+import os, json, time, random, socket, asyncio, threading, httpx
+from collections import OrderedDict, deque
+from concurrent.futures import Future
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 from fastmcp import FastMCP
-from fastembed import TextEmbedding
+from fastmcp.exceptions import ToolError
+from fastembed import TextEmbedding, SparseTextEmbedding
+
+try:  # cross-encoder reranking needs fastembed >= 0.4
+    from fastembed.rerank.cross_encoder import TextCrossEncoder
+except ImportError:
+    TextCrossEncoder = None
 
 # Config
 QDRANT_URL   = os.getenv("QDRANT_URL", "http://qdrant:6333")
@@ -11,13 +19,177 @@ ADV_PORT     = int(os.getenv("QDRANT_ADV_PORT", "8022"))
 EMB_MODEL    = os.getenv("EMBEDDING_MODEL_QDRANT", "sentence-transformers/all-MiniLM-L6-v2")
 EF_DEFAULT   = int(os.getenv("QDRANT_RUNTIME_EF_DEFAULT", "128"))
 EXACT_DFLT   = os.getenv("QDRANT_SEARCH_EXACT_DEFAULT", "false").lower() == "true"
+TIMEOUT      = float(os.getenv("QDRANT_ADV_TIMEOUT_SECS", "90"))
+POOL_SIZE    = int(os.getenv("QDRANT_ADV_POOL_MAX_CONNECTIONS", "16"))
+BATCH_MAX    = int(os.getenv("QDRANT_ADV_BATCH_MAX", "64"))
+CACHE_SIZE   = int(os.getenv("QDRANT_ADV_QUERY_CACHE", "1024"))   # 0 = off
+
+# Auto-tuning: sample live queries, compare HNSW against exact, keep the smallest ef meeting the target
+AUTOTUNE      = os.getenv("QDRANT_ADV_AUTOTUNE", "false").lower() == "true"
+RECALL_TARGET = float(os.getenv("QDRANT_ADV_RECALL_TARGET", "0.95"))
+TUNE_SAMPLE   = float(os.getenv("QDRANT_ADV_TUNE_SAMPLE_RATE", "0.05"))
+TUNE_WINDOW   = int(os.getenv("QDRANT_ADV_TUNE_WINDOW", "50"))        # recent samples kept per bucket
+TUNE_MIN      = int(os.getenv("QDRANT_ADV_TUNE_MIN_SAMPLES", "10"))
+EF_CANDIDATES = sorted({int(x) for x in os.getenv("QDRANT_ADV_EF_CANDIDATES", "16,32,64,128,256,512").split(",") if x.strip()})
+EXACT_BELOW   = int(os.getenv("QDRANT_ADV_EXACT_BELOW", "2000"))     # full scan when this few points match
+COUNT_TTL     = float(os.getenv("QDRANT_ADV_COUNT_TTL_SECS", "60"))
+
+# Hybrid dense + sparse search (collection written with named vectors, e.g. by the orchestrator's ORCH_SPARSE_MODEL mode)
+HYBRID_COLLECTION = os.getenv("QDRANT_ADV_HYBRID_COLLECTION", COLLECTION)
+DENSE_VECTOR  = os.getenv("QDRANT_ADV_DENSE_VECTOR", "dense")
+SPARSE_VECTOR = os.getenv("QDRANT_ADV_SPARSE_VECTOR", "bm25")
+SPARSE_MODEL  = os.getenv("QDRANT_ADV_SPARSE_MODEL", "Qdrant/bm25")
+RERANK_MODEL  = os.getenv("QDRANT_ADV_RERANK_MODEL", "")              # e.g. Xenova/ms-marco-MiniLM-L-6-v2; empty = off
+RERANK_TOP_N  = int(os.getenv("QDRANT_ADV_RERANK_TOP_N", "20"))
+TEXT_FIELDS   = [f for f in os.getenv("QDRANT_ADV_TEXT_FIELDS", "document,text,content,summary").split(",") if f]
+# per-stage latency budgets; optional stages (sparse, rerank) are skipped when over budget
+BUDGET_SPARSE_MS = float(os.getenv("QDRANT_ADV_BUDGET_SPARSE_MS", "150"))
+BUDGET_SEARCH_MS = float(os.getenv("QDRANT_ADV_BUDGET_SEARCH_MS", "2000"))
+BUDGET_RERANK_MS = float(os.getenv("QDRANT_ADV_BUDGET_RERANK_MS", "400"))
+
+PROCESS_START = time.monotonic()
 
 # Embedder (FastEmbed is light & CPU-friendly)
 # Docs: https://qdrant.github.io/fastembed/Getting%20Started/
-embedder = TextEmbedding(model_name=EMB_MODEL)
+# Loaded in the background once the listener is up (see start_warmup), so the
+# server binds immediately; early queries wait on this future.
+embedder_ready: Future = Future()
+
+metrics: Dict[str, Any] = {
+    "model": EMB_MODEL,
+    "cold_start_s": None,        # process start -> model loaded and warmed
+    "load_s": None,
+    "warmup_s": None,
+    "first_query_ms": None,
+    "cache_hits": 0,
+    "cache_misses": 0,
+}
+
+def _load_embedder():
+    started = time.monotonic()
+    model = TextEmbedding(model_name=EMB_MODEL)
+    loaded = time.monotonic()
+    # first inference builds the ONNX session state; pay it here, not on a query
+    list(model.embed(["warm up"]))
+    done = time.monotonic()
+    metrics["load_s"] = round(loaded - started, 3)
+    metrics["warmup_s"] = round(done - loaded, 3)
+    metrics["cold_start_s"] = round(done - PROCESS_START, 3)
+    return model
+
+def start_warmup(port: int, wait_secs: float = 10.0):
+    """Load and warm the model in a thread once ``port`` accepts connections."""
+    def run():
+        deadline = time.monotonic() + wait_secs
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+        try:
+            embedder_ready.set_result(_load_embedder())
+        except BaseException as exc:
+            embedder_ready.set_exception(exc)
+        sparse_model.start()
+        reranker.start()
+    # claim the future now so an early query waits instead of loading a second copy
+    embedder_ready.set_running_or_notify_cancel()
+    threading.Thread(target=run, name="embedder-warmup", daemon=True).start()
+
+async def get_embedder() -> TextEmbedding:
+    if not embedder_ready.done() and not embedder_ready.running():
+        # no warm-up thread (imported as a module): load on first use
+        embedder_ready.set_running_or_notify_cancel()
+        try:
+            embedder_ready.set_result(await asyncio.to_thread(_load_embedder))
+        except BaseException as exc:
+            embedder_ready.set_exception(exc)
+    return await asyncio.wrap_future(embedder_ready)
+
+class OptionalModel:
+    """A secondary model loaded in a background thread; requests never wait for the load."""
+
+    def __init__(self, name: str, factory):
+        self.name = name
+        self.factory = factory
+        self.model = None
+        self.error: Optional[str] = None
+        self.load_s: Optional[float] = None
+        self.started = False
+        if name and factory is None:
+            self.error = "not supported by the installed fastembed"
+
+    def start(self):
+        if self.started or not self.name or self.factory is None:
+            return
+        self.started = True
+        def run():
+            began = time.monotonic()
+            try:
+                self.model = self.factory(model_name=self.name)
+                self.load_s = round(time.monotonic() - began, 3)
+            except Exception as exc:
+                self.error = str(exc)
+        threading.Thread(target=run, name=f"load-{self.name}", daemon=True).start()
+
+    def get(self):
+        """The loaded model, or None (and kick off loading) if it isn't ready yet."""
+        self.start()
+        return self.model
+
+    def stats(self) -> Dict[str, Any]:
+        return {"model": self.name or None, "ready": self.model is not None, "load_s": self.load_s, "error": self.error}
+
+sparse_model = OptionalModel(SPARSE_MODEL, SparseTextEmbedding)
+reranker = OptionalModel(RERANK_MODEL, TextCrossEncoder)
+
+# query -> vector, keyed on model name so a model switch never serves stale vectors
+query_cache: "OrderedDict[tuple, List[float]]" = OrderedDict()
 
 mcp = FastMCP("Qdrant ADV")
 
+# one keep-alive pool for every Qdrant call
+_client: Optional[httpx.AsyncClient] = None
+
+def qdrant_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=QDRANT_URL,
+            timeout=httpx.Timeout(TIMEOUT, connect=10),
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+        )
+    return _client
+
+async def embed_queries(queries: List[str]) -> List[List[float]]:
+    """Embed all uncached queries in one FastEmbed call, off the event loop."""
+    by_text: Dict[str, List[float]] = {}
+    missing = []
+    for q in dict.fromkeys(queries):
+        vec = query_cache.get((EMB_MODEL, q))
+        if vec is None:
+            missing.append(q)
+        else:
+            query_cache.move_to_end((EMB_MODEL, q))
+            by_text[q] = vec
+    metrics["cache_hits"] += len(by_text)
+    metrics["cache_misses"] += len(missing)
+    if missing:
+        embedder = await get_embedder()
+        vectors = await asyncio.to_thread(lambda: [v.tolist() for v in embedder.embed(missing)])
+        for q, vec in zip(missing, vectors):
+            by_text[q] = vec
+            if CACHE_SIZE:
+                query_cache[(EMB_MODEL, q)] = vec
+        while len(query_cache) > CACHE_SIZE:
+            query_cache.popitem(last=False)
+    return [by_text[q] for q in queries]
+
+def record_first_query(started: float):
+    if metrics["first_query_ms"] is None:
+        metrics["first_query_ms"] = round((time.monotonic() - started) * 1000, 1)
+
 class FindArgs(BaseModel):
     query: str = Field(..., description="Natural language query to embed & search")
     limit: int = Field(10, ge=1, le=200, description="Top-K results")
@@ -27,16 +199,172 @@ class FindArgs(BaseModel):
     with_payload: bool = True
     with_vector: bool = False
 
-@mcp.tool(name="qdrant-find-adv")
-def qdrant_find_adv(args: FindArgs) -> Dict[str, Any]:
-    # Embed the query
-    vec = list(embedder.embed([args.query]))[0].tolist()
+class BatchFindArgs(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=BATCH_MAX, description="Natural language queries, searched together")
+    limit: int = Field(10, ge=1, le=200, description="Top-K results per query")
+    hnsw_ef: Optional[int] = Field(None, ge=1, description="Override ef at query-time")
+    exact: Optional[bool] = Field(None, description="Exact KNN (full scan) if true")
+    filter: Optional[Dict[str, Any]] = Field(None, description="Qdrant filter JSON, applied to every query")
+    with_payload: bool = True
+    with_vector: bool = False
+
+def _bucket(selectivity: Optional[float]) -> str:
+    if selectivity is None:
+        return "unfiltered"
+    for bound in (0.01, 0.1, 0.5):
+        if selectivity < bound:
+            return f"<{bound:g}"
+    return ">=0.5"
+
+class SearchTuner:
+    """Per (collection, filter-selectivity bucket) choice of hnsw_ef.
+
+    A fraction of live queries is re-run in the background once exact and once
+    per candidate ef; recall@k against the exact result and latency are kept
+    over a sliding window, and the smallest ef whose mean recall meets
+    RECALL_TARGET wins. Filters matching at most EXACT_BELOW points are sent
+    as exact searches outright, since a full scan of so few points is cheaper.
+    """
+
+    def __init__(self):
+        self.windows: Dict[tuple, deque] = {}
+        self.chosen: Dict[tuple, int] = {}
+        self.counts: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.totals: Dict[str, tuple] = {}
+        self.gate: Optional[asyncio.Semaphore] = None
+        self.tasks = set()
+        self.exact_auto = 0
+        self.sampled = 0
+        self.errors = 0
+
+    async def _count(self, collection, flt) -> Optional[int]:
+        now = time.monotonic()
+        if flt is None:
+            hit = self.totals.get(collection)
+            if hit and hit[0] > now:
+                return hit[1]
+            r = await qdrant_client().get(f"/collections/{collection}")
+            r.raise_for_status()
+            total = r.json().get("result", {}).get("points_count")
+            self.totals[collection] = (now + COUNT_TTL, total)
+            return total
+        key = (collection, json.dumps(flt, sort_keys=True))
+        hit = self.counts.get(key)
+        if hit and hit[0] > now:
+            self.counts.move_to_end(key)
+            return hit[1]
+        r = await qdrant_client().post(f"/collections/{collection}/points/count", json={"filter": flt, "exact": False})
+        r.raise_for_status()
+        count = r.json().get("result", {}).get("count")
+        self.counts[key] = (now + COUNT_TTL, count)
+        while len(self.counts) > 256:
+            self.counts.popitem(last=False)
+        return count
+
+    async def plan(self, collection, flt) -> tuple:
+        """Return (params, bucket) for a search the caller left untuned."""
+        try:
+            total = await self._count(collection, None)
+            matches = await self._count(collection, flt) if flt else total
+        except httpx.HTTPError:
+            self.errors += 1
+            return {"hnsw_ef": EF_DEFAULT, "exact": EXACT_DFLT}, None
+        if matches is not None and matches <= EXACT_BELOW:
+            self.exact_auto += 1
+            return {"exact": True}, None
+        selectivity = matches / total if flt and total and matches is not None else None
+        bucket = (collection, _bucket(selectivity))
+        return {"hnsw_ef": self.chosen.get(bucket, EF_DEFAULT), "exact": False}, bucket
 
-    # Build search body with runtime params (ef/exact)
+    def maybe_sample(self, bucket, vec, limit, flt):
+        if bucket is None or random.random() >= TUNE_SAMPLE:
+            return
+        task = asyncio.create_task(self._sample(bucket, vec, limit, flt))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _search(self, collection, vec, limit, flt, params):
+        body = {"vector": vec, "limit": limit, "params": params, "with_payload": False, "with_vector": False}
+        if flt:
+            body["filter"] = flt
+        started = time.monotonic()
+        r = await qdrant_client().post(f"/collections/{collection}/points/search", json=body)
+        r.raise_for_status()
+        return {p["id"] for p in r.json().get("result", [])}, time.monotonic() - started
+
+    async def _sample(self, bucket, vec, limit, flt):
+        if self.gate is None:
+            self.gate = asyncio.Semaphore(1)
+        collection = bucket[0]
+        # one sample at a time so tuning never competes hard with real traffic
+        async with self.gate:
+            try:
+                truth, _ = await self._search(collection, vec, limit, flt, {"exact": True})
+                if not truth:
+                    return
+                curve = {}
+                for ef in EF_CANDIDATES:
+                    got, secs = await self._search(collection, vec, limit, flt, {"hnsw_ef": ef, "exact": False})
+                    curve[ef] = (len(truth & got) / len(truth), secs)
+            except httpx.HTTPError:
+                self.errors += 1
+                return
+        self.sampled += 1
+        window = self.windows.setdefault(bucket, deque(maxlen=TUNE_WINDOW))
+        window.append(curve)
+        self._choose(bucket)
+
+    def _choose(self, bucket):
+        window = self.windows[bucket]
+        if len(window) < TUNE_MIN:
+            return
+        for ef in EF_CANDIDATES:
+            recalls = [c[ef][0] for c in window if ef in c]
+            if recalls and sum(recalls) / len(recalls) >= RECALL_TARGET:
+                self.chosen[bucket] = ef
+                return
+        self.chosen[bucket] = EF_CANDIDATES[-1]
+
+    def stats(self) -> Dict[str, Any]:
+        buckets = {}
+        for bucket, window in self.windows.items():
+            curve = {}
+            for ef in EF_CANDIDATES:
+                points = [c[ef] for c in window if ef in c]
+                if points:
+                    curve[ef] = {
+                        "recall": round(sum(p[0] for p in points) / len(points), 4),
+                        "latency_ms": round(sum(p[1] for p in points) / len(points) * 1000, 2),
+                    }
+            buckets[f"{bucket[0]}:{bucket[1]}"] = {
+                "hnsw_ef": self.chosen.get(bucket, EF_DEFAULT),
+                "samples": len(window),
+                "curve": curve,
+            }
+        return {
+            "enabled": AUTOTUNE,
+            "recall_target": RECALL_TARGET,
+            "sample_rate": TUNE_SAMPLE,
+            "exact_below": EXACT_BELOW,
+            "exact_auto": self.exact_auto,
+            "sampled": self.sampled,
+            "errors": self.errors,
+            "buckets": buckets,
+        }
+
+tuner = SearchTuner()
+
+async def search_params(args) -> tuple:
+    """Runtime params (ef/exact) for a search, plus the tuning bucket if auto-tuned."""
+    if AUTOTUNE and args.hnsw_ef is None and args.exact is None:
+        return await tuner.plan(COLLECTION, args.filter)
     params = {
         "hnsw_ef": args.hnsw_ef if args.hnsw_ef is not None else EF_DEFAULT,
         "exact": args.exact if args.exact is not None else EXACT_DFLT,
     }
+    return params, None
+
+def search_body(vec: List[float], args, params: Dict[str, Any]) -> Dict[str, Any]:
     body: Dict[str, Any] = {
         "vector": vec,
         "limit": args.limit,
@@ -46,16 +374,188 @@ def qdrant_find_adv(args: FindArgs) -> Dict[str, Any]:
     }
     if args.filter:
         body["filter"] = args.filter
+    return body
+
+@mcp.tool(name="qdrant-find-adv")
+async def qdrant_find_adv(args: FindArgs) -> Dict[str, Any]:
+    started = time.monotonic()
+    # Embed the query
+    vec = (await embed_queries([args.query]))[0]
+    params, bucket = await search_params(args)
 
     # POST /collections/{collection}/points/search
     # Qdrant search params doc: https://qdrant.tech/documentation/concepts/search/
-    r = httpx.post(f"{QDRANT_URL}/collections/{COLLECTION}/points/search",
-                   json=body, timeout=90)
+    r = await qdrant_client().post(f"/collections/{COLLECTION}/points/search", json=search_body(vec, args, params))
     r.raise_for_status()
+    record_first_query(started)
+    tuner.maybe_sample(bucket, vec, args.limit, args.filter)
     return r.json()
 
+@mcp.tool(name="qdrant-find-adv-batch")
+async def qdrant_find_adv_batch(args: BatchFindArgs) -> Dict[str, Any]:
+    """Search many queries at once: one embedding call, one Qdrant round trip."""
+    started = time.monotonic()
+    vecs = await embed_queries(args.queries)
+    # the filter is shared, so one plan covers every query
+    params, bucket = await search_params(args)
+
+    # POST /collections/{collection}/points/search/batch returns one result list per search, in order
+    searches = [search_body(vec, args, params) for vec in vecs]
+    r = await qdrant_client().post(f"/collections/{COLLECTION}/points/search/batch", json={"searches": searches})
+    r.raise_for_status()
+    data = r.json()
+    data["queries"] = args.queries
+    record_first_query(started)
+    for vec in vecs:
+        tuner.maybe_sample(bucket, vec, args.limit, args.filter)
+    return data
+
+class HybridFindArgs(BaseModel):
+    query: str = Field(..., description="Natural language query; exact identifiers (mints, strategy or file names) match via the sparse vector")
+    limit: int = Field(10, ge=1, le=200, description="Top-K results")
+    prefetch: Optional[int] = Field(None, ge=1, le=1000, description="Candidates fetched per vector before fusion (default 4x limit, at least 50)")
+    hnsw_ef: Optional[int] = Field(None, ge=1, description="Override ef for the dense prefetch")
+    filter: Optional[Dict[str, Any]] = Field(None, description="Qdrant filter JSON, applied to both prefetches")
+    rerank: Optional[bool] = Field(None, description="Cross-encoder rerank of the top candidates (default: on if a rerank model is configured)")
+    with_payload: bool = True
+    with_vector: bool = False
+
+def _payload_text(point: Dict[str, Any]) -> str:
+    payload = point.get("payload") or {}
+    for field in TEXT_FIELDS:
+        if isinstance(payload.get(field), str):
+            return payload[field]
+    return ""
+
+async def _within(budget_ms: float, fn):
+    """Run blocking ``fn`` in a thread; None if it misses the budget (the thread finishes on its own)."""
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(fn), timeout=budget_ms / 1000)
+    except asyncio.TimeoutError:
+        return None
+
+dense_sizes: Dict[str, int] = {}   # collection -> size of its dense named vector
+
+async def check_dense_size(dim: int) -> None:
+    """Fail clearly when query vectors don't match the hybrid collection's dense vector.
+
+    The collection's vectors come from whatever embedder the writer used, so a
+    different model here would otherwise surface as Qdrant's 400. The size is
+    read once per collection.
+    """
+    size = dense_sizes.get(HYBRID_COLLECTION)
+    if size is None:
+        r = await qdrant_client().get(f"/collections/{HYBRID_COLLECTION}")
+        r.raise_for_status()
+        vectors = r.json().get("result", {}).get("config", {}).get("params", {}).get("vectors") or {}
+        spec = vectors.get(DENSE_VECTOR) if isinstance(vectors, dict) else None
+        if not isinstance(spec, dict) or "size" not in spec:
+            raise ToolError(f"collection {HYBRID_COLLECTION!r} has no dense vector named {DENSE_VECTOR!r}; "
+                            "hybrid search needs the named-vector layout")
+        size = dense_sizes[HYBRID_COLLECTION] = int(spec["size"])
+    if size != dim:
+        raise ToolError(f"{EMB_MODEL} embeds queries as {dim}-d vectors but {HYBRID_COLLECTION!r} stores "
+                        f"{size}-d {DENSE_VECTOR!r} vectors; set EMBEDDING_MODEL_QDRANT to the model that "
+                        "wrote the collection")
+
+@mcp.tool(name="qdrant-find-hybrid")
+async def qdrant_find_hybrid(args: HybridFindArgs) -> Dict[str, Any]:
+    """Dense + sparse search fused with RRF inside Qdrant, optionally reranked by a cross-encoder."""
+    timings: Dict[str, float] = {}
+    stages: Dict[str, str] = {}
+
+    # 1) embed: dense is required; sparse is dropped if not loaded yet or over budget
+    t0 = time.monotonic()
+    dense_task = asyncio.ensure_future(embed_queries([args.query]))
+    sparse = None
+    model = sparse_model.get()
+    if model is None:
+        stages["sparse"] = "skipped: model loading" if not sparse_model.error else f"skipped: {sparse_model.error}"
+    else:
+        emb = await _within(BUDGET_SPARSE_MS, lambda: next(iter(model.query_embed(args.query))))
+        if emb is None:
+            stages["sparse"] = "skipped: over budget"
+        else:
+            sparse = {"indices": emb.indices.tolist(), "values": emb.values.tolist()}
+            stages["sparse"] = "ok"
+    dense = (await dense_task)[0]
+    timings["embed_ms"] = round((time.monotonic() - t0) * 1000, 1)
+    await check_dense_size(len(dense))
+
+    # 2) search: both prefetches and RRF fusion in one Query API call
+    use_rerank = reranker.name and (args.rerank if args.rerank is not None else True)
+    candidates = max(args.limit, RERANK_TOP_N) if use_rerank else args.limit
+    prefetch_n = args.prefetch or max(4 * candidates, 50)
+    dense_q: Dict[str, Any] = {"query": dense, "using": DENSE_VECTOR, "limit": prefetch_n,
+                               "params": {"hnsw_ef": args.hnsw_ef or EF_DEFAULT}}
+    if sparse is not None:
+        prefetch = [dense_q, {"query": sparse, "using": SPARSE_VECTOR, "limit": prefetch_n}]
+        if args.filter:
+            for p in prefetch:
+                p["filter"] = args.filter
+        body: Dict[str, Any] = {"prefetch": prefetch, "query": {"fusion": "rrf"}}
+    else:
+        body = {k: v for k, v in dense_q.items() if k != "limit"}
+        if args.filter:
+            body["filter"] = args.filter
+    body.update({"limit": candidates, "with_payload": args.with_payload or bool(use_rerank), "with_vector": args.with_vector})
+    t1 = time.monotonic()
+    budget_s = BUDGET_SEARCH_MS / 1000
+    r = await qdrant_client().post(
+        f"/collections/{HYBRID_COLLECTION}/points/query",
+        json=body,
+        params={"timeout": max(1, int(budget_s + 0.999))},
+        timeout=budget_s + 1,
+    )
+    r.raise_for_status()
+    points = r.json().get("result", {}).get("points", [])
+    timings["search_ms"] = round((time.monotonic() - t1) * 1000, 1)
+    stages["fusion"] = "rrf" if sparse is not None else "dense-only"
+
+    # 3) rerank: optional, top-N only, skipped when the model isn't ready or the budget runs out
+    if use_rerank and points:
+        model = reranker.get()
+        head = points[:RERANK_TOP_N]
+        t2 = time.monotonic()
+        scores = None
+        if model is None:
+            stages["rerank"] = "skipped: model loading" if not reranker.error else f"skipped: {reranker.error}"
+        else:
+            docs = [_payload_text(p) for p in head]
+            scores = await _within(BUDGET_RERANK_MS, lambda: list(model.rerank(args.query, docs)))
+            stages["rerank"] = "ok" if scores is not None else "skipped: over budget"
+        if scores is not None:
+            for p, score in zip(head, scores):
+                p["rerank_score"] = float(score)
+            head.sort(key=lambda p: p["rerank_score"], reverse=True)
+            points = head + points[RERANK_TOP_N:]
+        timings["rerank_ms"] = round((time.monotonic() - t2) * 1000, 1)
+
+    points = points[: args.limit]
+    if not args.with_payload:
+        for p in points:
+            p.pop("payload", None)
+    record_first_query(t0)
+    return {"result": points, "timings_ms": timings, "stages": stages}
+
+@mcp.tool(name="qdrant-adv-stats")
+def qdrant_adv_stats() -> Dict[str, Any]:
+    """Cold-start timings, first-query latency, query cache hit rate and ef auto-tuning state."""
+    lookups = metrics["cache_hits"] + metrics["cache_misses"]
+    return {
+        **metrics,
+        "model_ready": embedder_ready.done() and embedder_ready.exception() is None,
+        "uptime_s": round(time.monotonic() - PROCESS_START, 1),
+        "cache_entries": len(query_cache),
+        "cache_capacity": CACHE_SIZE,
+        "cache_hit_rate": round(metrics["cache_hits"] / lookups, 4) if lookups else 0.0,
+        "autotune": tuner.stats(),
+        "hybrid": {"sparse": sparse_model.stats(), "rerank": reranker.stats()},
+    }
+
 if __name__ == "__main__":
     # Streamable HTTP serves the MCP endpoint at /mcp
     # Doc shows the HTTP transport mounts at /mcp by default
     # https://gofastmcp.com/deployment/running-server
+    start_warmup(ADV_PORT)
     mcp.run(transport="streamable-http", host="0.0.0.0", port=ADV_PORT)
@@ -1,58 +1,146 @@
 #!/usr/bin/env python3
-import os, sys, json, threading, subprocess
-from fastapi import FastAPI, Request
+import os, json, time, signal, asyncio, itertools, logging
+from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse
 
+try:  # optional: enables the per-child memory ceiling
+    import psutil
+except ImportError:  # pragma: no cover
+    psutil = None
+
 app = FastAPI()
+logger = logging.getLogger("memmcp.memorybank_proxy")
+
+POOL_SIZE      = int(os.environ.get("MEMORYBANK_POOL_SIZE", "2"))
+MAX_REQUESTS   = int(os.environ.get("MEMORYBANK_MAX_REQUESTS", "0"))      # 0 = unlimited
+MAX_RSS_MB     = float(os.environ.get("MEMORYBANK_MAX_RSS_MB", "0"))      # 0 = unlimited
+WARM_TIMEOUT   = float(os.environ.get("MEMORYBANK_WARM_TIMEOUT", "120"))
+CHECK_INTERVAL = float(os.environ.get("MEMORYBANK_CHECK_INTERVAL", "10"))
+DRAIN_TIMEOUT  = float(os.environ.get("MEMORYBANK_DRAIN_TIMEOUT", "30"))
+RECYCLE_BACKOFF_MAX = float(os.environ.get("MEMORYBANK_RECYCLE_BACKOFF_MAX", "300"))
+
+# messages of the errors the bridge makes up itself when the child didn't answer
+BRIDGE_ERRORS = ("no response from child", "child stdin closed", "child did not answer")
+
+def _rpc_error(code, message, req_id):
+    return {"jsonrpc": "2.0", "error": {"code": code, "message": message}, "id": req_id}
 
 class Bridge:
-    def __init__(self):
+    """Multiplexed JSON-RPC bridge to one stdio MCP child.
+
+    Requests are written with a bridge-assigned id and a single reader task
+    routes each response back to its waiter, so many calls can be in flight
+    at once without blocking the event loop.
+    """
+
+    ids = itertools.count(1)
+
+    def __init__(self, index=0):
         # Allow override; default to memory-bank MCP on stdio
         self.cmd = os.environ.get("MEMORYBANK_CMD", "npx -y @allpepper/memory-bank-mcp")
-        self.lock = threading.Lock()
+        self.timeout = float(os.environ.get("MEMORYBANK_TIMEOUT", "60"))
+        self.index = index
         self.child = None
         self.started = False
+        self.ready = False
+        self.initialized = False
+        self.draining = False
+        self.pending = {}
+        self.sent_at = {}
+        self.write_lock = asyncio.Lock()
+        self.start_lock = asyncio.Lock()
+        self.init_lock = asyncio.Lock()
+        self.tasks = []
+        self.started_at = None
+        self.requests = 0
+        self.timeouts = 0
+        self.latency_ewma = 0.0
+        self.last_latency = 0.0
 
-    def start(self):
-        if self.started and self.child and self.child.poll() is None:
-            return
-        os.makedirs("logs", exist_ok=True)
-        env = os.environ.copy()
-        # sensible defaults if not provided by .env
-        env.setdefault("MONGODB_URI", "mongodb://127.0.0.1:27017")
-        env.setdefault("MEMORY_BANK_ROOT", os.path.abspath("data/memory-bank"))
-
-        # Start the child via shell so 'npx' resolves on user's PATH
-        self.child = subprocess.Popen(
-            self.cmd,
-            shell=True,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            bufsize=0,
-            env=env,
-        )
-
-        def _drain_stderr():
+    def alive(self):
+        return self.child is not None and self.child.returncode is None
+
+    async def start(self):
+        async with self.start_lock:
+            if self.started and self.alive():
+                return
+            os.makedirs("logs", exist_ok=True)
+            env = os.environ.copy()
+            # sensible defaults if not provided by .env
+            env.setdefault("MONGODB_URI", "mongodb://127.0.0.1:27017")
+            env.setdefault("MEMORY_BANK_ROOT", os.path.abspath("data/memory-bank"))
+
+            # Start the child via shell so 'npx' resolves on user's PATH
+            self.child = await asyncio.create_subprocess_shell(
+                self.cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                # own process group, so stop() also reaches what the shell spawned (npx -> node)
+                start_new_session=True,
+            )
+            self.tasks = [
+                asyncio.create_task(self._reader(self.child)),
+                asyncio.create_task(self._drain_stderr(self.child)),
+            ]
+            self.started = True
+            self.initialized = False
+            self.started_at = time.time()
+
+    async def warm(self):
+        """Start the child and wait for it to answer a ping, so npx cold start stays off the request path."""
+        await self.start()
+        resp = await self.send({"jsonrpc": "2.0", "id": "warmup", "method": "ping"}, timeout=WARM_TIMEOUT)
+        # Any JSON-RPC answer from the child (even "method not found") proves it is serving.
+        message = str((resp.get("error") or {}).get("message", ""))
+        self.ready = self.alive() and not message.startswith(BRIDGE_ERRORS)
+        return self.ready
+
+    async def stop(self):
+        self.ready = False
+        if self.alive():
+            self._signal(signal.SIGTERM)
             try:
-                with open("logs/memorybank-http.err", "ab", buffering=0) as f:
-                    while True:
-                        line = self.child.stderr.readline()
-                        if not line:
-                            break
-                        f.write(line)
-            except Exception:
-                pass
-
-        threading.Thread(target=_drain_stderr, daemon=True).start()
-        self.started = True
-
-    def _read_message(self):
+                await asyncio.wait_for(self.child.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                self._signal(signal.SIGKILL)
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        self.started = False
+
+    def _signal(self, sig):
+        try:
+            os.killpg(self.child.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    async def drain(self, timeout):
+        self.draining = True
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        await self.stop()
+
+    async def _drain_stderr(self, child):
+        try:
+            with open("logs/memorybank-http.err", "ab", buffering=0) as f:
+                while True:
+                    line = await child.stderr.readline()
+                    if not line:
+                        break
+                    f.write(line)
+        except Exception:
+            pass
+
+    async def _read_message(self, stdout):
         """Read Content-Length framed JSON-RPC response from child stdout."""
         headers = {}
         # Read header lines until blank line
         while True:
-            line = self.child.stdout.readline()
+            line = await stdout.readline()
             if not line:
                 return None
             if line in (b"\r\n", b"\n"):
@@ -66,35 +154,290 @@ class Bridge:
             length = int(headers.get(b"content-length", b"0"))
         except Exception:
             length = 0
-        body = self.child.stdout.read(length) if length > 0 else b""
+        body = await stdout.readexactly(length) if length > 0 else b""
         return body
 
-    def call(self, payload: dict):
-        data = json.dumps(payload).encode("utf-8")
-        with self.lock:
-            # Write request
-            self.child.stdin.write(b"Content-Length: " + str(len(data)).encode("ascii") + b"\r\n\r\n")
-            self.child.stdin.write(data)
-            self.child.stdin.flush()
-            # Read response
-            body = self._read_message()
-            if not body:
-                return {"jsonrpc": "2.0", "error": {"code": -32603, "message": "no response from child"}, "id": payload.get("id")}
+    async def _reader(self, child):
+        try:
+            while True:
+                body = await self._read_message(child.stdout)
+                if body is None:
+                    break
+                try:
+                    msg = json.loads(body.decode("utf-8"))
+                except Exception:
+                    continue
+                fut = self.pending.pop(msg.get("id"), None) if isinstance(msg, dict) else None
+                if fut is not None and not fut.done():
+                    fut.set_result(msg)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # Child went away: fail everything still waiting on it.
+            self.ready = False
+            self.initialized = False
+            for key, fut in list(self.pending.items()):
+                if not fut.done():
+                    fut.set_result(_rpc_error(-32603, "no response from child", None))
+                self.pending.pop(key, None)
+
+    async def call(self, payload: dict, timeout=None):
+        if not self.started or not self.alive():
+            # restart through warm() so a replaced child is marked ready again
+            # and goes back into the pool's rotation
+            try:
+                warmed = await self.warm()
+            except Exception as exc:
+                logger.warning("child %d failed to restart: %s", self.index, exc)
+                warmed = False
+            if not warmed:
+                return _rpc_error(-32603, "child not ready", payload.get("id"))
+        return await self.send(payload, timeout)
+
+    async def send(self, payload: dict, timeout=None):
+        """Write ``payload`` to the running child and wait for its answer."""
+        client_id = payload.get("id")
+        internal_id = next(self.ids)
+        data = json.dumps({**payload, "id": internal_id} if client_id is not None else payload).encode("utf-8")
+        fut = None
+        if client_id is not None:
+            fut = asyncio.get_running_loop().create_future()
+            self.pending[internal_id] = fut
+            self.sent_at[internal_id] = time.monotonic()
+        try:
+            async with self.write_lock:
+                self.child.stdin.write(b"Content-Length: " + str(len(data)).encode("ascii") + b"\r\n\r\n" + data)
+                await self.child.stdin.drain()
+        except (BrokenPipeError, ConnectionError):
+            self.pending.pop(internal_id, None)
+            self.sent_at.pop(internal_id, None)
+            return _rpc_error(-32603, "child stdin closed", client_id)
+        if fut is None:
+            # Notification: nothing to wait for
+            return None
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            resp = await asyncio.wait_for(fut, timeout=timeout)
+        except asyncio.TimeoutError:
+            self.pending.pop(internal_id, None)
+            self.timeouts += 1
+            return _rpc_error(-32603, f"child did not answer within {timeout:.0f}s", client_id)
+        finally:
+            started = self.sent_at.pop(internal_id, None)
+        if started is not None:
+            self.last_latency = time.monotonic() - started
+            self.latency_ewma = self.last_latency if not self.requests else 0.8 * self.latency_ewma + 0.2 * self.last_latency
+        self.requests += 1
+        resp = dict(resp)
+        resp["id"] = client_id
+        return resp
+
+    def rss_mb(self):
+        if psutil is None or not self.alive():
+            return None
+        try:
+            proc = psutil.Process(self.child.pid)
+            procs = [proc] + proc.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs) / (1024 * 1024)
+        except Exception:
+            return None
+
+    def recycle_reason(self):
+        if not self.alive():
+            return "exited"
+        if MAX_REQUESTS and self.requests >= MAX_REQUESTS:
+            return "max_requests"
+        rss = self.rss_mb()
+        if MAX_RSS_MB and rss is not None and rss > MAX_RSS_MB:
+            return "max_rss"
+        return None
+
+    def stats(self):
+        rss = self.rss_mb()
+        return {
+            "index": self.index,
+            "pid": self.child.pid if self.child else None,
+            "alive": self.alive(),
+            "ready": self.ready,
+            "initialized": self.initialized,
+            "draining": self.draining,
+            "queue_depth": len(self.pending),
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "latency_ms": round(self.latency_ewma * 1000, 2),
+            "last_latency_ms": round(self.last_latency * 1000, 2),
+            "uptime_s": round(time.time() - self.started_at, 1) if self.started_at else 0.0,
+            "rss_mb": round(rss, 1) if rss is not None else None,
+        }
+
+class BridgePool:
+    """N pre-warmed children with least-outstanding-requests routing and health-based recycling."""
+
+    def __init__(self, size):
+        self.size = max(1, size)
+        self.children = []
+        self.index = itertools.count()
+        self.recycled = {}
+        self.monitor = None
+        self.replacing = set()
+        self.background = set()
+        self.stopping = False
+        self.failures = 0       # replacements in a row that failed to warm
+        self.retry_at = 0.0     # no replacement attempts before this (monotonic)
+        self.failed = 0
+        self.handshake = None   # last client initialize, replayed on children that haven't seen one
+        self.handshake_child = None
+        self.replayed = 0
+
+    async def start(self):
+        self.children = [Bridge(next(self.index)) for _ in range(self.size)]
+        await asyncio.gather(*(c.warm() for c in self.children), return_exceptions=True)
+        self.monitor = asyncio.create_task(self._monitor())
+
+    async def stop(self):
+        self.stopping = True
+        # in-flight recycles stop whatever child they started when cancelled
+        tasks = list(self.background) + ([self.monitor] if self.monitor else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(*(c.stop() for c in self.children), return_exceptions=True)
+
+    def pick(self):
+        live = [c for c in self.children if c.alive() and c.ready and not c.draining]
+        if not live:
+            live = [c for c in self.children if not c.draining] or self.children
+        return min(live, key=lambda c: (len(c.pending), c.latency_ewma))
+
+    async def call(self, payload):
+        method = payload.get("method")
+        if method == "notifications/initialized":
+            # belongs to the child that answered the client's initialize;
+            # replayed handshakes already sent their own
+            child = self.handshake_child
+            if child is None or child not in self.children or not child.alive():
+                return None
+        else:
+            child = self.pick()
+        if method == "initialize":
+            self.handshake = payload
+        elif not child.initialized and self.handshake is not None:
+            await self._replay_handshake(child)
+        timeouts = child.timeouts
+        resp = await child.call(payload)
+        if child.timeouts > timeouts:
+            self._spawn(self.recycle(child, "hung"))
+        if method == "initialize" and resp and "result" in resp:
+            child.initialized = True
+            self.handshake_child = child
+        return resp
+
+    async def _replay_handshake(self, child):
+        """Send the client's initialize to a child that hasn't seen it.
+
+        Children are picked per request, so a session's later calls can land on
+        a child that was started or restarted after the client initialized.
+        """
+        async with child.init_lock:
+            if child.initialized:
+                return
+            resp = await child.call({**self.handshake, "id": "replay-initialize"})
+            if resp and "result" in resp:
+                await child.call({"jsonrpc": "2.0", "method": "notifications/initialized"})
+                child.initialized = True
+                self.replayed += 1
+            else:
+                logger.warning("child %d rejected the replayed initialize: %s", child.index, (resp or {}).get("error"))
+
+    def _spawn(self, coro):
+        if self.stopping:
+            coro.close()
+            return
+        task = asyncio.create_task(coro)
+        self.background.add(task)
+        task.add_done_callback(self.background.discard)
+
+    async def recycle(self, child, reason):
+        if child.index in self.replacing or child not in self.children:
+            return
+        if time.monotonic() < self.retry_at:
+            return
+        self.replacing.add(child.index)
+        try:
+            # Warm the replacement first so capacity never drops to zero.
+            fresh = Bridge(next(self.index))
             try:
-                return json.loads(body.decode("utf-8"))
-            except Exception:
-                return {"jsonrpc": "2.0", "error": {"code": -32700, "message": "invalid JSON from child"}, "id": payload.get("id")}
+                warmed = await fresh.warm()
+            except Exception as exc:
+                logger.warning("replacement child %d failed to start: %s", fresh.index, exc)
+                warmed = False
+            except BaseException:
+                await fresh.stop()
+                raise
+            if not warmed:
+                # Keep the old child rather than swap in one that can't serve,
+                # and back off so a broken upstream doesn't spawn npx in a loop.
+                await fresh.stop()
+                self.failures += 1
+                self.failed += 1
+                delay = min(RECYCLE_BACKOFF_MAX, CHECK_INTERVAL * 2 ** self.failures)
+                self.retry_at = time.monotonic() + delay
+                logger.warning("could not recycle child %d (%s): replacement not ready, retrying in %.0fs", child.index, reason, delay)
+                return
+            self.failures = 0
+            self.retry_at = 0.0
+            self.children[self.children.index(child)] = fresh
+            self.recycled[reason] = self.recycled.get(reason, 0) + 1
+            logger.warning("recycled child %d (%s)", child.index, reason)
+        finally:
+            self.replacing.discard(child.index)
+        try:
+            await child.drain(0 if reason in ("exited", "hung") else DRAIN_TIMEOUT)
+        finally:
+            # cancelled mid-drain (shutdown): the pool no longer tracks this child
+            if child.alive():
+                await child.stop()
+
+    async def _monitor(self):
+        while True:
+            await asyncio.sleep(CHECK_INTERVAL)
+            for child in list(self.children):
+                reason = child.recycle_reason()
+                if reason:
+                    self._spawn(self.recycle(child, reason))
 
-bridge = Bridge()
+    def alive(self):
+        return any(c.alive() for c in self.children)
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "recycled": dict(self.recycled),
+            "recycle_failures": self.failed,
+            "recycle_backoff_s": round(max(0.0, self.retry_at - time.monotonic()), 1),
+            "handshakes_replayed": self.replayed,
+            "children": [c.stats() for c in self.children],
+        }
+
+pool = BridgePool(POOL_SIZE)
 
 @app.on_event("startup")
 async def _startup():
-    bridge.start()
+    await pool.start()
+
+@app.on_event("shutdown")
+async def _shutdown():
+    await pool.stop()
 
 @app.get("/health")
 async def health():
-    alive = bridge.child is not None and bridge.child.poll() is None
-    return {"status":"ok", "child_alive": alive}
+    stats = pool.stats()
+    return {
+        "status": "ok",
+        "child_alive": pool.alive(),
+        "in_flight": sum(c["queue_depth"] for c in stats["children"]),
+        "pool": stats,
+    }
 
 @app.post("/mcp")
 async def mcp(request: Request):
@@ -102,8 +445,11 @@ async def mcp(request: Request):
         payload = await request.json()
     except Exception:
         return JSONResponse({"jsonrpc":"2.0","error":{"code":-32700,"message":"invalid request"},"id":None}, status_code=400)
-    # (Re)start if the child died
-    if not bridge.started or bridge.child is None or bridge.child.poll() is not None:
-        bridge.start()
-    resp = bridge.call(payload)
+    if isinstance(payload, list):
+        results = await asyncio.gather(*(pool.call(item) for item in payload))
+        results = [r for r in results if r is not None]
+        return JSONResponse(results) if results else Response(status_code=202)
+    resp = await pool.call(payload)
+    if resp is None:
+        return Response(status_code=202)
     return JSONResponse(resp)
@@ -1,19 +1,75 @@
-import os, re, uvicorn, httpx
+import os, re, json, time, asyncio, uvicorn, httpx
+from collections import OrderedDict, deque
 from fastapi import FastAPI, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from starlette.routing import Mount
 
 OLLAMA = os.getenv("OLLAMA_API_BASE", "http://127.0.0.1:11434/v1").rstrip("/")
 MLX    = os.getenv("MLX_API_BASE",    "http://127.0.0.1:18087/v1").rstrip("/")
+MODELS_REFRESH_SECS   = float(os.getenv("ROUTER_MODELS_REFRESH_SECS", "30"))
+MODELS_MISS_COOLDOWN  = float(os.getenv("ROUTER_MODELS_MISS_COOLDOWN_SECS", "2"))
+POOL_MAX_CONNECTIONS  = int(os.getenv("ROUTER_POOL_MAX_CONNECTIONS", "32"))
+POOL_MAX_KEEPALIVE    = int(os.getenv("ROUTER_POOL_MAX_KEEPALIVE", "16"))
+CONNECT_TIMEOUT       = float(os.getenv("ROUTER_CONNECT_TIMEOUT_SECS", "10"))
+OLLAMA_CONCURRENCY    = int(os.getenv("ROUTER_OLLAMA_CONCURRENCY", "4"))
+MLX_CONCURRENCY       = int(os.getenv("ROUTER_MLX_CONCURRENCY", "2"))
+QUEUE_TIMEOUT         = float(os.getenv("ROUTER_QUEUE_TIMEOUT_SECS", "300"))
+EMBED_CACHE_ENTRIES   = int(os.getenv("ROUTER_EMBED_CACHE_ENTRIES", "4096"))
+EMBED_BATCH_WINDOW    = float(os.getenv("ROUTER_EMBED_BATCH_WINDOW_MS", "5")) / 1000
+EMBED_BATCH_MAX       = int(os.getenv("ROUTER_EMBED_BATCH_MAX", "64"))
 
 app = FastAPI(title="OpenAI Router (Ollama+MLX)")
 
+# one keep-alive pool per backend; read timeout stays open for long generations
+clients = {}
+
+def backend_client(base: str) -> httpx.AsyncClient:
+    c = clients.get(base)
+    if c is None or c.is_closed:
+        c = httpx.AsyncClient(
+            timeout=httpx.Timeout(None, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=POOL_MAX_CONNECTIONS, max_keepalive_connections=POOL_MAX_KEEPALIVE),
+        )
+        clients[base] = c
+    return c
+
+class LatencyStats:
+    """Recent latency samples (seconds) with p50/p99."""
+
+    def __init__(self, size=1024):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+
+    def record(self, secs):
+        self.samples.append(secs)
+        self.count += 1
+
+    def pct(self, p):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    def stats(self):
+        return {"count": self.count, "p50_ms": round(self.pct(50) * 1000, 2), "p99_ms": round(self.pct(99) * 1000, 2)}
+
+class BackendMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.ttft = LatencyStats()
+        self.total = LatencyStats()
+
+    def stats(self):
+        return {"requests": self.requests, "errors": self.errors, "ttft": self.ttft.stats(), "total": self.total.stats()}
+
+backend_metrics = {OLLAMA: BackendMetrics(), MLX: BackendMetrics()}
+
 async def list_models(base: str):
     try:
-        async with httpx.AsyncClient(timeout=30) as c:
-            r = await c.get(f"{base}/models")
-            r.raise_for_status()
-            return r.json()
+        r = await backend_client(base).get(f"{base}/models", timeout=30)
+        r.raise_for_status()
+        return r.json()
     except Exception:
         return {"data": []}
 
@@ -27,67 +83,550 @@ def merge_models(*payloads):
                 merged.append({"id": mid})
     return {"object":"list","data":merged}
 
-def choose_backend(model: str) -> str:
+def _model_ids(payload):
+    return [mid for mid in (m.get("id") or m.get("model") or m.get("name") for m in payload.get("data", [])) if mid]
+
+def _trigrams(s):
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+class ModelRegistry:
+    """Cached model -> backends table, refreshed in the background.
+
+    Exact names are a dict lookup and may map to both backends. Loose
+    (substring) names go through a trigram index instead of scanning every
+    id; loose results are memoised until the next refresh and resolve to a
+    single backend, MLX winning ties as before.
+    """
+
+    def __init__(self):
+        self.exact = {}
+        self.sorted_ids = []
+        self.trigram_index = {}
+        self.loose_cache = {}
+        self.refreshed_at = 0.0
+        self.inflight = None
+        self.task = None
+        self.refreshes = 0
+        self.hits = 0
+        self.misses = 0
+        self.route_count = 0
+        self.route_total = 0.0
+        self.route_max = 0.0
+
+    async def refresh(self):
+        """Single-flight refresh: concurrent callers share one pair of /models fetches."""
+        if self.inflight is None:
+            self.inflight = asyncio.ensure_future(self._refresh())
+            # cleared by the task itself, so a waiter cancelled mid-fetch can't leave it behind
+            self.inflight.add_done_callback(self._refresh_done)
+        await asyncio.shield(self.inflight)
+
+    def _refresh_done(self, task):
+        if self.inflight is task:
+            self.inflight = None
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every waiter was cancelled
+
+    async def _refresh(self):
+        om, mm = await asyncio.gather(list_models(OLLAMA), list_models(MLX))
+        exact = {}
+        for mid in _model_ids(om):
+            exact.setdefault(mid, set()).add(OLLAMA)
+        for mid in _model_ids(mm):
+            exact.setdefault(mid, set()).add(MLX)
+        exact = {mid: frozenset(backends) for mid, backends in exact.items()}
+        trigram_index = {}
+        for mid in exact:
+            for gram in _trigrams(mid):
+                trigram_index.setdefault(gram, set()).add(mid)
+        self.exact = exact
+        self.sorted_ids = sorted(exact)
+        self.trigram_index = trigram_index
+        self.loose_cache = {}
+        self.refreshed_at = time.monotonic()
+        self.refreshes += 1
+
+    def _pick(self, candidates):
+        if not candidates:
+            return None
+        backends = set().union(*(self.exact[c] for c in candidates))
+        return frozenset([MLX if MLX in backends else OLLAMA])
+
+    def _loose(self, model):
+        if model in self.loose_cache:
+            return self.loose_cache[model]
+        grams = _trigrams(model)
+        if grams:
+            # every id containing `model` contains all of its trigrams
+            sets = sorted((self.trigram_index.get(g, set()) for g in grams), key=len)
+            candidates = set.intersection(*sets) if sets[0] else set()
+        else:
+            candidates = self.sorted_ids
+        backend = self._pick([c for c in candidates if model in c])
+        self.loose_cache[model] = backend
+        return backend
+
+    def lookup(self, model):
+        backend = self.exact.get(model)
+        if backend is None and model:
+            backend = self._loose(model)
+        return backend
+
+    async def resolve(self, model):
+        started = time.perf_counter()
+        backend = self.lookup(model)
+        if backend is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            # unknown model: maybe just pulled; refresh (rate-limited) and retry
+            if time.monotonic() - self.refreshed_at > MODELS_MISS_COOLDOWN:
+                await self.refresh()
+                backend = self.lookup(model)
+        elapsed = time.perf_counter() - started
+        self.route_count += 1
+        self.route_total += elapsed
+        self.route_max = max(self.route_max, elapsed)
+        # default to Ollama (more common)
+        return backend or frozenset([OLLAMA])
+
+    async def run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                pass
+            await asyncio.sleep(MODELS_REFRESH_SECS)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "models": len(self.exact),
+            "refreshes": self.refreshes,
+            "age_s": round(time.monotonic() - self.refreshed_at, 1) if self.refreshed_at else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "route_avg_us": round(self.route_total / self.route_count * 1e6, 1) if self.route_count else 0.0,
+            "route_max_us": round(self.route_max * 1e6, 1),
+        }
+
+registry = ModelRegistry()
+
+@app.on_event("startup")
+async def _startup():
+    registry.task = asyncio.create_task(registry.run())
+
+@app.on_event("shutdown")
+async def _shutdown():
+    if registry.task:
+        registry.task.cancel()
+    for c in list(clients.values()):
+        await c.aclose()
+
+class BackendSlots:
+    """Concurrency cap for one backend with a FIFO wait queue."""
+
+    def __init__(self, base, limit):
+        self.base = base
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self.waiters = deque()
+        self.wait = LatencyStats()
+        self.model_latency = {}
+        self.timeouts = 0
+
+    def load(self):
+        return (self.in_flight + len(self.waiters)) / self.limit
+
+    async def acquire(self):
+        started = time.perf_counter()
+        if self.in_flight < self.limit and not self.waiters:
+            self.in_flight += 1
+            self.wait.record(0.0)
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self.waiters.append(fut)
+        try:
+            await asyncio.wait_for(fut, timeout=QUEUE_TIMEOUT)
+        except BaseException as exc:
+            if fut.done() and not fut.cancelled():
+                # slot was handed to us just as we gave up: pass it on
+                self.release()
+            elif fut in self.waiters:
+                self.waiters.remove(fut)
+            if isinstance(exc, asyncio.TimeoutError):
+                self.timeouts += 1
+            raise
+        self.wait.record(time.perf_counter() - started)
+
+    def release(self):
+        # hand the slot straight to the next waiter so late arrivals can't jump the queue
+        while self.waiters:
+            fut = self.waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def observe(self, model, secs):
+        prev = self.model_latency.get(model)
+        self.model_latency[model] = secs if prev is None else 0.8 * prev + 0.2 * secs
+
+    def stats(self):
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": len(self.waiters),
+            "queue_timeouts": self.timeouts,
+            "queue_wait": self.wait.stats(),
+            "model_latency_ms": {m: round(v * 1000, 1) for m, v in self.model_latency.items()},
+        }
+
+class Scheduler:
+    """Pick the least-loaded backend among those serving a model, then wait for a slot."""
+
+    def __init__(self):
+        self.slots = {OLLAMA: BackendSlots(OLLAMA, OLLAMA_CONCURRENCY), MLX: BackendSlots(MLX, MLX_CONCURRENCY)}
+
+    def pick(self, candidates, model):
+        if len(candidates) == 1:
+            return next(iter(candidates))
+        return min(
+            candidates,
+            key=lambda b: (self.slots[b].load(), self.slots[b].model_latency.get(model, 0.0)),
+        )
+
+    def stats(self):
+        return {base: slot.stats() for base, slot in self.slots.items()}
+
+scheduler = Scheduler()
+
+async def candidate_backends(model: str):
     # heuristic 1: file hints
     s = model.strip()
     if s.endswith(".gguf") or ".gguf" in s:   # GGUF => Ollama land
-        return OLLAMA
+        return frozenset([OLLAMA])
     if s.endswith(".safetensors") or "mlx" in s.lower() or "safetensors" in s.lower():
-        return MLX
-
-    # heuristic 2: query both /models and see who knows it
-    # cache cheaply by simple fetch each time (fast on localhost)
-    # prefer exact match; fallback to prefix match
-    import anyio
-    async def _probe():
-        om = await list_models(OLLAMA)
-        mm = await list_models(MLX)
-        oset = {x.get("id","") for x in om.get("data",[])}
-        mset = {x.get("id","") for x in mm.get("data",[])}
-        if model in mset: return MLX
-        if model in oset: return OLLAMA
-        # loose contains
-        if any(model in x for x in mset): return MLX
-        if any(model in x for x in oset): return OLLAMA
-        # default to Ollama (more common)
-        return OLLAMA
-    return anyio.run(_probe)
+        return frozenset([MLX])
+
+    # heuristic 2: cached /models table (exact match, then prefix/substring)
+    return await registry.resolve(s)
+
+async def choose_backend(model: str) -> str:
+    return scheduler.pick(await candidate_backends(model), model.strip())
+
+class UpstreamError(Exception):
+    def __init__(self, status_code, content, media_type="application/json"):
+        super().__init__(f"upstream returned {status_code}")
+        self.status_code = status_code
+        self.content = content
+        self.media_type = media_type
+
+class EmbeddingCoalescer:
+    """Cache, dedupe and micro-batch /v1/embeddings inputs.
+
+    Each input string is handled on its own: a cache hit returns at once, a
+    string already being embedded shares that in-flight future, and the rest
+    are queued per (model, dimensions) and sent upstream as one batched
+    request after a short window. Results are split back out per caller.
+    """
+
+    def __init__(self, capacity=EMBED_CACHE_ENTRIES, window=EMBED_BATCH_WINDOW, max_batch=EMBED_BATCH_MAX):
+        self.capacity = max(0, capacity)
+        self.window = max(0.0, window)
+        self.max_batch = max(1, max_batch)
+        self.cache = OrderedDict()
+        self.inflight = {}
+        self.pending = {}
+        self.timers = {}
+        self.tasks = set()
+        self.hits = self.misses = self.coalesced = 0
+        self.batches = self.batched_inputs = self.errors = 0
+
+    def _cached(self, key):
+        vec = self.cache.get(key)
+        if vec is not None:
+            self.cache.move_to_end(key)
+        return vec
+
+    def _store(self, key, vec):
+        if not self.capacity:
+            return
+        self.cache[key] = vec
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+
+    async def embed(self, model, dims, texts):
+        loop = asyncio.get_running_loop()
+        group = (model, dims)
+        waits = []
+        for text in texts:
+            key = (model, dims, text)
+            vec = self._cached(key)
+            if vec is not None:
+                self.hits += 1
+                waits.append(vec)
+                continue
+            fut = self.inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                fut = self.inflight[key] = loop.create_future()
+                batch = self.pending.setdefault(group, [])
+                batch.append(text)
+                if len(batch) >= self.max_batch:
+                    self._flush(group)
+            waits.append(fut)
+        if self.pending.get(group):
+            if self.window == 0:
+                self._flush(group)
+            elif group not in self.timers:
+                self.timers[group] = loop.call_later(self.window, self._flush, group)
+        # shield: other callers may be waiting on the same futures
+        return [w if isinstance(w, list) else await asyncio.shield(w) for w in waits]
+
+    def _flush(self, group):
+        timer = self.timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        texts = self.pending.pop(group, None)
+        if not texts:
+            return
+        task = asyncio.create_task(self._run(group, texts))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _run(self, group, texts):
+        model, dims = group
+        try:
+            vectors = await self._upstream(model, dims, texts)
+        except Exception as exc:
+            self.errors += 1
+            for text in texts:
+                fut = self.inflight.pop((model, dims, text), None)
+                if fut is not None and not fut.done():
+                    fut.set_exception(exc)
+                    fut.exception()  # retrieved by whoever is waiting; don't warn otherwise
+            return
+        self.batches += 1
+        self.batched_inputs += len(texts)
+        for text, vec in zip(texts, vectors):
+            key = (model, dims, text)
+            self._store(key, vec)
+            fut = self.inflight.pop(key, None)
+            if fut is not None and not fut.done():
+                fut.set_result(vec)
+
+    async def _upstream(self, model, dims, texts):
+        base = await choose_backend(model)
+        metrics = backend_metrics.setdefault(base, BackendMetrics())
+        metrics.requests += 1
+        slot = scheduler.slots[base]
+        started = time.perf_counter()
+        await slot.acquire()
+        dispatched = time.perf_counter()
+        payload = {"model": model, "input": texts}
+        if dims is not None:
+            payload["dimensions"] = dims
+        try:
+            r = await backend_client(base).post(f"{base}/embeddings", json=payload)
+        except httpx.HTTPError:
+            metrics.errors += 1
+            raise
+        finally:
+            slot.release()
+            now = time.perf_counter()
+            metrics.total.record(now - started)
+            slot.observe(model, now - dispatched)
+        if r.status_code != 200:
+            if r.status_code >= 500:
+                metrics.errors += 1
+            raise UpstreamError(r.status_code, r.content, r.headers.get("content-type", "application/json"))
+        try:
+            data = sorted(r.json()["data"], key=lambda d: d.get("index", 0))
+        except (ValueError, KeyError, TypeError):
+            data = []
+        if len(data) != len(texts):
+            raise UpstreamError(502, json.dumps({"error": {"message": f"upstream {base} returned {len(data)} embeddings for {len(texts)} inputs"}}).encode())
+        return [d["embedding"] for d in data]
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self.cache),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "batches": self.batches,
+            "avg_batch": round(self.batched_inputs / self.batches, 2) if self.batches else 0.0,
+            "pending": sum(len(v) for v in self.pending.values()),
+            "errors": self.errors,
+        }
+
+embedder = EmbeddingCoalescer()
+
+def _embedding_request(jb):
+    """(model, dimensions, texts) for plain float string requests, else None."""
+    if not isinstance(jb, dict) or set(jb) - {"model", "input", "encoding_format", "dimensions", "user"}:
+        return None
+    if jb.get("encoding_format", "float") != "float":
+        return None
+    model = (jb.get("model") or "").strip()
+    dims = jb.get("dimensions")
+    raw = jb.get("input")
+    if isinstance(raw, str):
+        return model, dims, [raw]
+    if isinstance(raw, list) and raw and all(isinstance(t, str) for t in raw):
+        return model, dims, raw
+    # token arrays and anything unusual go straight through
+    return None
 
 @app.get("/v1/models")
 async def models():
     om, mm = await list_models(OLLAMA), await list_models(MLX)
     return JSONResponse(merge_models(om, mm))
 
+@app.get("/router/stats")
+async def router_stats():
+    return {
+        "registry": registry.stats(),
+        "backends": {base: m.stats() for base, m in backend_metrics.items()},
+        "scheduler": scheduler.stats(),
+        "embeddings": embedder.stats(),
+    }
+
+class _Upstream:
+    """One dispatched upstream stream and its backend slot, finished exactly once.
+
+    TTFT/total include any queue wait; the per-model latency fed back to the
+    scheduler is measured from dispatch so it reflects backend speed only.
+    """
+
+    def __init__(self, r: httpx.Response, metrics: BackendMetrics, started: float, slot: BackendSlots, model: str, dispatched: float):
+        self.r, self.metrics, self.slot, self.model = r, metrics, slot, model
+        self.started, self.dispatched = started, dispatched
+        self.finished = False
+
+    async def relay(self):
+        """Yield upstream bytes as they arrive, recording time-to-first-token."""
+        first = True
+        try:
+            async for chunk in self.r.aiter_raw():
+                if first and chunk:
+                    self.metrics.ttft.record(time.perf_counter() - self.started)
+                    first = False
+                yield chunk
+        finally:
+            await self.finish()
+
+    async def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        # free the slot before awaiting anything, so a cancellation can't skip it
+        self.slot.release()
+        now = time.perf_counter()
+        self.metrics.total.record(now - self.started)
+        self.slot.observe(self.model, now - self.dispatched)
+        await self.r.aclose()
+
+class RelayResponse(StreamingResponse):
+    """Streams an ``_Upstream`` and finishes it even if the body is never iterated.
+
+    A client that disconnects before the first byte cancels the response
+    before Starlette starts the generator, so the generator's ``finally``
+    alone would leak the slot and the upstream stream.
+    """
+
+    def __init__(self, upstream: _Upstream, **kwargs):
+        super().__init__(upstream.relay(), **kwargs)
+        self.upstream = upstream
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.upstream.finish()
+
+async def proxy(req: Request, path: str):
+    started = time.perf_counter()
+    # read the body once and forward the same bytes; only the model name is parsed
+    body = await req.body()
+    try:
+        jb = json.loads(body or b"{}")
+    except ValueError:
+        return JSONResponse({"error": {"message": "invalid JSON body"}}, status_code=400)
+    model = (jb.get("model") or "").strip() if isinstance(jb, dict) else ""
+    base  = await choose_backend(model)
+    metrics = backend_metrics.setdefault(base, BackendMetrics())
+    metrics.requests += 1
+    slot = scheduler.slots[base]
+    try:
+        await slot.acquire()
+    except asyncio.TimeoutError:
+        return JSONResponse({"error": {"message": f"backend {base} busy, queued too long"}}, status_code=503)
+    dispatched = time.perf_counter()
+    c = backend_client(base)
+    upstream = c.build_request("POST", f"{base}/{path}", content=body, headers={"Content-Type":"application/json"})
+    try:
+        r = await c.send(upstream, stream=True)
+    except BaseException as exc:
+        slot.release()
+        if not isinstance(exc, httpx.HTTPError):
+            raise
+        metrics.errors += 1
+        return JSONResponse({"error": {"message": f"upstream {base} unavailable: {exc}"}}, status_code=502)
+    if r.status_code >= 500:
+        metrics.errors += 1
+    headers = {"Content-Type": r.headers.get("content-type","application/json")}
+    if "text/event-stream" in headers["Content-Type"]:
+        headers["Cache-Control"] = "no-cache"
+        headers["X-Accel-Buffering"] = "no"
+    upstream = _Upstream(r, metrics, started, slot, model, dispatched)
+    return RelayResponse(upstream, status_code=r.status_code, headers=headers)
+
 @app.post("/v1/chat/completions")
 async def chat(req: Request):
-    body = await req.body()
-    jb   = await req.json()
-    model = (jb.get("model") or "").strip()
-    base  = choose_backend(model)
-    async with httpx.AsyncClient(timeout=None) as c:
-        r = await c.post(f"{base}/chat/completions", content=body, headers={"Content-Type":"application/json"})
-        return Response(content=r.content, status_code=r.status_code, headers={"Content-Type": r.headers.get("content-type","application/json")})
+    return await proxy(req, "chat/completions")
 
 # Basic pass-throughs for other common OpenAI endpoints
 @app.post("/v1/completions")
 async def completions(req: Request):
-    body = await req.body()
-    jb   = await req.json()
-    model = (jb.get("model") or "").strip()
-    base  = choose_backend(model)
-    async with httpx.AsyncClient(timeout=None) as c:
-        r = await c.post(f"{base}/completions", content=body, headers={"Content-Type":"application/json"})
-        return Response(content=r.content, status_code=r.status_code, headers={"Content-Type": r.headers.get("content-type","application/json")})
+    return await proxy(req, "completions")
 
 @app.post("/v1/embeddings")
 async def embeddings(req: Request):
-    body = await req.body()
-    jb   = await req.json()
-    model = (jb.get("model") or "").strip()
-    base  = choose_backend(model)
-    async with httpx.AsyncClient(timeout=None) as c:
-        r = await c.post(f"{base}/embeddings", content=body, headers={"Content-Type":"application/json"})
-        return Response(content=r.content, status_code=r.status_code, headers={"Content-Type": r.headers.get("content-type","application/json")})
+    try:
+        jb = json.loads(await req.body() or b"{}")
+    except ValueError:
+        return JSONResponse({"error": {"message": "invalid JSON body"}}, status_code=400)
+    parsed = _embedding_request(jb)
+    if parsed is None:
+        return await proxy(req, "embeddings")
+    model, dims, texts = parsed
+    # part of the coalescer key, so it must be hashable; bool is an int subclass
+    if dims is not None and (isinstance(dims, bool) or not isinstance(dims, int) or dims < 1):
+        return JSONResponse({"error": {"message": "dimensions must be a positive integer"}}, status_code=400)
+    try:
+        vectors = await embedder.embed(model, dims, texts)
+    except UpstreamError as exc:
+        return Response(exc.content, status_code=exc.status_code, media_type=exc.media_type)
+    except httpx.HTTPError as exc:
+        return JSONResponse({"error": {"message": f"upstream unavailable: {exc}"}}, status_code=502)
+    except asyncio.TimeoutError:
+        return JSONResponse({"error": {"message": "backend busy, queued too long"}}, status_code=503)
+    return JSONResponse({
+        "object": "list",
+        "data": [{"object": "embedding", "index": i, "embedding": v} for i, v in enumerate(vectors)],
+        "model": model,
+        # per-input token counts are lost when requests are merged
+        "usage": {"prompt_tokens": 0, "total_tokens": 0},
+    })
 
 if __name__ == "__main__":
     # non-standard high port to avoid collisions
@@ -0,0 +1,165 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import openai_router  # noqa: E402
+
+BASE = "http://backend.test/v1"
+
+
+class UpstreamBody(httpx.AsyncByteStream):
+    """A streamed completion that only ends when the proxy closes it."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def __aiter__(self):
+        yield b"data: {}\n\n"
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    body = UpstreamBody()
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, headers={"content-type": "text/event-stream"}, stream=body)
+        )
+    )
+
+    async def choose_backend(model):
+        return BASE
+
+    slots = openai_router.BackendSlots(BASE, 1)
+    monkeypatch.setitem(openai_router.scheduler.slots, BASE, slots)
+    monkeypatch.setattr(openai_router, "choose_backend", choose_backend)
+    monkeypatch.setattr(openai_router, "backend_client", lambda base: client)
+    return body, slots
+
+
+def _scope():
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/v1/chat/completions",
+        "raw_path": b"/v1/chat/completions",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 18123),
+    }
+
+
+def _receive_then_disconnect():
+    messages = [{"type": "http.request", "body": b'{"model": "m"}', "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+async def _sent(message):
+    pass
+
+
+def test_disconnect_before_first_byte_releases_slot(upstream):
+    body, slots = upstream
+
+    async def send(message):
+        # the client is already gone when the response starts
+        if message["type"] == "http.response.start":
+            raise OSError("client disconnected")
+
+    async def run():
+        # Starlette may wrap it in an ExceptionGroup from its task group
+        with pytest.raises(Exception):
+            await openai_router.app(_scope(), _receive_then_disconnect(), send)
+
+    asyncio.run(run())
+    assert slots.in_flight == 0
+    assert body.closed
+
+
+def test_disconnect_while_streaming_releases_slot(upstream):
+    body, slots = upstream
+
+    async def run():
+        await asyncio.wait_for(openai_router.app(_scope(), _receive_then_disconnect(), _sent), timeout=5)
+
+    asyncio.run(run())
+    assert slots.in_flight == 0
+    assert body.closed
+
+
+def test_finish_runs_once(upstream):
+    _, slots = upstream
+
+    async def run():
+        r = await openai_router.backend_client(BASE).send(
+            httpx.Request("POST", f"{BASE}/chat/completions"), stream=True
+        )
+        await slots.acquire()
+        relay = openai_router._Upstream(r, openai_router.BackendMetrics(), 0.0, slots, "m", 0.0)
+        await relay.finish()
+        await relay.finish()
+
+    asyncio.run(run())
+    # a second release would have driven the count negative
+    assert slots.in_flight == 0
+
+
+def test_refresh_clears_inflight_when_waiter_cancelled(monkeypatch):
+    release = None
+
+    async def list_models(base):
+        await release.wait()
+        return {"data": [{"id": "m"}]}
+
+    monkeypatch.setattr(openai_router, "list_models", list_models)
+    registry = openai_router.ModelRegistry()
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        waiter = asyncio.create_task(registry.refresh())
+        await asyncio.sleep(0)
+        assert registry.inflight is not None
+        # the only waiter goes away while the fetch is still running
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await asyncio.sleep(0.01)
+        assert registry.inflight is None
+        await registry.refresh()
+
+    asyncio.run(run())
+    assert registry.refreshes == 2
+    assert "m" in registry.exact
+
+
+@pytest.mark.parametrize("dims", [[256], {"n": 256}, True, "256", 0])
+def test_embeddings_rejects_bad_dimensions(dims):
+    async def run():
+        transport = httpx.ASGITransport(app=openai_router.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://router.test") as client:
+            return await client.post("/v1/embeddings", json={"model": "m", "input": "hi", "dimensions": dims})
+
+    r = asyncio.run(run())
+    assert r.status_code == 400
+    assert "dimensions" in r.json()["error"]["message"]
@@ -4,21 +4,47 @@ import asyncio
 import json
 import logging
 import os
+import time
 import uuid
-from collections import deque
+import zlib
+from contextlib import aclosing, asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict
 
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
+from chunking import TextChunker, chunk_point_id
+from embedding_batcher import EmbeddingBatcher
+from embedding_cache import EmbeddingCache, cache_key
+from hashed_embedding import HashedEmbedder
+from history_store import HistoryStore, HistoryWriter, to_epoch
+from http_pool import ClientRegistry, UpstreamConfig
+from mcp_client import MCPError, MCPSession
+from qdrant_collections import CollectionRegistry, is_stale_collection_error
+from qdrant_writer import QdrantWriter
+from sparse_embedding import SparseEncoder
+from strategy_series import FIELDS as SERIES_FIELDS, STATS as SERIES_STATS, SeriesIndex
+from telemetry_stream import StreamFull, TelemetryHub, diff_items, keyed
+from versioned_state import VersionedState, encode, json_response, make_etag, not_modified
+from write_behind import WriteBehindQueue
+
 MEMMCP_HTTP_URL = os.getenv("MEMMCP_HTTP_URL", "http://memorymcp-http:59081/mcp")
 LANGFUSE_URL = os.getenv("LANGFUSE_URL", "http://langfuse:3000")
 LANGFUSE_API_KEY = os.getenv("LANGFUSE_API_KEY")
 QDRANT_URL = os.getenv("QDRANT_URL", "http://qdrant:6333")
 QDRANT_COLLECTION = os.getenv("ORCH_QDRANT_COLLECTION", "memmcp_notes")
+QDRANT_BATCH_MAX = int(os.getenv("ORCH_QDRANT_BATCH_MAX", "64"))
+QDRANT_BATCH_WINDOW_MS = float(os.getenv("ORCH_QDRANT_BATCH_WINDOW_MS", "10"))
+QDRANT_WAIT = os.getenv("ORCH_QDRANT_WAIT", "true").lower() in ("1", "true", "yes", "on")
+SPARSE_MODEL = os.getenv("ORCH_SPARSE_MODEL", "")
+SPARSE_VECTOR_NAME = os.getenv("ORCH_SPARSE_VECTOR_NAME", "bm25")
+DENSE_VECTOR_NAME = os.getenv("ORCH_DENSE_VECTOR_NAME", "dense")
+CHUNK_TOKENS = int(os.getenv("ORCH_CHUNK_TOKENS", "256"))
+CHUNK_OVERLAP = int(os.getenv("ORCH_CHUNK_OVERLAP", "32"))
 
 EMBEDDING_PROVIDER = os.getenv("ORCH_EMBED_PROVIDER", os.getenv("EMBEDDING_PROVIDER", "cheap")).lower()
 EMBEDDING_MODEL = os.getenv("ORCH_EMBED_MODEL", os.getenv("EMBEDDING_MODEL", "nomic-embed-text"))
@@ -26,6 +52,12 @@ EMBEDDING_BASE_URL = os.getenv("EMBEDDING_BASE_URL", os.getenv("OPENAI_API_BASE"
 EMBEDDING_API_KEY = os.getenv("EMBEDDING_API_KEY", os.getenv("OPENAI_API_KEY"))
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")
 FALLBACK_EMBED_DIM = int(os.getenv("ORCH_EMBED_DIM", os.getenv("EMBEDDING_DIM", "32")))
+EMBED_BATCH_WINDOW_MS = float(os.getenv("ORCH_EMBED_BATCH_WINDOW_MS", "5"))
+EMBED_BATCH_MAX = int(os.getenv("ORCH_EMBED_BATCH_MAX", "32"))
+EMBED_CACHE_ENTRIES = int(os.getenv("ORCH_EMBED_CACHE_ENTRIES", "4096"))
+EMBED_CACHE_MAX_BYTES = int(os.getenv("ORCH_EMBED_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+EMBED_CACHE_PATH = os.getenv("ORCH_EMBED_CACHE_PATH")
+EMBED_CACHE_DISK_ENTRIES = int(os.getenv("ORCH_EMBED_CACHE_DISK_ENTRIES", "100000"))
 TRADING_HISTORY_LIMIT = int(os.getenv("TRADING_HISTORY_LIMIT", "256"))
 TRADING_HISTORY_PATH = Path(
     os.getenv(
@@ -40,6 +72,36 @@ STRATEGY_HISTORY_PATH = Path(
         str(Path(__file__).resolve().parent / "data" / "strategy_metrics.ndjson"),
     )
 )
+TRADING_HISTORY_DIR = Path(os.getenv("TRADING_HISTORY_DIR", str(TRADING_HISTORY_PATH.with_suffix(""))))
+STRATEGY_HISTORY_DIR = Path(os.getenv("STRATEGY_HISTORY_DIR", str(STRATEGY_HISTORY_PATH.with_suffix(""))))
+HISTORY_PARTITION_HOURS = float(os.getenv("ORCH_HISTORY_PARTITION_HOURS", "24"))
+HISTORY_INDEX_EVERY = int(os.getenv("ORCH_HISTORY_INDEX_EVERY", "128"))
+HISTORY_PAGE_MAX = int(os.getenv("ORCH_HISTORY_PAGE_MAX", "1000"))
+HISTORY_FSYNC = os.getenv("ORCH_HISTORY_FSYNC", "interval").lower()
+HISTORY_FSYNC_INTERVAL_SECS = float(os.getenv("ORCH_HISTORY_FSYNC_INTERVAL_SECS", "1"))
+HISTORY_SEGMENT_MAX_BYTES = int(os.getenv("ORCH_HISTORY_SEGMENT_MAX_BYTES", str(64 * 1024 * 1024)))
+HISTORY_COMPRESS = os.getenv("ORCH_HISTORY_COMPRESS", "none").lower()
+HISTORY_ZSTD_LEVEL = int(os.getenv("ORCH_HISTORY_ZSTD_LEVEL", "3"))
+SERIES_MAX_POINTS = int(os.getenv("ORCH_SERIES_MAX_POINTS", "10000"))
+SERIES_MAX_STRATEGIES = int(os.getenv("ORCH_SERIES_MAX_STRATEGIES", "512"))
+SERIES_SEED_HOURS = float(os.getenv("ORCH_SERIES_SEED_HOURS", "24"))
+SERIES_BUCKETS_MAX = int(os.getenv("ORCH_SERIES_BUCKETS_MAX", "1000"))
+STREAM_MAX_CLIENTS = int(os.getenv("ORCH_STREAM_MAX_CLIENTS", "64"))
+STREAM_MIN_INTERVAL_MS = float(os.getenv("ORCH_STREAM_MIN_INTERVAL_MS", "250"))
+STREAM_KEEPALIVE_SECS = float(os.getenv("ORCH_STREAM_KEEPALIVE_SECS", "15"))
+PROJECTS_CONCURRENCY = int(os.getenv("ORCH_PROJECTS_CONCURRENCY", "8"))
+PROJECTS_CACHE_TTL = float(os.getenv("ORCH_PROJECTS_CACHE_TTL", "5"))
+WRITE_BEHIND = os.getenv("ORCH_WRITE_BEHIND", "false").lower() in ("1", "true", "yes", "on")
+WRITE_BEHIND_QUEUE_SIZE = int(os.getenv("ORCH_WRITE_BEHIND_QUEUE_SIZE", "1000"))
+WRITE_BEHIND_WORKERS = int(os.getenv("ORCH_WRITE_BEHIND_WORKERS", "4"))
+WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv("ORCH_WRITE_BEHIND_MAX_ATTEMPTS", "5"))
+WRITE_BEHIND_DRAIN_SECONDS = float(os.getenv("ORCH_WRITE_BEHIND_DRAIN_SECONDS", "10"))
+DEAD_LETTER_PATH = Path(
+    os.getenv(
+        "ORCH_DEAD_LETTER_PATH",
+        str(Path(__file__).resolve().parent / "data" / "dead_letter.ndjson"),
+    )
+)
 
 MCP_HEADERS = {
     "content-type": "application/json",
@@ -49,6 +111,16 @@ MCP_HEADERS = {
 }
 
 
+http_clients = ClientRegistry(
+    [
+        UpstreamConfig.from_env("memory-bank", max_connections=32, max_keepalive=16, timeout=30.0),
+        UpstreamConfig.from_env("qdrant", max_connections=16, max_keepalive=8, timeout=30.0),
+        UpstreamConfig.from_env("langfuse", max_connections=8, max_keepalive=4, timeout=10.0),
+        UpstreamConfig.from_env("embedding", max_connections=16, max_keepalive=8, timeout=30.0),
+    ]
+)
+
+
 class OrchestratorError(RuntimeError):
     """Intentional failure we can bubble up with a helpful hint."""
 
@@ -66,30 +138,36 @@ def _cheap_embedding(text: str, vector_size: int) -> list[float]:
     return [round(val / norm, 6) for val in base]
 
 
-async def _openai_like_embedding(text: str) -> list[float]:
+hashed_embedder = HashedEmbedder(FALLBACK_EMBED_DIM)
+
+
+async def _openai_like_embeddings(texts: list[str]) -> list[list[float]]:
     if not EMBEDDING_BASE_URL:
         raise OrchestratorError("EMBEDDING_BASE_URL is not set for openai provider")
     url = EMBEDDING_BASE_URL.rstrip("/") + "/v1/embeddings"
     headers = {"content-type": "application/json"}
     if EMBEDDING_API_KEY:
         headers["authorization"] = f"Bearer {EMBEDDING_API_KEY}"
-    payload = {"model": EMBEDDING_MODEL, "input": text}
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        resp = await client.post(url, json=payload, headers=headers)
+    payload = {"model": EMBEDDING_MODEL, "input": texts}
+    resp = await http_clients.get("embedding").post(url, json=payload, headers=headers)
     if resp.status_code != 200:
         raise OrchestratorError(f"Embedding request failed: {resp.text}")
     data = resp.json()
     payloads = data.get("data") or []
     if not payloads:
         raise OrchestratorError("Embedding provider returned no data")
-    return payloads[0]["embedding"]
+    if len(payloads) != len(texts):
+        raise OrchestratorError(
+            f"Embedding provider returned {len(payloads)} vectors for {len(texts)} inputs"
+        )
+    payloads = sorted(payloads, key=lambda item: item.get("index", 0))
+    return [item["embedding"] for item in payloads]
 
 
 async def _ollama_embedding(text: str) -> list[float]:
     url = OLLAMA_BASE_URL.rstrip("/") + "/api/embeddings"
     payload = {"model": EMBEDDING_MODEL, "prompt": text}
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        resp = await client.post(url, json=payload)
+    resp = await http_clients.get("embedding").post(url, json=payload)
     if resp.status_code != 200:
         raise OrchestratorError(f"Ollama embedding failed: {resp.text}")
     data = resp.json()
@@ -101,26 +179,124 @@ async def _ollama_embedding(text: str) -> list[float]:
     return vector
 
 
-async def embed_text(text: str) -> list[float]:
+async def _ollama_embeddings(texts: list[str]) -> list[list[float]]:
+    if len(texts) == 1:
+        return [await _ollama_embedding(texts[0])]
+    # /api/embed takes an input array; older Ollama builds only have the
+    # single-prompt /api/embeddings route, so fall back to that on 404.
+    url = OLLAMA_BASE_URL.rstrip("/") + "/api/embed"
+    resp = await http_clients.get("embedding").post(url, json={"model": EMBEDDING_MODEL, "input": texts})
+    if resp.status_code == 404:
+        return list(await asyncio.gather(*(_ollama_embedding(text) for text in texts)))
+    if resp.status_code != 200:
+        raise OrchestratorError(f"Ollama embedding failed: {resp.text}")
+    vectors = resp.json().get("embeddings")
+    if not vectors or len(vectors) != len(texts):
+        raise OrchestratorError("Ollama response missing embeddings field")
+    return vectors
+
+
+async def embed_many(texts: list[str]) -> list[list[float]]:
     provider = EMBEDDING_PROVIDER
     if provider in ("openai", "lmstudio", "openai-compatible"):
         try:
-            return await _openai_like_embedding(text)
+            return await _openai_like_embeddings(texts)
         except OrchestratorError:
             raise
         except Exception as exc:  # pragma: no cover - network failure
             raise OrchestratorError(str(exc)) from exc
     if provider == "ollama":
         try:
-            return await _ollama_embedding(text)
+            return await _ollama_embeddings(texts)
         except OrchestratorError:
             raise
         except Exception as exc:  # pragma: no cover
             raise OrchestratorError(str(exc)) from exc
+    if provider == "hashed":
+        return hashed_embedder.embed(texts).tolist()
     # default fallback
-    return _cheap_embedding(text, FALLBACK_EMBED_DIM)
+    return [_cheap_embedding(text, FALLBACK_EMBED_DIM) for text in texts]
+
+
+embedding_batcher = EmbeddingBatcher(
+    embed_many, max_batch=EMBED_BATCH_MAX, window=EMBED_BATCH_WINDOW_MS / 1000.0
+)
+
+
+def _uses_remote_embedder() -> bool:
+    return EMBEDDING_PROVIDER in ("openai", "lmstudio", "openai-compatible", "ollama")
+
+
+embedding_cache = EmbeddingCache(
+    max_entries=EMBED_CACHE_ENTRIES,
+    max_bytes=EMBED_CACHE_MAX_BYTES,
+    disk_path=EMBED_CACHE_PATH,
+    disk_max_entries=EMBED_CACHE_DISK_ENTRIES,
+)
+
 
-app = FastAPI(title="memMCP orchestrator", version="0.1.0")
+async def embed_text(text: str) -> list[float]:
+    key = cache_key(EMBEDDING_PROVIDER, EMBEDDING_MODEL, FALLBACK_EMBED_DIM, text)
+    cached = await embedding_cache.get(key)
+    if cached is not None:
+        return cached
+    if _uses_remote_embedder() and EMBED_BATCH_WINDOW_MS > 0:
+        vector = await embedding_batcher.embed(text)
+    else:
+        vector = (await embed_many([text]))[0]
+    await embedding_cache.put(key, vector)
+    return vector
+
+
+async def embed_texts(texts: list[str]) -> list[list[float]]:
+    """Embed several texts, serving cache hits and sending misses in batches."""
+
+    keys = [cache_key(EMBEDDING_PROVIDER, EMBEDDING_MODEL, FALLBACK_EMBED_DIM, text) for text in texts]
+    vectors: list[list[float] | None] = [await embedding_cache.get(key) for key in keys]
+    missing = [idx for idx, vector in enumerate(vectors) if vector is None]
+    for start in range(0, len(missing), EMBED_BATCH_MAX):
+        batch = missing[start : start + EMBED_BATCH_MAX]
+        fresh = await embed_many([texts[idx] for idx in batch])
+        for idx, vector in zip(batch, fresh):
+            vectors[idx] = vector
+            await embedding_cache.put(keys[idx], vector)
+    return vectors  # type: ignore[return-value]
+
+
+async def _prime_qdrant_collection() -> None:
+    try:
+        size = await qdrant_collections.prime(QDRANT_COLLECTION)
+        if size is None and not _uses_remote_embedder():
+            await qdrant_collections.ensure(QDRANT_COLLECTION, FALLBACK_EMBED_DIM)
+    except Exception as exc:  # pragma: no cover - qdrant not up yet
+        logger.warning("Qdrant collection check deferred to first write: %s", exc)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    await http_clients.start()
+    await _prime_qdrant_collection()
+    if WRITE_BEHIND:
+        await qdrant_queue.start()
+        await langfuse_queue.start()
+    try:
+        yield
+    finally:
+        if WRITE_BEHIND:
+            await qdrant_queue.stop(WRITE_BEHIND_DRAIN_SECONDS)
+            await langfuse_queue.stop(WRITE_BEHIND_DRAIN_SECONDS)
+        await embedding_batcher.drain()
+        await qdrant_writer.flush()
+        await mcp_session.aclose()
+        await http_clients.aclose()
+        embedding_cache.close()
+        await asyncio.gather(
+            asyncio.to_thread(trading_writer.close),
+            asyncio.to_thread(strategy_writer.close),
+        )
+
+
+app = FastAPI(title="memMCP orchestrator", version="0.1.0", lifespan=lifespan)
 logger = logging.getLogger("memmcp.orchestrator")
 telemetry_state: Dict[str, Any] = {
     "updatedAt": None,
@@ -133,6 +309,7 @@ telemetry_state: Dict[str, Any] = {
         "flushedEvents": 0,
     },
 }
+metrics_view = VersionedState("metrics", telemetry_state)
 trading_metrics_state: Dict[str, Any] = {
     "updatedAt": None,
     "openPositions": 0,
@@ -142,17 +319,63 @@ trading_metrics_state: Dict[str, Any] = {
     "dailyPnl": 0.0,
     "positions": [],
 }
-trading_history = deque(maxlen=TRADING_HISTORY_LIMIT)
-trading_history_lock = asyncio.Lock()
+trading_view = VersionedState("trading", trading_metrics_state)
+trading_store = HistoryStore(
+    TRADING_HISTORY_DIR,
+    tail=TRADING_HISTORY_LIMIT,
+    partition_seconds=HISTORY_PARTITION_HOURS * 3600,
+    index_every=HISTORY_INDEX_EVERY,
+    max_segment_bytes=HISTORY_SEGMENT_MAX_BYTES,
+    compression=HISTORY_COMPRESS,
+    zstd_level=HISTORY_ZSTD_LEVEL,
+    fsync_sealed=HISTORY_FSYNC != "none",
+    legacy_path=TRADING_HISTORY_PATH,
+)
+trading_writer = HistoryWriter(trading_store, fsync=HISTORY_FSYNC, fsync_interval=HISTORY_FSYNC_INTERVAL_SECS)
 strategy_metrics_state: Dict[str, Any] = {
     "updatedAt": None,
     "strategies": [],
 }
-strategy_history = deque(maxlen=STRATEGY_HISTORY_LIMIT)
-strategy_history_lock = asyncio.Lock()
+strategy_view = VersionedState("strategies", strategy_metrics_state)
+strategy_store = HistoryStore(
+    STRATEGY_HISTORY_DIR,
+    tail=STRATEGY_HISTORY_LIMIT,
+    partition_seconds=HISTORY_PARTITION_HOURS * 3600,
+    index_every=HISTORY_INDEX_EVERY,
+    max_segment_bytes=HISTORY_SEGMENT_MAX_BYTES,
+    compression=HISTORY_COMPRESS,
+    zstd_level=HISTORY_ZSTD_LEVEL,
+    fsync_sealed=HISTORY_FSYNC != "none",
+    legacy_path=STRATEGY_HISTORY_PATH,
+)
+strategy_writer = HistoryWriter(strategy_store, fsync=HISTORY_FSYNC, fsync_interval=HISTORY_FSYNC_INTERVAL_SECS)
+strategy_series = SeriesIndex(max_points=SERIES_MAX_POINTS, max_strategies=SERIES_MAX_STRATEGIES)
+
+
+telemetry_hub = TelemetryHub(
+    max_subscribers=STREAM_MAX_CLIENTS,
+    min_interval=STREAM_MIN_INTERVAL_MS / 1000.0,
+    keepalive=STREAM_KEEPALIVE_SECS,
+)
+
+
+def _position_key(position: Dict[str, Any]) -> str:
+    for field in ("symbol", "mint", "id"):
+        if position.get(field) is not None:
+            return str(position[field])
+    return json.dumps(position, sort_keys=True, default=str)
+
+
+def _strategy_key(strategy: Dict[str, Any]) -> str:
+    return str(strategy.get("name"))
+
+
+def _changed_fields(before: Dict[str, Any], after: Dict[str, Any], skip: str) -> Dict[str, Any]:
+    return {key: value for key, value in after.items() if key != skip and before.get(key) != value}
 
 
 def _apply_trading_snapshot(snapshot: Dict[str, Any]) -> None:
+    before = dict(trading_metrics_state) if telemetry_hub.active else None
     timestamp = snapshot.get("timestamp")
     if isinstance(timestamp, datetime):
         trading_metrics_state["updatedAt"] = timestamp.isoformat()
@@ -164,34 +387,31 @@ def _apply_trading_snapshot(snapshot: Dict[str, Any]) -> None:
     trading_metrics_state["realizedPnl"] = snapshot.get("realized_pnl", 0.0)
     trading_metrics_state["dailyPnl"] = snapshot.get("daily_pnl", 0.0)
     trading_metrics_state["positions"] = snapshot.get("positions", [])
+    trading_view.bump()
+    if before is not None:
+        upserts, removals = diff_items(before["positions"], trading_metrics_state["positions"], _position_key)
+        telemetry_hub.publish(
+            "trading",
+            fields=_changed_fields(before, trading_metrics_state, "positions"),
+            collection="positions",
+            upserts=upserts,
+            removals=removals,
+        )
 
 
 def _load_trading_history() -> None:
-    if not TRADING_HISTORY_PATH.exists():
-        return
     try:
-        with TRADING_HISTORY_PATH.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                snapshot = json.loads(line)
-                trading_history.append(snapshot)
-        if trading_history:
-            _apply_trading_snapshot(trading_history[-1])
+        recent = trading_store.load()
+        if recent:
+            _apply_trading_snapshot(recent[-1])
     except Exception as exc:  # pragma: no cover - best-effort load
         logger.warning("Failed to load trading history: %s", exc)
 
 
 async def _persist_trading_snapshot(snapshot: Dict[str, Any]) -> None:
-    def _append(path: Path, payload: str) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("a", encoding="utf-8") as handle:
-            handle.write(payload)
-
-    line = json.dumps(snapshot) + "\n"
+    trading_store.append(snapshot)
     try:
-        await asyncio.to_thread(_append, TRADING_HISTORY_PATH, line)
+        await trading_writer.commit()
     except Exception as exc:  # pragma: no cover - disk full, etc.
         logger.warning("Failed to persist trading snapshot: %s", exc)
 
@@ -200,40 +420,90 @@ _load_trading_history()
 
 
 def _apply_strategy_snapshot(snapshot: Dict[str, Any]) -> None:
+    before = dict(strategy_metrics_state) if telemetry_hub.active else None
     strategy_metrics_state["updatedAt"] = snapshot.get("timestamp")
     strategy_metrics_state["strategies"] = snapshot.get("strategies", [])
+    strategy_view.bump()
+    if before is not None:
+        upserts, removals = diff_items(before["strategies"], strategy_metrics_state["strategies"], _strategy_key)
+        telemetry_hub.publish(
+            "strategies",
+            fields=_changed_fields(before, strategy_metrics_state, "strategies"),
+            collection="strategies",
+            upserts=upserts,
+            removals=removals,
+        )
 
 
 def _load_strategy_history() -> None:
-    if not STRATEGY_HISTORY_PATH.exists():
-        return
     try:
-        with STRATEGY_HISTORY_PATH.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                snapshot = json.loads(line)
-                strategy_history.append(snapshot)
-        if strategy_history:
-            _apply_strategy_snapshot(strategy_history[-1])
+        recent = strategy_store.load()
+        if recent:
+            _apply_strategy_snapshot(recent[-1])
+        _seed_strategy_series()
     except Exception as exc:  # pragma: no cover
         logger.warning("Failed to load strategy history: %s", exc)
 
 
-async def _persist_strategy_snapshot(snapshot: Dict[str, Any]) -> None:
-    def _append(path: Path, payload: str) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("a", encoding="utf-8") as handle:
-            handle.write(payload)
+def _seed_strategy_series() -> None:
+    """Replay the last ``SERIES_SEED_HOURS`` of strategy history into the series index."""
+
+    if SERIES_SEED_HOURS <= 0:
+        return
+    since = time.time() - SERIES_SEED_HOURS * 3600
+    pages: list[list[Dict[str, Any]]] = []
+    cursor: str | None = None
+    loaded = 0
+    # pages come newest first; stop once every series would be full anyway
+    while loaded < SERIES_MAX_POINTS:
+        items, cursor = strategy_store.query(since, None, HISTORY_PAGE_MAX, cursor)
+        pages.append(items)
+        loaded += len(items)
+        if cursor is None:
+            break
+    for items in reversed(pages):
+        for snapshot in items:
+            strategy_series.add_snapshot(snapshot)
 
-    line = json.dumps(snapshot) + "\n"
+
+async def _persist_strategy_snapshot(snapshot: Dict[str, Any]) -> None:
+    strategy_store.append(snapshot)
     try:
-        await asyncio.to_thread(_append, STRATEGY_HISTORY_PATH, line)
+        await strategy_writer.commit()
     except Exception as exc:  # pragma: no cover
         logger.warning("Failed to persist strategy snapshot: %s", exc)
 
 
+def _query_etag(name: str, version: int, *query: Any) -> str:
+    # a result only changes when its source does; the query goes in as a digest
+    digest = zlib.crc32(repr(query).encode("utf-8"))
+    return make_etag(name, version, f"{digest:08x}")
+
+
+async def _history_page(
+    request: Request,
+    store: HistoryStore,
+    limit: int,
+    since: datetime | None,
+    until: datetime | None,
+    cursor: str | None,
+) -> Response:
+    limit = max(1, min(limit, HISTORY_PAGE_MAX))
+    etag = _query_etag(store.directory.name, store.version, limit, to_epoch(since), to_epoch(until), cursor)
+    if not_modified(request, etag):
+        return json_response(request, etag, b"")
+    page = None
+    if since is None and until is None and cursor is None:
+        page = store.tail(limit)
+    if page is None:
+        try:
+            page = await asyncio.to_thread(store.query, to_epoch(since), to_epoch(until), limit, cursor)
+        except ValueError as exc:
+            raise HTTPException(400, str(exc)) from exc
+    items, next_cursor = page
+    return json_response(request, etag, encode({"history": items, "nextCursor": next_cursor}))
+
+
 _load_strategy_history()
 
 
@@ -280,15 +550,14 @@ class StrategyMetrics(BaseModel):
     strategies: list[StrategyEntry]
 
 
+mcp_session = MCPSession(MEMMCP_HTTP_URL, lambda: http_clients.get("memory-bank"), MCP_HEADERS)
+
+
 async def _call_mcp(payload: dict[str, Any]) -> dict[str, Any]:
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        resp = await client.post(MEMMCP_HTTP_URL, json=payload, headers=MCP_HEADERS)
-    if resp.status_code != 200:
-        raise HTTPException(resp.status_code, resp.text)
-    data = None
-    for line in resp.text.splitlines():
-        if line.startswith("data: "):
-            data = json.loads(line[6:])
+    try:
+        data = await mcp_session.call(payload)
+    except MCPError as exc:
+        raise HTTPException(exc.status_code, exc.detail) from exc
     if not data:
         raise HTTPException(500, "No MCP response data")
     if "error" in data:
@@ -296,14 +565,29 @@ async def _call_mcp(payload: dict[str, Any]) -> dict[str, Any]:
     return data["result"]
 
 
-async def call_memory_tool(name: str, arguments: dict[str, Any]) -> dict[str, Any]:
-    payload = {
+def _tool_call_payload(name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    return {
         "jsonrpc": "2.0",
         "id": str(uuid.uuid4()),
         "method": "tools/call",
         "params": {"name": name, "arguments": arguments},
     }
-    return await _call_mcp(payload)
+
+
+async def call_memory_tool(name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    return await _call_mcp(_tool_call_payload(name, arguments))
+
+
+async def stream_memory_tool(name: str, arguments: dict[str, Any]) -> AsyncIterator[bytes]:
+    """Relay a tool call's JSON-RPC messages as SSE frames while they arrive."""
+
+    try:
+        async with aclosing(mcp_session.messages(_tool_call_payload(name, arguments))) as stream:
+            async for message in stream:
+                yield b"data: " + json.dumps(message).encode("utf-8") + b"\n\n"
+    except (MCPError, httpx.HTTPError) as exc:
+        error = {"jsonrpc": "2.0", "error": {"code": -32603, "message": str(exc)}}
+        yield b"event: error\ndata: " + json.dumps(error).encode("utf-8") + b"\n\n"
 
 
 async def list_projects() -> list[str]:
@@ -316,64 +600,177 @@ async def list_files(project: str) -> list[str]:
     return result.get("content", [])
 
 
+sparse_encoder = SparseEncoder(SPARSE_MODEL)
+
+# Hybrid mode stores a named dense vector next to the sparse one, so it needs
+# its own collection layout; dense-only keeps the original unnamed vector.
+qdrant_collections = CollectionRegistry(
+    QDRANT_URL,
+    lambda: http_clients.get("qdrant"),
+    vector_name=DENSE_VECTOR_NAME if sparse_encoder.enabled else None,
+    sparse_vectors=(
+        {SPARSE_VECTOR_NAME: {"modifier": "idf"} if sparse_encoder.uses_idf else {}}
+        if sparse_encoder.enabled
+        else None
+    ),
+)
+
+
 async def ensure_qdrant_collection(vector_size: int) -> None:
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        resp = await client.get(f"{QDRANT_URL}/collections/{QDRANT_COLLECTION}")
-    if resp.status_code == 200:
-        body = resp.json()
-        current_size = (
-            body.get("result", {})
-            .get("config", {})
-            .get("params", {})
-            .get("vectors", {})
-            .get("size")
-        )
-        if current_size and current_size != vector_size:
-            raise RuntimeError(
-                "Qdrant collection dimension mismatch: "
-                f"existing={current_size}, required={vector_size}. "
-                "Drop the collection or adjust the embedding model."
-            )
-        return
-    schema = {
-        "vectors": {"size": vector_size, "distance": "Cosine"},
-    }
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        create = await client.put(
-            f"{QDRANT_URL}/collections/{QDRANT_COLLECTION}", json=schema
-        )
-    if create.status_code not in (200, 202):
-        raise RuntimeError(f"Failed to create Qdrant collection: {create.text}")
+    await qdrant_collections.ensure(QDRANT_COLLECTION, vector_size)
+
+
+async def _send_qdrant_points(points: list[dict[str, Any]], wait: bool) -> None:
+    url = f"{QDRANT_URL}/collections/{QDRANT_COLLECTION}/points"
+    params = {"wait": "true" if wait else "false"}
+    payload = {"points": points}
+    resp = await http_clients.get("qdrant").put(url, json=payload, params=params)
+    if is_stale_collection_error(resp):
+        # Collection was dropped or recreated behind our back; re-check once.
+        vector = points[0]["vector"]
+        dim = len(vector[DENSE_VECTOR_NAME] if isinstance(vector, dict) else vector)
+        qdrant_collections.invalidate(QDRANT_COLLECTION, dim)
+        await ensure_qdrant_collection(dim)
+        resp = await http_clients.get("qdrant").put(url, json=payload, params=params)
+    if resp.status_code not in (200, 202):
+        raise RuntimeError(f"Qdrant upsert failed: {resp.text}")
+
+
+# never upserted; deleting it is a no-op that still queues behind earlier updates
+_BARRIER_POINT_ID = str(uuid.uuid5(uuid.NAMESPACE_URL, "memmcp:orchestrator:barrier"))
+
+
+async def _qdrant_barrier() -> None:
+    resp = await http_clients.get("qdrant").post(
+        f"{QDRANT_URL}/collections/{QDRANT_COLLECTION}/points/delete",
+        json={"points": [_BARRIER_POINT_ID]},
+        params={"wait": "true"},
+    )
+    if resp.status_code not in (200, 404):
+        raise RuntimeError(f"Qdrant barrier failed: {resp.text}")
+
+
+qdrant_writer = QdrantWriter(
+    _send_qdrant_points,
+    max_points=QDRANT_BATCH_MAX,
+    window=QDRANT_BATCH_WINDOW_MS / 1000.0,
+    qdrant_wait=QDRANT_WAIT,
+    barrier=_qdrant_barrier,
+)
+
+
+chunker = TextChunker(CHUNK_TOKENS, CHUNK_OVERLAP)
+chunk_stats: Dict[str, int] = {"files": 0, "chunks": 0, "embedded": 0, "unchanged": 0, "deleted": 0}
+
+
+def _chunk_fingerprint(text: str) -> str:
+    # identifies the vectors a chunk would get, so switching models re-embeds
+    key = cache_key(EMBEDDING_PROVIDER, EMBEDDING_MODEL, FALLBACK_EMBED_DIM, text)
+    return f"{key}:{SPARSE_MODEL}" if sparse_encoder.enabled else key
+
+
+async def _indexed_chunks(ids: list[str]) -> Dict[str, Dict[str, Any]]:
+    """Payload (``hash``, ``chunks``) of the given points that already exist."""
+
+    resp = await http_clients.get("qdrant").post(
+        f"{QDRANT_URL}/collections/{QDRANT_COLLECTION}/points",
+        json={"ids": ids, "with_payload": ["hash", "chunks"], "with_vector": False},
+    )
+    if resp.status_code == 404:
+        return {}
+    if resp.status_code != 200:
+        raise RuntimeError(f"Qdrant point lookup failed: {resp.text}")
+    return {str(point["id"]): point.get("payload") or {} for point in resp.json().get("result") or []}
+
+
+async def _delete_qdrant_points(ids: list[str]) -> None:
+    await qdrant_writer.flush()
+    resp = await http_clients.get("qdrant").post(
+        f"{QDRANT_URL}/collections/{QDRANT_COLLECTION}/points/delete",
+        json={"points": ids},
+        params={"wait": "true" if QDRANT_WAIT else "false"},
+    )
+    if resp.status_code not in (200, 202, 404):
+        raise RuntimeError(f"Qdrant delete failed: {resp.text}")
+
+
+async def _set_qdrant_payload(ids: list[str], payload: Dict[str, Any]) -> None:
+    resp = await http_clients.get("qdrant").post(
+        f"{QDRANT_URL}/collections/{QDRANT_COLLECTION}/points/payload",
+        json={"payload": payload, "points": ids},
+        params={"wait": "true" if QDRANT_WAIT else "false"},
+    )
+    if resp.status_code not in (200, 202):
+        raise RuntimeError(f"Qdrant payload update failed: {resp.text}")
 
 
 async def push_to_qdrant(project: str, file_name: str, content: str) -> None:
-    vector = await embed_text(content)
-    await ensure_qdrant_collection(len(vector))
-    payload = {
-        "points": [
-            {
-                "id": str(uuid.uuid4()),
-                "vector": vector,
+    """Index ``content`` as one point per chunk, replacing the file's previous points.
+
+    Point ids are derived from (project, file, chunk#), so a rewrite overwrites
+    the old chunks in place; chunks whose text (and embedding model) did not
+    change are skipped, and trailing chunks of a longer previous version are
+    deleted.
+    """
+
+    chunks = await asyncio.to_thread(chunker.split, content)
+    ids = [chunk_point_id(project, file_name, chunk.index) for chunk in chunks]
+    fingerprints = [_chunk_fingerprint(chunk.text) for chunk in chunks]
+    # chunk 0 is looked up even for empty content, to learn the previous chunk count
+    existing = await _indexed_chunks(ids or [chunk_point_id(project, file_name, 0)])
+    chunk_stats["files"] += 1
+    chunk_stats["chunks"] += len(chunks)
+
+    changed, recount = [], []
+    for idx, point_id in enumerate(ids):
+        indexed = existing.get(point_id)
+        if indexed is None or indexed.get("hash") != fingerprints[idx]:
+            changed.append(idx)
+        elif indexed.get("chunks") != len(chunks):
+            recount.append(point_id)
+    chunk_stats["unchanged"] += len(chunks) - len(changed)
+    if recount:
+        # unchanged chunks of a file that grew or shrank only need the new count
+        await _set_qdrant_payload(recount, {"chunks": len(chunks)})
+    if changed:
+        texts = [chunks[idx].text for idx in changed]
+        vectors = await embed_texts(texts)
+        await ensure_qdrant_collection(len(vectors[0]))
+        sparse = await sparse_encoder.encode(texts) if sparse_encoder.enabled else None
+        points = []
+        for pos, idx in enumerate(changed):
+            chunk = chunks[idx]
+            points.append({
+                "id": ids[idx],
+                "vector": (
+                    {DENSE_VECTOR_NAME: vectors[pos], SPARSE_VECTOR_NAME: sparse[pos]}
+                    if sparse is not None
+                    else vectors[pos]
+                ),
                 "payload": {
                     "project": project,
                     "file": file_name,
-                    "summary": content[:500],
+                    "chunk": chunk.index,
+                    "chunks": len(chunks),
+                    "hash": fingerprints[idx],
+                    "text": chunk.text,
                 },
-            }
-        ]
-    }
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        resp = await client.put(
-            f"{QDRANT_URL}/collections/{QDRANT_COLLECTION}/points",
-            json=payload,
+            })
+        await qdrant_writer.upsert(points)
+        chunk_stats["embedded"] += len(points)
+
+    first = existing.get(chunk_point_id(project, file_name, 0), {})
+    previous = first.get("chunks") if isinstance(first.get("chunks"), int) else 0
+    if previous > len(chunks):
+        await _delete_qdrant_points(
+            [chunk_point_id(project, file_name, idx) for idx in range(len(chunks), previous)]
         )
-    if resp.status_code not in (200, 202):
-        raise RuntimeError(f"Qdrant upsert failed: {resp.text}")
+        chunk_stats["deleted"] += previous - len(chunks)
 
 
-async def push_to_langfuse(project: str, summary: str, payload: dict[str, Any]) -> None:
+async def push_to_langfuse(project: str, summary: str, payload: dict[str, Any]) -> httpx.Response | None:
     if not LANGFUSE_API_KEY:
-        return
+        return None
     event = {
         "id": str(uuid.uuid4()),
         "type": "trace",
@@ -382,18 +779,134 @@ async def push_to_langfuse(project: str, summary: str, payload: dict[str, Any])
         "input": payload,
     }
     headers = {"x-langfuse-api-key": LANGFUSE_API_KEY}
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        await client.post(f"{LANGFUSE_URL}/api/public/ingest", json=[event], headers=headers)
+    return await http_clients.get("langfuse").post(
+        f"{LANGFUSE_URL}/api/public/ingest", json=[event], headers=headers
+    )
+
+
+async def _qdrant_job(job: dict[str, Any]) -> None:
+    await push_to_qdrant(job["project"], job["file"], job["content"])
+
+
+async def _langfuse_job(job: dict[str, Any]) -> None:
+    resp = await push_to_langfuse(job["project"], job["summary"], job["payload"])
+    if resp is not None and resp.status_code >= 500:
+        raise RuntimeError(f"Langfuse ingest failed with status {resp.status_code}")
+
+
+qdrant_queue = WriteBehindQueue(
+    "qdrant",
+    _qdrant_job,
+    maxsize=WRITE_BEHIND_QUEUE_SIZE,
+    workers=WRITE_BEHIND_WORKERS,
+    max_attempts=WRITE_BEHIND_MAX_ATTEMPTS,
+    dead_letter_path=DEAD_LETTER_PATH,
+)
+langfuse_queue = WriteBehindQueue(
+    "langfuse",
+    _langfuse_job,
+    maxsize=WRITE_BEHIND_QUEUE_SIZE,
+    workers=WRITE_BEHIND_WORKERS,
+    max_attempts=WRITE_BEHIND_MAX_ATTEMPTS,
+    dead_letter_path=DEAD_LETTER_PATH,
+)
+
+
+def _check_write_behind_capacity() -> None:
+    if not WRITE_BEHIND:
+        return
+    if not qdrant_queue.has_capacity() or (LANGFUSE_API_KEY and not langfuse_queue.has_capacity()):
+        raise HTTPException(429, "Write-behind queue is full; retry shortly")
+
+
+async def _fan_out(
+    project: str, file_name: str, content: str, summary: str, trace: dict[str, Any]
+) -> bool:
+    """Index into Qdrant and trace to Langfuse, inline or via the write-behind queues.
+
+    Returns True when the work was queued rather than completed.
+    """
+
+    if not WRITE_BEHIND:
+        await asyncio.gather(
+            push_to_qdrant(project, file_name, content),
+            push_to_langfuse(project, summary, trace),
+        )
+        return False
+    if not qdrant_queue.submit({"project": project, "file": file_name, "content": content}):
+        await qdrant_queue.dead_letter(
+            {"project": project, "file": file_name, "content": content}, "queue full"
+        )
+    if LANGFUSE_API_KEY and not langfuse_queue.submit(
+        {"project": project, "summary": summary, "payload": trace}
+    ):
+        await langfuse_queue.dead_letter(
+            {"project": project, "summary": summary, "payload": trace}, "queue full"
+        )
+    return True
+
+
+project_index: Dict[str, Any] = {
+    "body": None,
+    "expiresAt": 0.0,
+    "generation": 0,
+    "inflight": None,
+}
+
+
+def invalidate_project_index() -> None:
+    project_index["generation"] += 1
+    project_index["body"] = None
+    project_index["inflight"] = None
+
+
+async def _build_project_index() -> Dict[str, Any]:
+    projects = await list_projects()
+    gate = asyncio.Semaphore(max(1, PROJECTS_CONCURRENCY))
+
+    async def _entry(project: str) -> Dict[str, Any]:
+        async with gate:
+            try:
+                files = await list_files(project)
+            except Exception as exc:
+                detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+                return {"name": project, "files": [], "error": str(detail)}
+        return {"name": project, "files": [{"name": f} for f in files]}
+
+    results = await asyncio.gather(*(_entry(project) for project in projects))
+    return {"projects": results, "partial": any("error" in entry for entry in results)}
+
+
+async def _cached_project_index() -> Dict[str, Any]:
+    body = project_index["body"]
+    if body is not None and time.monotonic() < project_index["expiresAt"]:
+        return body
+    inflight = project_index["inflight"]
+    if inflight is None:
+        generation = project_index["generation"]
+
+        async def _refresh() -> Dict[str, Any]:
+            try:
+                fresh = await _build_project_index()
+            finally:
+                if project_index["inflight"] is asyncio.current_task():
+                    project_index["inflight"] = None
+            # A write landed while we were listing; don't cache a stale view.
+            if generation == project_index["generation"] and not fresh["partial"]:
+                project_index["body"] = fresh
+                project_index["expiresAt"] = time.monotonic() + PROJECTS_CACHE_TTL
+            return fresh
+
+        inflight = asyncio.ensure_future(_refresh())
+        project_index["inflight"] = inflight
+    return await asyncio.shield(inflight)
 
 
 @app.get("/projects")
 async def get_projects():
-    projects = await list_projects()
-    results = []
-    for project in projects:
-        files = await list_files(project)
-        results.append({"name": project, "files": [{"name": f} for f in files]})
-    return {"projects": results}
+    if PROJECTS_CACHE_TTL <= 0:
+        return await _build_project_index()
+    return await _cached_project_index()
 
 
 @app.get("/projects/{project}/files")
@@ -402,34 +915,60 @@ async def get_files(project: str):
     return {"files": files}
 
 
+@app.get("/projects/{project}/files/{file_name}")
+async def read_file(project: str, file_name: str):
+    """Stream a ``memory_bank_read`` result to the caller as SSE without buffering it."""
+
+    return StreamingResponse(
+        stream_memory_tool("memory_bank_read", {"projectName": project, "fileName": file_name}),
+        media_type="text/event-stream",
+    )
+
+
 @app.post("/memory/write")
 async def write_memory(payload: MemoryWrite):
+    _check_write_behind_capacity()
     await call_memory_tool(
         "memory_bank_write",
         payload.model_dump(),
     )
-    await asyncio.gather(
-        push_to_qdrant(payload.projectName, payload.fileName, payload.content),
-        push_to_langfuse(payload.projectName, "manual entry", payload.model_dump()),
+    invalidate_project_index()
+    queued = await _fan_out(
+        payload.projectName,
+        payload.fileName,
+        payload.content,
+        "manual entry",
+        payload.model_dump(),
     )
-    return {"ok": True}
+    return {"ok": True, "queued": queued}
 
 
 @app.post("/ingest/trajectory")
 async def ingest_trajectory(body: TrajectoryIngest):
     summary = body.summary
+    file_name = f"trajectory-{uuid.uuid4().hex}.json"
+    _check_write_behind_capacity()
     await call_memory_tool(
         "memory_bank_write",
         {
             "projectName": body.project,
-            "fileName": f"trajectory-{uuid.uuid4().hex}.json",
+            "fileName": file_name,
             "content": json.dumps(body.trajectory, indent=2),
         },
     )
-    await asyncio.gather(
-        push_to_qdrant(body.project, "trajectory", summary),
-        push_to_langfuse(body.project, summary, body.trajectory),
-    )
+    invalidate_project_index()
+    queued = await _fan_out(body.project, file_name, summary, summary, body.trajectory)
+    return {"ok": True, "queued": queued}
+
+
+@app.post("/memory/flush")
+async def flush_memory_index():
+    """Barrier for read-after-write: every queued Qdrant point is applied on return."""
+
+    try:
+        await qdrant_writer.flush()
+    except Exception as exc:
+        raise HTTPException(502, f"Qdrant flush failed: {exc}") from exc
     return {"ok": True}
 
 
@@ -445,8 +984,7 @@ async def status():
 
     # Langfuse
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(LANGFUSE_URL)
+        resp = await http_clients.get("langfuse").get(LANGFUSE_URL, timeout=5.0)
         services.append({
             "name": "langfuse",
             "healthy": resp.status_code == 200,
@@ -457,8 +995,7 @@ async def status():
 
     # Qdrant
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(f"{QDRANT_URL}/readyz")
+        resp = await http_clients.get("qdrant").get(f"{QDRANT_URL}/readyz", timeout=5.0)
         services.append({
             "name": "qdrant",
             "healthy": resp.status_code == 200,
@@ -470,8 +1007,98 @@ async def status():
     return {"services": services}
 
 
+@app.get("/telemetry/pools")
+async def get_pool_stats():
+    return {"pools": http_clients.stats(), "mcpSession": mcp_session.stats()}
+
+
+@app.get("/telemetry/qdrant")
+async def get_qdrant_stats():
+    return {
+        "collections": qdrant_collections.stats(),
+        "writer": qdrant_writer.stats(),
+        "sparse": sparse_encoder.stats(),
+        "chunks": {"maxTokens": chunker.max_tokens, "overlap": chunker.overlap, **chunk_stats},
+    }
+
+
+@app.get("/telemetry/embeddings")
+async def get_embedding_stats():
+    return {
+        "provider": EMBEDDING_PROVIDER,
+        "batcher": embedding_batcher.stats(),
+        "cache": embedding_cache.stats(),
+    }
+
+
+def _write_behind_stats() -> Dict[str, Any]:
+    return {
+        "enabled": WRITE_BEHIND,
+        "queues": {"qdrant": qdrant_queue.stats(), "langfuse": langfuse_queue.stats()},
+    }
+
+
+def _refresh_write_behind() -> None:
+    """Copy the write-behind queue stats into ``telemetry_state["writeBehind"]``.
+
+    The queues change without a metrics POST, so readers of the metrics view
+    and the stream refresh them first; the view is only bumped on a change.
+    """
+
+    stats = _write_behind_stats()
+    if telemetry_state.get("writeBehind") == stats:
+        return
+    telemetry_state["writeBehind"] = stats
+    metrics_view.bump()
+    if telemetry_hub.active:
+        telemetry_hub.publish("metrics", fields={"writeBehind": stats})
+
+
+@app.get("/telemetry/write-behind")
+async def get_write_behind_stats():
+    return _write_behind_stats()
+
+
+@app.get("/telemetry/stream")
+async def stream_telemetry():
+    """Server-Sent Events: a ``snapshot`` of all telemetry state, then coalesced ``delta`` events."""
+
+    _refresh_write_behind()
+    try:
+        subscriber = telemetry_hub.subscribe(
+            {
+                "metrics": telemetry_state,
+                "trading": trading_metrics_state,
+                "strategies": strategy_metrics_state,
+                # the keys deltas will use, in the same order as each collection
+                "keys": {
+                    "trading": {"positions": list(keyed(trading_metrics_state["positions"], _position_key))},
+                    "strategies": {"strategies": list(keyed(strategy_metrics_state["strategies"], _strategy_key))},
+                },
+            }
+        )
+    except StreamFull as exc:
+        raise HTTPException(503, str(exc)) from exc
+    return telemetry_hub.response(subscriber)
+
+
+@app.get("/telemetry/stream/stats")
+async def get_stream_stats():
+    return telemetry_hub.stats()
+
+
+@app.get("/telemetry/history")
+async def get_history_stats():
+    return {
+        "trading": {**trading_store.stats(), "writer": trading_writer.stats()},
+        "strategies": {**strategy_store.stats(), "writer": strategy_writer.stats()},
+        "views": {view.name: view.stats() for view in (metrics_view, trading_view, strategy_view)},
+    }
+
+
 @app.post("/telemetry/metrics")
 async def ingest_metrics(payload: TelemetryMetrics):
+    before = {**telemetry_state, "totals": dict(telemetry_state["totals"])} if telemetry_hub.active else None
     telemetry_state["updatedAt"] = payload.timestamp.isoformat()
     telemetry_state["queueDepth"] = payload.queueDepth
     telemetry_state["batchSize"] = payload.batchSize
@@ -482,12 +1109,17 @@ async def ingest_metrics(payload: TelemetryMetrics):
         "batches": payload.totals.get("batches", totals.get("batches", 0)),
         "flushedEvents": payload.totals.get("flushedEvents", totals.get("flushedEvents", 0)),
     })
+    metrics_view.bump()
+    if before is not None:
+        telemetry_hub.publish("metrics", fields=_changed_fields(before, telemetry_state, ""))
+    _refresh_write_behind()
     return {"ok": True}
 
 
 @app.get("/telemetry/metrics")
-async def get_metrics():
-    return telemetry_state
+async def get_metrics(request: Request):
+    _refresh_write_behind()
+    return metrics_view.response(request)
 
 
 @app.post("/telemetry/trading")
@@ -495,24 +1127,24 @@ async def ingest_trading(payload: TradingMetrics):
     snapshot = payload.model_dump()
     snapshot["timestamp"] = payload.timestamp.isoformat()
     _apply_trading_snapshot(snapshot)
-    async with trading_history_lock:
-        trading_history.append(snapshot)
-        history_size = len(trading_history)
     await _persist_trading_snapshot(snapshot)
-    return {"ok": True, "historySize": history_size}
+    return {"ok": True, "historySize": len(trading_store.recent)}
 
 
 @app.get("/telemetry/trading")
-async def get_trading_metrics():
-    return trading_metrics_state
+async def get_trading_metrics(request: Request):
+    return trading_view.response(request)
 
 
 @app.get("/telemetry/trading/history")
-async def get_trading_history(limit: int = 50):
-    limit = max(1, min(limit, TRADING_HISTORY_LIMIT))
-    async with trading_history_lock:
-        items = list(trading_history)[-limit:]
-    return {"history": items}
+async def get_trading_history(
+    request: Request,
+    limit: int = 50,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+):
+    return await _history_page(request, trading_store, limit, since, until, cursor)
 
 
 @app.post("/telemetry/strategies")
@@ -520,21 +1152,97 @@ async def ingest_strategy_metrics(payload: StrategyMetrics):
     snapshot = payload.model_dump()
     snapshot["timestamp"] = payload.timestamp.isoformat()
     _apply_strategy_snapshot(snapshot)
-    async with strategy_history_lock:
-        strategy_history.append(snapshot)
-        history_size = len(strategy_history)
+    strategy_series.add_snapshot(snapshot)
     await _persist_strategy_snapshot(snapshot)
-    return {"ok": True, "historySize": history_size}
+    return {"ok": True, "historySize": len(strategy_store.recent)}
 
 
 @app.get("/telemetry/strategies")
-async def get_strategy_metrics():
-    return strategy_metrics_state
+async def get_strategy_metrics(request: Request):
+    return strategy_view.response(request)
 
 
 @app.get("/telemetry/strategies/history")
-async def get_strategy_history(limit: int = 50):
-    limit = max(1, min(limit, STRATEGY_HISTORY_LIMIT))
-    async with strategy_history_lock:
-        items = list(strategy_history)[-limit:]
-    return {"history": items}
+async def get_strategy_history(
+    request: Request,
+    limit: int = 50,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+):
+    return await _history_page(request, strategy_store, limit, since, until, cursor)
+
+
+@app.get("/telemetry/strategies/series")
+async def get_strategy_series(
+    request: Request,
+    name: str | None = None,
+    limit: int = 500,
+    since: datetime | None = None,
+    until: datetime | None = None,
+):
+    """Without ``name``, every indexed strategy with its latest values; with it, that strategy's points."""
+
+    limit = max(1, min(limit, HISTORY_PAGE_MAX))
+    etag = _query_etag("series", strategy_series.version, name, limit, to_epoch(since), to_epoch(until))
+    if not_modified(request, etag):
+        return json_response(request, etag, b"")
+    if name is None:
+        return json_response(
+            request, etag, encode({"strategies": strategy_series.summary(), "index": strategy_series.stats()})
+        )
+    try:
+        page = strategy_series.history(name, to_epoch(since), to_epoch(until), limit)
+    except KeyError as exc:
+        raise HTTPException(404, f"No series for strategy {name!r}") from exc
+    return json_response(request, etag, encode(page))
+
+
+@app.get("/telemetry/strategies/buckets")
+async def get_strategy_buckets(
+    request: Request,
+    name: str,
+    interval: float = 300.0,
+    limit: int = 288,
+    since: datetime | None = None,
+    until: datetime | None = None,
+):
+    limit = max(1, min(limit, SERIES_BUCKETS_MAX))
+    etag = _query_etag("buckets", strategy_series.version, name, interval, limit, to_epoch(since), to_epoch(until))
+    if not_modified(request, etag):
+        return json_response(request, etag, b"")
+    try:
+        buckets = strategy_series.buckets(name, interval, to_epoch(since), to_epoch(until), limit)
+    except KeyError as exc:
+        raise HTTPException(404, f"No series for strategy {name!r}") from exc
+    except ValueError as exc:
+        raise HTTPException(400, str(exc)) from exc
+    return json_response(request, etag, encode({"name": name, "interval": interval, "buckets": buckets}))
+
+
+@app.get("/telemetry/strategies/rankings")
+async def get_strategy_rankings(
+    request: Request,
+    field: str = "daily_pnl",
+    stat: str = "last",
+    window: float | None = None,
+    limit: int = 10,
+    ascending: bool = False,
+):
+    """Top ``limit`` strategies by ``stat`` (last/avg/min/max/change) of ``field`` over the last ``window`` seconds."""
+
+    if field not in SERIES_FIELDS or stat not in SERIES_STATS:
+        raise HTTPException(
+            400, f"field must be one of {', '.join(SERIES_FIELDS)}; stat one of {', '.join(SERIES_STATS)}"
+        )
+    since = time.time() - window if window else None
+    limit = max(1, min(limit, SERIES_MAX_STRATEGIES))
+    # windowed rankings move with the clock, so only cache the all-time ones
+    etag = None if window else _query_etag("rankings", strategy_series.version, field, stat, limit, ascending)
+    if etag and not_modified(request, etag):
+        return json_response(request, etag, b"")
+    ranking = strategy_series.rank(field, stat, since=since, limit=limit, ascending=ascending)
+    body = {"field": field, "stat": stat, "window": window, "ranking": ranking}
+    if etag is None:
+        return body
+    return json_response(request, etag, encode(body))
@@ -0,0 +1,82 @@
+"""Compare one-at-a-time embedding against the micro-batcher.
+
+Simulates a provider whose latency is a fixed round-trip cost plus a small
+per-item cost, fires ``--requests`` concurrent embeds and prints throughput
+and latency percentiles for both paths.
+
+    python benchmarks/bench_embedding_batcher.py --requests 500 --rtt-ms 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from embedding_batcher import EmbeddingBatcher  # noqa: E402
+from metrics import LatencyWindow  # noqa: E402
+
+
+def _fake_provider(rtt: float, per_item: float, max_concurrency: int):
+    gate = asyncio.Semaphore(max_concurrency)
+    calls = {"n": 0}
+
+    async def embed_many(texts: list[str]) -> list[list[float]]:
+        async with gate:
+            calls["n"] += 1
+            await asyncio.sleep(rtt + per_item * len(texts))
+        return [[float(len(t))] for t in texts]
+
+    return embed_many, calls
+
+
+async def _drive(embed, count: int) -> tuple[float, LatencyWindow]:
+    window = LatencyWindow(size=count)
+
+    async def one(i: int) -> None:
+        started = time.perf_counter()
+        await embed(f"memory note {i}")
+        window.record(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return time.perf_counter() - started, window
+
+
+async def main(args: argparse.Namespace) -> None:
+    rtt, per_item = args.rtt_ms / 1000.0, args.per_item_ms / 1000.0
+
+    embed_many, calls = _fake_provider(rtt, per_item, args.provider_concurrency)
+
+    async def single(text: str) -> list[float]:
+        return (await embed_many([text]))[0]
+
+    elapsed, lat = await _drive(single, args.requests)
+    print(
+        f"one-at-a-time: {args.requests / elapsed:8.1f} req/s  "
+        f"p50={lat.percentile(50) * 1000:7.2f}ms p99={lat.percentile(99) * 1000:7.2f}ms  "
+        f"provider calls={calls['n']}"
+    )
+
+    embed_many, calls = _fake_provider(rtt, per_item, args.provider_concurrency)
+    batcher = EmbeddingBatcher(embed_many, max_batch=args.max_batch, window=args.window_ms / 1000.0)
+    elapsed, lat = await _drive(batcher.embed, args.requests)
+    print(
+        f"batched:       {args.requests / elapsed:8.1f} req/s  "
+        f"p50={lat.percentile(50) * 1000:7.2f}ms p99={lat.percentile(99) * 1000:7.2f}ms  "
+        f"provider calls={calls['n']} avg batch={batcher.stats()['avgBatchSize']}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=20.0)
+    parser.add_argument("--per-item-ms", type=float, default=0.2)
+    parser.add_argument("--provider-concurrency", type=int, default=4)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,165 @@
+"""Compare the ``cheap`` byte-sum embedder with the NumPy feature-hashing one.
+
+Reports per-document embedding cost on trajectory-sized JSON and a small
+retrieval check: each query is a reworded fragment of one memory note, and
+the note should rank first by cosine similarity. Exits non-zero if the hashed
+embedder does not beat ``cheap`` on MRR.
+
+    python benchmarks/bench_hashed_embedding.py --docs 2000 --dim 256
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from hashed_embedding import HashedEmbedder  # noqa: E402
+
+
+def _cheap_embedding(text: str, vector_size: int) -> list[float]:
+    # copy of app._cheap_embedding; importing app would start its clients
+    base = [0.0] * vector_size
+    encoded = text.encode("utf-8")
+    if not encoded:
+        return base
+    for idx, char in enumerate(encoded):
+        base[idx % vector_size] += char / 255.0
+    norm = max(sum(base), 1e-6)
+    return [round(val / norm, 6) for val in base]
+
+
+NOTES = [
+    "Momentum strategy on SOL perp stopped out after funding flipped negative overnight.",
+    "Qdrant collection dimension mismatch fixed by dropping and recreating memmcp_notes.",
+    "Langfuse traces were missing because the public key env var was not exported.",
+    "Ollama embedding model nomic-embed-text needs to be pulled before the orchestrator starts.",
+    "Grid bot on ETH/USDC earned 1.8 percent daily while volatility stayed under two percent.",
+    "Memory bank writes fail with 502 when the stdio child crashes during npx install.",
+    "Mean reversion strategy paused: win rate dropped below 40 percent for three sessions.",
+    "Dashboard polling every second overloads the orchestrator; switched to five second refresh.",
+    "Trajectory ingest for project kalliste stores the full JSON plus a short summary.",
+    "Risk manager caps position size at two percent of capital per trade.",
+    "Docker compose profile 'lite' skips clickhouse and postgres to save memory.",
+    "MLX server on port 18087 serves qwen2.5-coder with safetensors weights.",
+    "Backtest of breakout strategy on BTC showed max drawdown of 12 percent in March.",
+    "Write-behind queue dead-letters jobs after five failed Qdrant upserts.",
+    "Router sends gguf model names to Ollama and mlx names to the MLX backend.",
+    "Daily PnL report aggregates realised and unrealised profit per strategy.",
+    "Supergateway exposes the memory MCP server over streamable HTTP on port 59081.",
+    "Arbitrage scanner found spreads above 30 basis points between two DEX pools.",
+    "Session notes: refactored the telemetry endpoints to keep history in a bounded deque.",
+    "Embedding cache keyed by provider, model, dimension and sha256 of the text.",
+    "Scalping strategy disabled on weekends because liquidity is too thin.",
+    "MindsDB proxy forwards SQL queries over SSE to the hosted gateway.",
+    "Capital allocation rebalanced: 60 percent trend following, 40 percent market making.",
+    "The promptfoo eval suite checks that summaries stay under 500 characters.",
+]
+
+QUERIES = [
+    (0, "why did the SOL momentum strategy stop out"),
+    (1, "qdrant dimension mismatch collection recreate"),
+    (2, "langfuse public key missing traces"),
+    (3, "pull nomic-embed-text for ollama embeddings"),
+    (4, "ETH grid bot daily return"),
+    (5, "memory bank 502 stdio child crash"),
+    (6, "mean reversion win rate below 40%"),
+    (7, "dashboard polling overload refresh interval"),
+    (8, "kalliste trajectory ingestion summary"),
+    (9, "position size limit per trade"),
+    (10, "lite compose profile without clickhouse"),
+    (11, "which port does the mlx qwen coder server use"),
+    (12, "BTC breakout backtest drawdown"),
+    (13, "dead letter after failed qdrant upserts"),
+    (14, "routing gguf models to ollama"),
+    (15, "daily pnl per strategy report"),
+    (16, "memory mcp streamable http gateway port"),
+    (17, "DEX arbitrage spread basis points"),
+    (18, "telemetry history bounded deque refactor"),
+    (19, "embedding cache key sha256"),
+    (20, "scalping disabled weekend liquidity"),
+    (21, "mindsdb sql over sse"),
+    (22, "capital allocation trend following market making"),
+    (23, "summary length eval promptfoo"),
+]
+
+
+def _trajectory(rng: random.Random, i: int) -> str:
+    steps = [
+        {"step": s, "action": rng.choice(["buy", "sell", "hold"]), "price": round(rng.uniform(10, 200), 4),
+         "note": f"signal {rng.randint(0, 999)} confidence {rng.random():.3f}"}
+        for s in range(rng.randint(10, 30))
+    ]
+    return json.dumps({"project": "kalliste", "run": i, "steps": steps})
+
+
+def _mrr(doc_vecs: np.ndarray, query_vecs: np.ndarray) -> tuple[float, float]:
+    scores = query_vecs @ doc_vecs.T
+    ranks = []
+    for qi, (target, _) in enumerate(QUERIES):
+        order = np.argsort(-scores[qi], kind="stable")
+        ranks.append(int(np.flatnonzero(order == target)[0]) + 1)
+    ranks_arr = np.asarray(ranks)
+    return float((ranks_arr == 1).mean()), float((1.0 / ranks_arr).mean())
+
+
+def _cheap_matrix(texts: list[str], dim: int) -> np.ndarray:
+    vecs = np.asarray([_cheap_embedding(t, dim) for t in texts], dtype=np.float32)
+    # cosine, as Qdrant would score it
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    return np.divide(vecs, norms, out=np.zeros_like(vecs), where=norms > 0)
+
+
+def _per_doc_us(run, count: int, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best / count * 1e6
+
+
+def main(args: argparse.Namespace) -> int:
+    rng = random.Random(7)
+    docs = [_trajectory(rng, i) for i in range(args.docs)]
+    embedder = HashedEmbedder(args.dim)
+
+    print(f"dim={args.dim}")
+    for label, corpus in (("trajectories", docs), ("short notes", NOTES * max(1, len(docs) // len(NOTES)))):
+        avg_bytes = sum(len(d) for d in corpus) / len(corpus)
+        cheap_us = _per_doc_us(lambda: [_cheap_embedding(d, args.dim) for d in corpus], len(corpus))
+        single_us = _per_doc_us(lambda: [embedder.embed([d]) for d in corpus], len(corpus))
+        batch_us = _per_doc_us(
+            lambda: [embedder.embed(corpus[i : i + args.batch]) for i in range(0, len(corpus), args.batch)],
+            len(corpus),
+        )
+        print(f"\n{len(corpus)} {label}, avg {avg_bytes:.0f} bytes")
+        print(f"  cheap (per doc):         {cheap_us:9.1f} us/doc")
+        print(f"  hashed (one at a time):  {single_us:9.1f} us/doc")
+        print(f"  hashed (batch={args.batch:<4d}):     {batch_us:9.1f} us/doc")
+
+    queries = [q for _, q in QUERIES]
+    worst = None
+    print(f"\nretrieval over {len(NOTES)} notes / {len(QUERIES)} queries")
+    for dim in sorted({32, args.dim}):
+        hashed = HashedEmbedder(dim)
+        c_top1, c_mrr = _mrr(_cheap_matrix(NOTES, dim), _cheap_matrix(queries, dim))
+        h_top1, h_mrr = _mrr(hashed.embed(NOTES), hashed.embed(queries))
+        print(f"dim={dim:<4d} cheap  top1={c_top1:.2f} mrr={c_mrr:.3f}   hashed top1={h_top1:.2f} mrr={h_mrr:.3f}")
+        margin = h_mrr - c_mrr
+        worst = margin if worst is None else min(worst, margin)
+    return 0 if worst is not None and worst > 0 else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--batch", type=int, default=64)
+    sys.exit(main(parser.parse_args()))
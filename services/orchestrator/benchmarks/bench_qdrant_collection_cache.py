@@ -0,0 +1,85 @@
+"""Round trips and latency per write with and without the collection cache.
+
+Runs ``--writes`` upserts against a mocked Qdrant that adds ``--rtt-ms`` to
+every request. The baseline re-checks the collection before each upsert (the
+old ``ensure_qdrant_collection`` behaviour); the cached path goes through
+``CollectionRegistry``.
+
+    python benchmarks/bench_qdrant_collection_cache.py --writes 200 --rtt-ms 2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from qdrant_collections import CollectionRegistry  # noqa: E402
+
+BASE = "http://qdrant.bench"
+DIM = 32
+
+
+def _mock_client(rtt: float) -> tuple[httpx.AsyncClient, dict]:
+    counts = {"requests": 0}
+    state = {"exists": False}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        counts["requests"] += 1
+        await asyncio.sleep(rtt)
+        if request.url.path.endswith("/points"):
+            return httpx.Response(200, json={"status": "ok"})
+        if request.method == "GET":
+            if not state["exists"]:
+                return httpx.Response(404, json={"status": "not found"})
+            return httpx.Response(
+                200, json={"result": {"config": {"params": {"vectors": {"size": DIM}}}}}
+            )
+        state["exists"] = True
+        return httpx.Response(200, json={"result": True})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), counts
+
+
+async def _run(writes: int, rtt: float, cached: bool, concurrency: int) -> tuple[int, float]:
+    client, counts = _mock_client(rtt)
+    registry = CollectionRegistry(BASE, lambda: client)
+    gate = asyncio.Semaphore(concurrency)
+
+    async def write() -> None:
+        async with gate:
+            if cached:
+                await registry.ensure("bench", DIM)
+            else:
+                await registry._resolve("bench", DIM)
+            await client.put(f"{BASE}/collections/bench/points", json={"points": []})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(write() for _ in range(writes)))
+    elapsed = time.perf_counter() - started
+    await client.aclose()
+    return counts["requests"], elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    rtt = args.rtt_ms / 1000.0
+    for label, cached in (("per-write check", False), ("cached", True)):
+        requests, elapsed = await _run(args.writes, rtt, cached, args.concurrency)
+        print(
+            f"{label:16s} round trips/write={requests / args.writes:5.2f}  "
+            f"avg latency/write={elapsed / args.writes * 1000 * args.concurrency:7.2f}ms  "
+            f"total={elapsed:6.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
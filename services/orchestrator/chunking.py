@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import re
+import uuid
+from dataclasses import dataclass
+
+# Word pieces are capped at 12 characters so hashes, base64 and long
+# identifiers count as several tokens, roughly as a BPE tokenizer would.
+_TOKEN = re.compile(r"\w{1,12}|[^\w\s]")
+_SENTENCE_END = frozenset(".!?;:")
+_CHUNK_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "memmcp:orchestrator:chunks")
+
+# Break priorities between two tokens; higher is a better place to split.
+_HEADING = 5
+_PARAGRAPH = 4
+_LINE = 3
+_SENTENCE = 2
+_SPACE = 1
+_GLUED = 0  # no whitespace, e.g. inside "foo.bar" or "1.5"
+
+
+@dataclass(frozen=True)
+class Chunk:
+    index: int
+    text: str
+    tokens: int
+
+
+def chunk_point_id(project: str, file_name: str, index: int) -> str:
+    """Stable Qdrant point id for chunk ``index`` of ``project/file_name``."""
+
+    return str(uuid.uuid5(_CHUNK_NAMESPACE, f"{project}\x00{file_name}\x00{index}"))
+
+
+class TextChunker:
+    """Split text into overlapping chunks of at most ``max_tokens`` tokens.
+
+    Tokens are approximated with a regex (word pieces and punctuation). Each
+    chunk ends at the strongest structural break in the second half of its
+    token window: a Markdown heading, then a blank line, a line break, a
+    sentence end and finally any whitespace. The next chunk starts up to
+    ``overlap`` tokens earlier, again at the strongest break in that range.
+    """
+
+    def __init__(self, max_tokens: int = 256, overlap: int = 32) -> None:
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        self.max_tokens = max_tokens
+        self.overlap = max(0, min(overlap, max_tokens // 2))
+
+    def split(self, text: str) -> list[Chunk]:
+        spans = [m.span() for m in _TOKEN.finditer(text)]
+        count = len(spans)
+        if not count:
+            return []
+        if count <= self.max_tokens:
+            return [Chunk(0, text[spans[0][0] : spans[-1][1]], count)]
+
+        breaks = _break_priorities(text, spans)
+        chunks: list[Chunk] = []
+        start = 0
+        while True:
+            limit = start + self.max_tokens
+            if limit >= count:
+                end = count
+            else:
+                # latest of the strongest breaks in the back half of the window
+                lo = start + self.max_tokens // 2 + 1
+                end = max(range(lo, limit + 1), key=lambda pos: (breaks[pos], pos))
+            chunks.append(Chunk(len(chunks), text[spans[start][0] : spans[end - 1][1]], end - start))
+            if end >= count:
+                return chunks
+            if self.overlap:
+                # earliest of the strongest breaks, to keep as much overlap as possible
+                lo = max(start + 1, end - self.overlap)
+                start = max(range(lo, end), key=lambda pos: (breaks[pos], -pos))
+            else:
+                start = end
+
+
+def _break_priorities(text: str, spans: list[tuple[int, int]]) -> list[int]:
+    """``breaks[i]`` scores splitting between token ``i - 1`` and token ``i``."""
+
+    breaks = [_GLUED] * (len(spans) + 1)
+    for i in range(1, len(spans)):
+        prev_end, next_start = spans[i - 1][1], spans[i][0]
+        if prev_end == next_start:
+            continue
+        gap = text[prev_end:next_start]
+        newlines = gap.count("\n")
+        if newlines and text.startswith("#", next_start):
+            breaks[i] = _HEADING
+        elif newlines > 1:
+            breaks[i] = _PARAGRAPH
+        elif newlines:
+            breaks[i] = _LINE
+        elif text[prev_end - 1] in _SENTENCE_END:
+            breaks[i] = _SENTENCE
+        else:
+            breaks[i] = _SPACE
+    return breaks
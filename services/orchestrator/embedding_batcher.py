@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from metrics import LatencyWindow
+
+logger = logging.getLogger("memmcp.orchestrator.embedding_batcher")
+
+EmbedMany = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent single-text embeds into one provider request.
+
+    Callers ``await embed(text)``; texts queued within ``window`` seconds (or
+    until ``max_batch`` is reached) are sent together through ``embed_many``
+    and each caller gets its own vector back. Duplicate texts inside a batch
+    are embedded once.
+    """
+
+    def __init__(self, embed_many: EmbedMany, *, max_batch: int = 32, window: float = 0.005) -> None:
+        self._embed_many = embed_many
+        self.max_batch = max(1, max_batch)
+        self.window = max(0.0, window)
+        self._pending: list[tuple[str, asyncio.Future, float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+        self.max_seen = 0
+        self.errors = 0
+        self.latency = LatencyWindow()
+
+    async def embed(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        self._pending.append((text, fut, time.perf_counter()))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[: self.max_batch]
+            self._pending = self._pending[self.max_batch :]
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future, float]]) -> None:
+        unique: list[str] = []
+        index: dict[str, int] = {}
+        for text, _, _ in batch:
+            if text not in index:
+                index[text] = len(unique)
+                unique.append(text)
+        self.batches += 1
+        self.items += len(batch)
+        self.max_seen = max(self.max_seen, len(unique))
+        try:
+            vectors = await self._embed_many(unique)
+            if len(vectors) != len(unique):
+                raise RuntimeError(
+                    f"Embedding provider returned {len(vectors)} vectors for {len(unique)} inputs"
+                )
+        except BaseException as exc:
+            self.errors += 1
+            for _, fut, _ in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        done = time.perf_counter()
+        for text, fut, queued in batch:
+            self.latency.record(done - queued)
+            if not fut.done():
+                fut.set_result(vectors[index[text]])
+
+    async def drain(self) -> None:
+        """Flush anything queued and wait for in-flight batches to finish."""
+
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "windowMs": round(self.window * 1000, 3),
+            "maxBatch": self.max_batch,
+            "batches": self.batches,
+            "items": self.items,
+            "avgBatchSize": round(self.items / self.batches, 3) if self.batches else 0.0,
+            "largestBatch": self.max_seen,
+            "errors": self.errors,
+            "pending": len(self._pending),
+            "latency": self.latency.snapshot(),
+        }
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict
+
+logger = logging.getLogger("memmcp.orchestrator.embedding_cache")
+
+
+def cache_key(provider: str, model: str, dim: int, text: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{provider}:{model}:{dim}:{digest}"
+
+
+class _DiskTier:
+    """SQLite-backed second tier so cached vectors survive restarts."""
+
+    def __init__(self, path: Path, max_entries: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, vector BLOB NOT NULL, used REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE embeddings SET used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, blob: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, vector, used) VALUES (?, ?, ?)",
+                (key, blob, time.time()),
+            )
+            self._puts += 1
+            if self.max_entries > 0 and self._puts % 256 == 0:
+                self._prune()
+            self._conn.commit()
+
+    def _prune(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN"
+                " (SELECT key FROM embeddings ORDER BY used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingCache:
+    """Entry- and byte-bounded LRU of embedding vectors with an optional SQLite tier.
+
+    Vectors are kept as float32 arrays; a ``max_entries`` of 0 disables the
+    cache entirely.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 4096,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_path: str | None = None,
+        disk_max_entries: int = 100_000,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, array] = OrderedDict()
+        self._bytes = 0
+        self._disk: _DiskTier | None = None
+        if disk_path and max_entries > 0:
+            try:
+                self._disk = _DiskTier(Path(disk_path), disk_max_entries)
+            except Exception as exc:  # pragma: no cover - bad path / read-only fs
+                logger.warning("Embedding disk cache disabled: %s", exc)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    async def get(self, key: str) -> list[float] | None:
+        if not self.enabled:
+            return None
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector.tolist()
+        if self._disk is not None:
+            try:
+                blob = await asyncio.to_thread(self._disk.get, key)
+            except Exception as exc:  # pragma: no cover - sqlite failure
+                logger.warning("Embedding disk cache read failed: %s", exc)
+                blob = None
+            if blob is not None:
+                vector = array("f")
+                vector.frombytes(blob)
+                self._remember(key, vector)
+                self.disk_hits += 1
+                return vector.tolist()
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, values: list[float]) -> None:
+        if not self.enabled:
+            return
+        vector = array("f", values)
+        self._remember(key, vector)
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.put, key, vector.tobytes())
+            except Exception as exc:  # pragma: no cover - sqlite failure
+                logger.warning("Embedding disk cache write failed: %s", exc)
+
+    def _remember(self, key: str, vector: array) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.itemsize * len(previous)
+        self._entries[key] = vector
+        self._bytes += vector.itemsize * len(vector)
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes > 0 and self._bytes > self.max_bytes)
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.itemsize * len(evicted)
+            self.evictions += 1
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "maxEntries": self.max_entries,
+            "maxBytes": self.max_bytes,
+            "disk": self._disk is not None,
+            "hits": self.hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+# Polynomial rolling hash over UTF-8 bytes. uint64 arithmetic wraps mod 2**64,
+# and an odd base is invertible there, so any substring hash can be read off
+# prefix sums without a Python-level loop.
+_BASE = np.uint64(0x100000001B3)
+_BASE_INV = np.uint64(pow(0x100000001B3, -1, 2**64))
+_MIX = np.uint64(0x9FB21C651E98DF25)
+_WORD_SALT = np.uint64(0x9E3779B97F4A7C15)
+_BIGRAM_SALT = np.uint64(0xD6E8FEB86659FD93)
+_SEP = b"\n"
+
+
+class HashedEmbedder:
+    """Signed feature-hashing embedder over character and word n-grams.
+
+    Each document is lowercased and split into byte 3-/4-grams (``char_ngrams``,
+    with a space pad at either end), words and word bigrams. Every
+    feature is hashed to a bucket and a +/-1 sign, counts are summed with
+    ``np.bincount`` and rows are L2-normalised, so cosine similarity tracks
+    shared n-grams. A batch is hashed in one pass over the concatenated bytes.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        *,
+        char_ngrams: Sequence[int] = (3, 4),
+        word_weight: float = 2.0,
+        bigram_weight: float = 1.0,
+    ) -> None:
+        if dim <= 0:
+            raise ValueError("dim must be positive")
+        if not set(char_ngrams) <= {3, 4}:
+            raise ValueError("char_ngrams may only contain 3 and 4")
+        self.dim = dim
+        self.char_ngrams = tuple(sorted(set(char_ngrams)))
+        self.word_weight = word_weight
+        self.bigram_weight = bigram_weight
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a ``(len(texts), dim)`` float32 matrix of unit-length rows."""
+
+        n_docs = len(texts)
+        if not n_docs:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        encoded = [b" " + text.lower().encode("utf-8") + b" " for text in texts]
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=n_docs)
+        buf = np.frombuffer(_SEP.join(encoded) + _SEP, dtype=np.uint8)
+        ends = np.cumsum(lengths + len(_SEP))
+        # per byte: owning document and where that document's text stops
+        doc_of_pos = np.repeat(np.arange(n_docs), lengths + len(_SEP))
+        end_of_pos = np.repeat(ends - len(_SEP), lengths + len(_SEP))
+
+        size = n_docs * self.dim * 2
+        slot_of_pos = doc_of_pos * (self.dim * 2)
+        bases, hashes, weights = [], [], []
+
+        # 3- and 4-byte windows pack exactly into a uint32; 0xFF never occurs in
+        # UTF-8, so it tags 3-grams apart from 4-grams without a hash
+        wide = buf.astype(np.uint32)
+        grams = {}
+        if len(buf) >= 3:
+            grams[3] = (wide[:-2] | (wide[1:-1] << 8) | (wide[2:] << 16)) | np.uint32(0xFF000000)
+        if len(buf) >= 4 and 4 in self.char_ngrams:
+            grams[4] = (grams[3][:-1] & np.uint32(0xFFFFFF)) | (wide[3:] << 24)
+        for n in self.char_ngrams:
+            gram = grams.get(n)
+            if gram is None:
+                continue
+            count = len(gram)
+            # n-grams running past their document go to a spare slot that is dropped
+            bases.append(np.where(np.arange(n, len(buf) + 1) <= end_of_pos[:count], slot_of_pos[:count], size))
+            hashes.append(gram.astype(np.uint64))
+            weights.append(1.0)
+
+        # the buffer starts and ends with non-word bytes, so every word has both edges
+        is_word = (buf >= 0x80) | _ALNUM[buf]
+        w_lo = np.flatnonzero(is_word[1:] & ~is_word[:-1]) + 1
+        if len(w_lo):
+            w_hi = np.flatnonzero(is_word[:-1] & ~is_word[1:]) + 1
+            prefix, inv_pow = _prefix_hashes(buf)
+            w_hash = ((prefix[w_hi] - prefix[w_lo]) * inv_pow[w_lo]) ^ _WORD_SALT
+            w_base = slot_of_pos[w_lo]
+            bases.append(w_base)
+            hashes.append(w_hash)
+            weights.append(self.word_weight)
+            same = doc_of_pos[w_lo[1:]] == doc_of_pos[w_lo[:-1]]
+            if same.any():
+                bases.append(w_base[1:][same])
+                hashes.append((w_hash[:-1][same] * _BASE + w_hash[1:][same]) ^ _BIGRAM_SALT)
+                weights.append(self.bigram_weight)
+
+        counts = np.zeros(size, dtype=np.float32)
+        if hashes:
+            h = np.concatenate(hashes)
+            h *= _MIX
+            # multiply-shift maps the well-mixed top 32 bits onto [0, 2 * dim):
+            # bucket in the high part, sign in the low bit
+            h >>= np.uint64(32)
+            h *= np.uint64(2 * self.dim)
+            h >>= np.uint64(32)
+            slot = h.view(np.int64)
+            slot += np.concatenate(bases)
+            # one unweighted bincount per feature kind is several times faster
+            # than a single weighted one
+            offset = 0
+            for base, weight in zip(bases, weights):
+                part = slot[offset : offset + len(base)]
+                offset += len(base)
+                counts += weight * np.bincount(part, minlength=size)[:size]
+
+        pairs = counts.reshape(n_docs, self.dim, 2)
+        out = pairs[:, :, 0] - pairs[:, :, 1]
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+_ALNUM = np.zeros(256, dtype=bool)
+for _lo, _hi in ((ord("0"), ord("9")), (ord("a"), ord("z")), (ord("A"), ord("Z"))):
+    _ALNUM[_lo : _hi + 1] = True
+_ALNUM[ord("_")] = True
+
+
+_powers = np.ones(1, dtype=np.uint64)
+_inv_powers = np.ones(1, dtype=np.uint64)
+
+
+def _power_tables(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """``BASE**i`` and ``BASE**-i`` for ``i <= n``; grown geometrically and reused."""
+
+    global _powers, _inv_powers
+    if len(_powers) <= n:
+        size = max(n + 1, 2 * len(_powers))
+        powers = np.full(size, _BASE, dtype=np.uint64)
+        inv = np.full(size, _BASE_INV, dtype=np.uint64)
+        powers[0] = inv[0] = 1
+        with np.errstate(over="ignore"):
+            np.cumprod(powers, out=powers)
+            np.cumprod(inv, out=inv)
+        _powers, _inv_powers = powers, inv
+    return _powers, _inv_powers
+
+
+def _prefix_hashes(buf: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    n = len(buf)
+    powers, inv = _power_tables(n)
+    prefix = np.zeros(n + 1, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        np.cumsum((buf.astype(np.uint64) + np.uint64(1)) * powers[:n], out=prefix[1:])
+    return prefix, inv
@@ -0,0 +1,714 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+try:  # optional: only needed for ORCH_HISTORY_COMPRESS=zstd
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+logger = logging.getLogger("memmcp.orchestrator.history_store")
+
+# index block: [start, end, line count, min timestamp, max timestamp], offsets into
+# the uncompressed segment; compressed segments add [frame start, frame end]
+Block = list
+FSYNC_POLICIES = ("none", "interval", "batch")
+
+
+def to_epoch(value: Any) -> float | None:
+    """Seconds since the epoch for an ISO string, datetime or number; naive means UTC."""
+
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return None
+
+
+@dataclass
+class _Segment:
+    seq: int
+    path: Path
+    partition: int
+    size: int = 0  # bytes written; readers never look past this
+    end: int = 0  # bytes assigned, including lines not yet flushed
+    blocks: list[Block] | None = None  # None until the .idx sidecar is read
+    sealed: bool = False
+    compressed: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def base(self) -> Path:
+        return self.path.parent / self.path.name.split(".", 1)[0]
+
+    @property
+    def index_path(self) -> Path:
+        return self.base.with_suffix(".idx")
+
+
+class HistoryStore:
+    """Append-only snapshot history split into time-partitioned NDJSON segments.
+
+    A new segment starts whenever a snapshot's timestamp enters a later
+    ``partition_seconds`` window, or the active one would grow past
+    ``max_segment_bytes``. Every ``index_every`` lines the segment's
+    ``.idx`` sidecar gains one block entry (byte range, count, min/max
+    timestamp), so range queries only read the blocks that can match and
+    startup only reads the newest ``tail`` snapshots.
+
+    ``append`` assigns the snapshot its position and keeps it in ``recent``
+    without touching the disk; ``flush`` (blocking, meant for a worker thread)
+    writes everything appended so far. Positions double as pagination cursors
+    (``"<segment>:<offset>"``): a page holds the newest matching snapshots that
+    precede the cursor, oldest first.
+
+    With ``compression="zstd"`` sealed segments are rewritten as one zstd
+    frame per index block, so a range read still only decompresses the blocks
+    it needs.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        tail: int = 256,
+        partition_seconds: float = 86400.0,
+        index_every: int = 128,
+        max_segment_bytes: int = 0,
+        compression: str | None = None,
+        zstd_level: int = 3,
+        fsync_sealed: bool = True,
+        legacy_path: Path | None = None,
+    ) -> None:
+        self.directory = directory
+        self.partition_seconds = max(1.0, partition_seconds)
+        self.index_every = max(1, index_every)
+        self.max_segment_bytes = max(0, max_segment_bytes)
+        if compression == "zstd" and zstandard is None:
+            logger.warning("History compression needs the zstandard package; segments stay uncompressed")
+            compression = None
+        elif compression not in (None, "", "none", "zstd"):
+            raise ValueError(f"Unknown history compression {compression!r}")
+        self.compression = compression if compression == "zstd" else None
+        self.zstd_level = zstd_level
+        self.fsync_sealed = fsync_sealed
+        self.legacy_path = legacy_path
+        self.recent: deque[tuple[int, int, Dict[str, Any]]] = deque(maxlen=max(1, tail))
+        self._segments: list[_Segment] = []
+        self._open: Block | None = None  # block of the active segment not yet in its index
+        self._pending: list[tuple[_Segment, str, bytes]] = []
+        self._handles: Dict[tuple[int, str], Any] = {}
+        self._unsynced: set[Any] = set()
+        self._to_compress: deque[_Segment] = deque()
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self.appended = 0
+        self.flushes = 0
+        self.writes = 0
+        self.fsyncs = 0
+        self.rotations = 0
+        self.compressed_segments = 0
+        self.pages = 0
+        self.blocks_read = 0
+
+    # -- writing -------------------------------------------------------------
+
+    def append(self, snapshot: Dict[str, Any]) -> None:
+        line = (json.dumps(snapshot) + "\n").encode("utf-8")
+        ts = to_epoch(snapshot.get("timestamp"))
+        with self._lock:
+            partition = math.floor((ts if ts is not None else time.time()) / self.partition_seconds)
+            segment = self._segments[-1] if self._segments else None
+            if segment is None or segment.sealed or partition > segment.partition:
+                self._seal_active()
+                segment = self._new_segment(partition)
+            elif self.max_segment_bytes and segment.end and segment.end + len(line) > self.max_segment_bytes:
+                self._seal_active()
+                segment = self._new_segment(segment.partition)
+                self.rotations += 1
+            offset = segment.end
+            segment.end += len(line)
+            self._pending.append((segment, "data", line))
+            self._extend_open_block(segment, offset, ts)
+            self.recent.append((segment.seq, offset, snapshot))
+            self.appended += 1
+
+    @property
+    def version(self) -> int:
+        """Changes whenever a snapshot is appended; for cache validators."""
+
+        return self.appended
+
+    @property
+    def unsynced(self) -> bool:
+        return bool(self._unsynced)
+
+    def flush(self, sync: bool = False) -> int:
+        """Write every appended snapshot and index entry; ``sync`` also fsyncs.
+
+        Returns the number of snapshots written.
+        """
+
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            # one write per file; data before index entries so an index never
+            # points past the data (recovery drops such entries anyway)
+            grouped: Dict[tuple[str, int], tuple[_Segment, list[bytes]]] = {}
+            for segment, kind, payload in pending:
+                grouped.setdefault((kind, segment.seq), (segment, []))[1].append(payload)
+            written = 0
+            for (kind, _), (segment, payloads) in sorted(grouped.items(), key=lambda item: item[0][0] != "data"):
+                handle = self._handle(segment, kind)
+                handle.write(b"".join(payloads))
+                handle.flush()
+                self._unsynced.add(handle)
+                self.writes += 1
+                if kind == "data":
+                    written += len(payloads)
+                    with self._lock:
+                        segment.size = handle.tell()
+            self._retire_handles()
+            if sync and self._unsynced:
+                for handle in self._unsynced:
+                    os.fsync(handle.fileno())
+                self._unsynced.clear()
+                self.fsyncs += 1
+            if pending:
+                self.flushes += 1
+            return written
+
+    def close(self) -> None:
+        self.flush(sync=self.fsync_sealed)
+        with self._io_lock:
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+
+    def _new_segment(self, partition: int) -> _Segment:
+        seq = self._segments[-1].seq + 1 if self._segments else 1
+        started = datetime.fromtimestamp(partition * self.partition_seconds, tz=timezone.utc)
+        name = f"{seq:06d}-{started.strftime('%Y%m%dT%H%M%S')}.ndjson"
+        segment = _Segment(seq, self.directory / name, partition, blocks=[])
+        self._segments.append(segment)
+        return segment
+
+    def _extend_open_block(self, segment: _Segment, offset: int, ts: float | None) -> None:
+        block = self._open
+        if block is None:
+            block = self._open = [offset, offset, 0, ts, ts]
+        block[1] = segment.end
+        block[2] += 1
+        if ts is not None:
+            block[3] = ts if block[3] is None else min(block[3], ts)
+            block[4] = ts if block[4] is None else max(block[4], ts)
+        if block[2] >= self.index_every:
+            self._close_open_block(segment)
+
+    def _close_open_block(self, segment: _Segment) -> None:
+        block, self._open = self._open, None
+        if block is None:
+            return
+        assert segment.blocks is not None
+        segment.blocks.append(block)
+        self._pending.append((segment, "index", (json.dumps(block) + "\n").encode("utf-8")))
+
+    def _seal_active(self) -> None:
+        if self._segments:
+            segment = self._segments[-1]
+            self._close_open_block(segment)
+            segment.sealed = True
+            if self.compression:
+                self._to_compress.append(segment)
+
+    def _retire_handles(self) -> None:
+        """Close files of sealed segments; everything they need is written by now."""
+
+        active = self._segments[-1].seq if self._segments else None
+        for key in [key for key in self._handles if key[0] != active]:
+            retired = self._handles.pop(key)
+            if retired in self._unsynced:
+                self._unsynced.discard(retired)
+                if self.fsync_sealed:
+                    os.fsync(retired.fileno())
+            retired.close()
+
+    def _handle(self, segment: _Segment, kind: str):
+        key = (segment.seq, kind)
+        handle = self._handles.get(key)
+        if handle is None:
+            path = segment.path if kind == "data" else segment.index_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handle = self._handles[key] = path.open("ab")
+        return handle
+
+    # -- loading -------------------------------------------------------------
+
+    def load(self) -> list[Dict[str, Any]]:
+        """Open the segments on disk and return the newest ``tail`` snapshots."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for leftover in self.directory.glob("*.tmp"):
+            leftover.unlink()  # interrupted compression
+        found: Dict[int, _Segment] = {}
+        for path in sorted(self.directory.glob("*.ndjson*")):
+            compressed = path.name.endswith(".ndjson.zst")
+            if not compressed and not path.name.endswith(".ndjson"):
+                continue
+            try:
+                seq_text, started_text = path.name.split(".", 1)[0].split("-", 1)
+                started = datetime.strptime(started_text, "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+            except ValueError:
+                logger.warning("Ignoring unexpected history file %s", path)
+                continue
+            seq = int(seq_text)
+            if seq in found:
+                # compression finished but the plain file was not removed yet
+                stale = path if compressed else found[seq].path
+                logger.warning("Removing duplicate history segment %s", stale)
+                stale.unlink()
+                if compressed:
+                    continue
+            partition = math.floor(started.timestamp() / self.partition_seconds)
+            # compressed segments are bounded by their index, which is read on first use
+            size = sys.maxsize if compressed else path.stat().st_size
+            found[seq] = _Segment(seq, path, partition, size=size, end=size, compressed=compressed, sealed=compressed)
+        segments = [found[seq] for seq in sorted(found)]
+        for segment in segments[:-1]:
+            segment.sealed = True
+            if self.compression and not segment.compressed:
+                self._to_compress.append(segment)
+        with self._lock:
+            self._segments = segments
+        if self._segments and not self._segments[-1].sealed:
+            self._recover_active()
+        elif self.legacy_path is not None and self.legacy_path.exists():
+            self._migrate_legacy()
+        self.flush(sync=self.fsync_sealed)
+        recent = list(self._scan(None, None, self.recent.maxlen or 1, None))
+        recent.reverse()
+        self.recent.clear()
+        self.recent.extend(recent)
+        return [snapshot for _, _, snapshot in recent]
+
+    def _recover_active(self) -> None:
+        """Trim a torn last line and rebuild the index past its last block."""
+
+        segment = self._segments[-1]
+        size = segment.size
+        blocks = [block for block in self._read_index(segment) if block[1] <= size]
+        start = blocks[-1][1] if blocks else 0
+        unindexed = self._read_range(segment, start, size)
+        keep = start + unindexed.rfind(b"\n") + 1
+        if keep < size:
+            logger.warning("Dropping %d bytes of a partial line from %s", size - keep, segment.path)
+            with segment.path.open("rb+") as handle:
+                handle.truncate(keep)
+            size = keep
+        segment.size = segment.end = size
+        segment.blocks = blocks
+        if segment.index_path.exists():
+            # rewrite without entries lost to a crash or past a truncated tail
+            segment.index_path.write_bytes(b"".join((json.dumps(b) + "\n").encode("utf-8") for b in blocks))
+        for offset, raw in _split_lines(unindexed, start):
+            try:
+                ts = to_epoch(json.loads(raw).get("timestamp"))
+            except ValueError:
+                ts = None
+            segment.end = offset + len(raw) + 1
+            self._extend_open_block(segment, offset, ts)
+        segment.end = size
+
+    def _migrate_legacy(self) -> None:
+        assert self.legacy_path is not None
+        started = time.perf_counter()
+        migrated = 0
+        with self.legacy_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self.append(json.loads(line))
+                except ValueError:
+                    continue
+                migrated += 1
+                if migrated % 4096 == 0:
+                    self.flush()
+        self.flush()
+        self.legacy_path.rename(self.legacy_path.with_name(self.legacy_path.name + ".migrated"))
+        logger.info(
+            "Migrated %d snapshots from %s in %.1fs", migrated, self.legacy_path, time.perf_counter() - started
+        )
+
+    # -- reading -------------------------------------------------------------
+
+    def tail(self, limit: int) -> tuple[list[Dict[str, Any]], str | None] | None:
+        """Newest ``limit`` snapshots from memory, or None if older ones are on disk only."""
+
+        held = len(self.recent)
+        if limit > held and held == self.recent.maxlen:
+            return None
+        # walk in from the right end; only the returned entries are touched
+        items = list(islice(reversed(self.recent), limit))
+        items.reverse()
+        return [snapshot for _, _, snapshot in items], self._cursor_before(items)
+
+    def query(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[Dict[str, Any]], str | None]:
+        """Newest ``limit`` snapshots within [since, until] that precede ``cursor``, oldest first.
+
+        Raises ValueError for a malformed cursor. Blocking: reads segment files.
+        """
+
+        position = _parse_cursor(cursor) if cursor else None
+        items = list(self._scan(since, until, limit, position))
+        items.reverse()
+        self.pages += 1
+        next_cursor = self._cursor_before(items) if len(items) == limit else None
+        return [snapshot for _, _, snapshot in items], next_cursor
+
+    def _cursor_before(self, items: list[tuple[int, int, Dict[str, Any]]]) -> str | None:
+        if not items:
+            return None
+        seq, offset, _ = items[0]
+        first = self._segments[0].seq if self._segments else seq
+        if seq == first and offset == 0:
+            return None
+        return f"{seq}:{offset}"
+
+    def _scan(
+        self,
+        since: float | None,
+        until: float | None,
+        limit: int,
+        position: tuple[int, int] | None,
+    ) -> Iterator[tuple[int, int, Dict[str, Any]]]:
+        """Yield (segment, offset, snapshot) newest first."""
+
+        filtered = since is not None or until is not None
+        with self._lock:
+            segments = [(segment, segment.size) for segment in self._segments]
+            active = self._segments[-1] if self._segments and not self._segments[-1].sealed else None
+            if active is not None:
+                # the active segment's blocks change under append; copy them together
+                active_blocks = list(active.blocks or [])
+                if self._open is not None:
+                    active_blocks.append(list(self._open))
+        found = 0
+        for segment, size in reversed(segments):
+            if position is not None and segment.seq > position[0]:
+                continue
+            stop = position[1] if position is not None and segment.seq == position[0] else size
+            blocks = active_blocks if segment is active else self._blocks(segment)
+            for block in reversed(blocks):
+                start, end, _, lo, hi = block[:5]
+                if start >= stop:
+                    continue
+                if filtered and (
+                    hi is None or (since is not None and hi < since) or (until is not None and lo > until)
+                ):
+                    continue
+                end = min(end, stop, size)
+                if end <= start:
+                    continue
+                self.blocks_read += 1
+                for offset, raw in reversed(_split_lines(self._read_range(segment, start, end), start)):
+                    try:
+                        snapshot = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if filtered:
+                        ts = to_epoch(snapshot.get("timestamp"))
+                        if ts is None or (since is not None and ts < since) or (until is not None and ts > until):
+                            continue
+                    yield segment.seq, offset, snapshot
+                    found += 1
+                    if found >= limit:
+                        return
+
+    def _blocks(self, segment: _Segment) -> list[Block]:
+        if segment.blocks is None:
+            with segment.lock:
+                if segment.blocks is None:
+                    segment.blocks = self._read_index(segment)
+        return segment.blocks
+
+    def _read_index(self, segment: _Segment) -> list[Block]:
+        blocks: list[Block] = []
+        if segment.index_path.exists():
+            for line in segment.index_path.read_text(encoding="utf-8").splitlines():
+                try:
+                    blocks.append(json.loads(line))
+                except ValueError:
+                    break  # torn final entry
+        if segment.sealed and not segment.compressed:
+            # a sealed segment whose last index entries were lost: one block for the rest
+            covered = blocks[-1][1] if blocks else 0
+            if covered < segment.size:
+                blocks.append([covered, segment.size, 0, -math.inf, math.inf])
+        return blocks
+
+    def _read_range(self, segment: _Segment, start: int, end: int) -> bytes:
+        if segment.sealed:
+            self._blocks(segment)
+        with segment.lock:
+            compressed, path, blocks = segment.compressed, segment.path, segment.blocks
+        if not compressed:
+            try:
+                with path.open("rb") as handle:
+                    handle.seek(start)
+                    return handle.read(end - start)
+            except FileNotFoundError:
+                if segment.compressed:  # swapped for its .zst while we looked
+                    return self._read_range(segment, start, end)
+                raise
+        assert blocks is not None
+        first = max(0, bisect.bisect_right(blocks, start, key=lambda block: block[0]) - 1)
+        parts = []
+        decompressor = zstandard.ZstdDecompressor()
+        with path.open("rb") as handle:
+            for block in blocks[first:]:
+                if block[0] >= end:
+                    break
+                handle.seek(block[5])
+                parts.append(decompressor.decompress(handle.read(block[6] - block[5])))
+        base = blocks[first][0]
+        return b"".join(parts)[start - base : end - base]
+
+    def compress_sealed(self) -> int:
+        """Rewrite fully written sealed segments as per-block zstd frames (blocking)."""
+
+        done = 0
+        while self._to_compress:
+            segment = self._to_compress[0]
+            with self._lock:
+                if any(entry[0] is segment for entry in self._pending):
+                    break  # its last lines are not on disk yet
+            self._to_compress.popleft()
+            if segment.compressed:
+                continue
+            try:
+                self._compress(segment)
+                done += 1
+            except Exception as exc:  # pragma: no cover - disk full, etc.
+                logger.warning("Failed to compress history segment %s: %s", segment.path, exc)
+        return done
+
+    def _compress(self, segment: _Segment) -> None:
+        blocks = self._blocks(segment)
+        compressor = zstandard.ZstdCompressor(level=self.zstd_level)
+        target = segment.base.parent / (segment.base.name + ".ndjson.zst")
+        tmp_data = target.with_name(target.name + ".tmp")
+        tmp_index = segment.index_path.with_name(segment.index_path.name + ".tmp")
+        framed: list[Block] = []
+        with segment.path.open("rb") as src, tmp_data.open("wb") as dst:
+            for block in blocks:
+                src.seek(block[0])
+                frame_start = dst.tell()
+                dst.write(compressor.compress(src.read(block[1] - block[0])))
+                framed.append(list(block[:5]) + [frame_start, dst.tell()])
+            dst.flush()
+            os.fsync(dst.fileno())
+        with tmp_index.open("wb") as handle:
+            handle.write(b"".join((json.dumps(block) + "\n").encode("utf-8") for block in framed))
+            handle.flush()
+            os.fsync(handle.fileno())
+        # the new index is valid for the plain file too, so either crash point is safe
+        os.replace(tmp_index, segment.index_path)
+        os.replace(tmp_data, target)
+        with segment.lock:
+            plain = segment.path
+            segment.path, segment.blocks, segment.compressed = target, framed, True
+        plain.unlink()
+        self.compressed_segments += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            segments = len(self._segments)
+            compressed = sum(1 for segment in self._segments if segment.compressed)
+            size = sum(segment.size for segment in self._segments if not segment.compressed)
+            active = self._segments[-1].path.name if self._segments else None
+            pending = len(self._pending)
+        return {
+            "directory": str(self.directory),
+            "segments": segments,
+            "compressedSegments": compressed,
+            "uncompressedBytes": size,
+            "activeSegment": active,
+            "recent": len(self.recent),
+            "appended": self.appended,
+            "pending": pending,
+            "flushes": self.flushes,
+            "writes": self.writes,
+            "fsyncs": self.fsyncs,
+            "rotations": self.rotations,
+            "compressions": self.compressed_segments,
+            "pages": self.pages,
+            "blocksRead": self.blocks_read,
+        }
+
+
+class HistoryWriter:
+    """Group-commit writer: one long-lived thread flushes a ``HistoryStore``.
+
+    ``await commit()`` after ``store.append`` returns once that snapshot is
+    written. Commits that arrive while a batch is being written share the next
+    batch, so a burst costs one write per file instead of one thread hop and
+    one open/close per snapshot. ``fsync`` is ``"none"`` (leave it to the OS),
+    ``"interval"`` (at most every ``fsync_interval`` seconds, also when idle)
+    or ``"batch"`` (before every commit returns).
+    """
+
+    def __init__(self, store: HistoryStore, *, fsync: str = "interval", fsync_interval: float = 1.0) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+        self.store = store
+        self.fsync = fsync
+        self.fsync_interval = max(0.0, fsync_interval)
+        self._cond = threading.Condition()
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._thread: threading.Thread | None = None
+        self._closing = False
+        self._last_sync = time.monotonic()
+        self.batches = 0
+        self.commits = 0
+        self.max_batch = 0
+        self.errors = 0
+        self.flush_seconds = 0.0
+
+    async def commit(self) -> None:
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("history writer is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"history-writer-{self.store.directory.name}", daemon=True
+                )
+                self._thread.start()
+            self._waiters.append((loop, fut))
+            self._cond.notify()
+        await fut
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write and sync what is pending, stop the thread and close the store."""
+
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self.store.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._waiters and not self._closing:
+                    timeout = None
+                    if self.fsync == "interval" and self.store.unsynced:
+                        timeout = self._last_sync + self.fsync_interval - time.monotonic()
+                        if timeout <= 0:
+                            break
+                    self._cond.wait(timeout)
+                waiters, self._waiters = self._waiters, []
+                closing = self._closing
+            now = time.monotonic()
+            sync = self.fsync == "batch" or (
+                self.fsync == "interval" and (closing or now - self._last_sync >= self.fsync_interval)
+            )
+            error: BaseException | None = None
+            try:
+                self.store.flush(sync=sync)
+            except Exception as exc:  # pragma: no cover - disk full, etc.
+                logger.warning("History flush to %s failed: %s", self.store.directory, exc)
+                self.errors += 1
+                error = exc
+            if sync:
+                self._last_sync = now
+            if waiters:
+                self.flush_seconds += time.monotonic() - now
+                self.batches += 1
+                self.commits += len(waiters)
+                self.max_batch = max(self.max_batch, len(waiters))
+            for loop, fut in waiters:
+                try:
+                    loop.call_soon_threadsafe(_settle, fut, error)
+                except RuntimeError:  # loop already closed
+                    pass
+            self.store.compress_sealed()
+            if closing:
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fsync": self.fsync,
+            "fsyncIntervalSeconds": self.fsync_interval,
+            "batches": self.batches,
+            "commits": self.commits,
+            "avgBatch": round(self.commits / self.batches, 2) if self.batches else 0.0,
+            "maxBatch": self.max_batch,
+            "errors": self.errors,
+            "avgFlushMs": round(self.flush_seconds / self.batches * 1000, 3) if self.batches else 0.0,
+        }
+
+
+def _settle(fut: asyncio.Future, error: BaseException | None) -> None:
+    if fut.done():
+        return
+    if error is None:
+        fut.set_result(None)
+    else:
+        fut.set_exception(error)
+
+
+def _parse_cursor(cursor: str) -> tuple[int, int]:
+    try:
+        seq, offset = cursor.split(":", 1)
+        return int(seq), int(offset)
+    except ValueError:
+        raise ValueError(f"Invalid history cursor: {cursor!r}") from None
+
+
+def _split_lines(data: bytes, base: int) -> list[tuple[int, bytes]]:
+    """Complete lines of ``data`` with their absolute offsets."""
+
+    lines = []
+    pos = 0
+    while True:
+        newline = data.find(b"\n", pos)
+        if newline < 0:
+            return lines
+        if newline > pos:
+            lines.append((base + pos, data[pos:newline]))
+        pos = newline + 1
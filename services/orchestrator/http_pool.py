@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import httpx
+
+logger = logging.getLogger("memmcp.orchestrator.http_pool")
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """Connection pool settings for a single upstream service."""
+
+    name: str
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    timeout: float = 30.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls, name: str, **defaults: Any) -> "UpstreamConfig":
+        """Build a config, letting ``ORCH_POOL_<NAME>_*`` env vars override defaults."""
+
+        prefix = f"ORCH_POOL_{name.upper().replace('-', '_')}_"
+        base = cls(name=name, **defaults)
+
+        def _get(key: str, cast, current):
+            raw = os.getenv(prefix + key)
+            if raw is None or raw == "":
+                return current
+            if cast is bool:
+                return raw.lower() in ("1", "true", "yes", "on")
+            return cast(raw)
+
+        return cls(
+            name=name,
+            max_connections=_get("MAX_CONNECTIONS", int, base.max_connections),
+            max_keepalive=_get("MAX_KEEPALIVE", int, base.max_keepalive),
+            keepalive_expiry=_get("KEEPALIVE_EXPIRY", float, base.keepalive_expiry),
+            connect_timeout=_get("CONNECT_TIMEOUT", float, base.connect_timeout),
+            timeout=_get("TIMEOUT", float, base.timeout),
+            http2=_get("HTTP2", bool, base.http2),
+        )
+
+
+class PoolStats:
+    """Running counters for one upstream pool."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.new_connections = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        avg = self.wait_total / self.wait_count if self.wait_count else 0.0
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "inFlight": self.in_flight,
+            "newConnections": self.new_connections,
+            "waitAvgMs": round(avg * 1000, 3),
+            "waitMaxMs": round(self.wait_max * 1000, 3),
+        }
+
+
+class _InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """Transport that measures how long requests wait for a pooled connection.
+
+    httpcore emits trace events once a request owns a connection (either a new
+    TCP connect or the first header write on a reused one); the time until
+    that first event is the pool wait.
+    """
+
+    def __init__(self, stats: PoolStats, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._stats = stats
+
+    @property
+    def pool(self) -> Any:
+        return self._pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self._stats
+        started = time.perf_counter()
+        acquired = False
+        upstream_trace = request.extensions.get("trace")
+
+        async def _trace(event_name: str, info: Dict[str, Any]) -> None:
+            nonlocal acquired
+            if not acquired and (
+                event_name.startswith("connection.connect_tcp.")
+                or ".send_request_headers." in event_name
+            ):
+                acquired = True
+                stats.record_wait(time.perf_counter() - started)
+            if event_name == "connection.connect_tcp.complete":
+                stats.new_connections += 1
+            if upstream_trace is not None:
+                result = upstream_trace(event_name, info)
+                if hasattr(result, "__await__"):
+                    await result
+
+        request.extensions["trace"] = _trace
+        stats.requests += 1
+        stats.in_flight += 1
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ClientRegistry:
+    """One keep-alive ``httpx.AsyncClient`` per upstream, tied to the app lifespan."""
+
+    def __init__(self, configs: list[UpstreamConfig]) -> None:
+        self._configs = {cfg.name: cfg for cfg in configs}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, _InstrumentedTransport] = {}
+        self._stats: Dict[str, PoolStats] = {name: PoolStats() for name in self._configs}
+
+    def _build(self, cfg: UpstreamConfig) -> httpx.AsyncClient:
+        http2 = cfg.http2
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 requested for %s but 'h2' is not installed; using HTTP/1.1", cfg.name)
+            http2 = False
+        limits = httpx.Limits(
+            max_connections=cfg.max_connections,
+            max_keepalive_connections=cfg.max_keepalive,
+            keepalive_expiry=cfg.keepalive_expiry,
+        )
+        transport = _InstrumentedTransport(
+            self._stats[cfg.name], limits=limits, http2=http2
+        )
+        self._transports[cfg.name] = transport
+        timeout = httpx.Timeout(cfg.timeout, connect=cfg.connect_timeout)
+        return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            cfg = self._configs.get(name)
+            if cfg is None:
+                raise KeyError(f"Unknown upstream: {name}")
+            client = self._build(cfg)
+            self._clients[name] = client
+        return client
+
+    async def start(self) -> None:
+        for name in self._configs:
+            self.get(name)
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        self._transports = {}
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception as exc:  # pragma: no cover - shutdown best-effort
+                logger.warning("Failed to close HTTP client: %s", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name, cfg in self._configs.items():
+            entry = self._stats[name].snapshot()
+            entry["maxConnections"] = cfg.max_connections
+            entry["maxKeepalive"] = cfg.max_keepalive
+            entry["http2"] = cfg.http2
+            active = idle = 0
+            transport = self._transports.get(name)
+            pool = getattr(transport, "pool", None) if transport else None
+            for conn in getattr(pool, "connections", []) or []:
+                if conn.is_idle():
+                    idle += 1
+                else:
+                    active += 1
+            entry["activeConnections"] = active
+            entry["idleConnections"] = idle
+            out[name] = entry
+        return out
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Dict
+
+import httpx
+
+logger = logging.getLogger("memmcp.orchestrator.mcp_client")
+
+SESSION_HEADER = "Mcp-Session-Id"
+# handshake statuses meaning "this server has no sessions", as opposed to a
+# gateway that is down or still starting
+STATELESS_STATUSES = frozenset({404, 405})
+
+
+class MCPError(RuntimeError):
+    """Transport-level failure talking to an MCP server."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class SSEDecoder:
+    """Incremental ``text/event-stream`` decoder working on raw bytes.
+
+    ``feed`` returns the ``(event, data)`` pairs completed by the chunk; only
+    the unfinished tail is kept between calls and already-scanned bytes are
+    not rescanned, so large frames split over many chunks stay linear.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._scanned = 0
+        self._data: list[bytes] = []
+        self._event: str | None = None
+
+    def feed(self, chunk: bytes) -> list[tuple[str | None, bytes]]:
+        self._buf += chunk
+        events: list[tuple[str | None, bytes]] = []
+        start = 0
+        search = self._scanned
+        while True:
+            nl = self._buf.find(b"\n", search)
+            if nl == -1:
+                break
+            line = bytes(self._buf[start:nl])
+            start = search = nl + 1
+            self._line(line.rstrip(b"\r"), events)
+        if start:
+            del self._buf[:start]
+        self._scanned = len(self._buf)
+        return events
+
+    def close(self) -> list[tuple[str | None, bytes]]:
+        events: list[tuple[str | None, bytes]] = []
+        if self._buf:
+            self._line(bytes(self._buf).rstrip(b"\r"), events)
+            self._buf.clear()
+            self._scanned = 0
+        self._line(b"", events)
+        return events
+
+    def _line(self, line: bytes, events: list[tuple[str | None, bytes]]) -> None:
+        if not line:
+            if self._data:
+                events.append((self._event, b"\n".join(self._data)))
+            self._data = []
+            self._event = None
+            return
+        if line.startswith(b":"):
+            return
+        field, _, value = line.partition(b":")
+        if value.startswith(b" "):
+            value = value[1:]
+        if field == b"data":
+            self._data.append(value)
+        elif field == b"event":
+            self._event = value.decode("utf-8", "replace")
+
+
+class MCPSession:
+    """Reusable streamable-HTTP MCP client session.
+
+    The ``initialize`` handshake runs once (single-flight) and the returned
+    ``Mcp-Session-Id`` is sent on every later request. If the server forgets
+    the session (HTTP 404) the handshake is redone and the request retried.
+    Servers that don't speak sessions are used statelessly. Any other failed
+    handshake is retried on a later request, after an exponential backoff
+    between ``retry_min`` and ``retry_max`` seconds.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        get_client: Callable[[], httpx.AsyncClient],
+        headers: Dict[str, str],
+        *,
+        client_name: str = "memmcp-orchestrator",
+        client_version: str = "0.1.0",
+        retry_min: float = 0.5,
+        retry_max: float = 30.0,
+    ) -> None:
+        self.url = url
+        self._get_client = get_client
+        self._headers = dict(headers)
+        self._client_info = {"name": client_name, "version": client_version}
+        self.session_id: str | None = None
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+        self.initializations = 0
+        self.init_failures = 0
+        self.retry_min = retry_min
+        self.retry_max = retry_max
+        self._retry_at = 0.0
+
+    def _request_headers(self) -> Dict[str, str]:
+        headers = dict(self._headers)
+        if self.session_id:
+            headers[SESSION_HEADER] = self.session_id
+        return headers
+
+    async def initialize(self) -> None:
+        if self._initialized or time.monotonic() < self._retry_at:
+            return
+        async with self._init_lock:
+            if self._initialized or time.monotonic() < self._retry_at:
+                return
+            payload = {
+                "jsonrpc": "2.0",
+                "id": str(uuid.uuid4()),
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": self._headers.get("MCP-Protocol-Version", "2024-11-05"),
+                    "capabilities": {},
+                    "clientInfo": self._client_info,
+                },
+            }
+            client = self._get_client()
+            try:
+                async with client.stream("POST", self.url, json=payload, headers=self._headers) as resp:
+                    await resp.aread()
+                    if resp.status_code != 200:
+                        raise MCPError(resp.status_code, resp.text)
+                    self.session_id = resp.headers.get(SESSION_HEADER)
+                notify = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+                await client.post(self.url, json=notify, headers=self._request_headers())
+            except MCPError as exc:
+                self.session_id = None
+                if exc.status_code not in STATELESS_STATUSES:
+                    # e.g. a 502 while the gateway cold-starts: go stateless for
+                    # now and redo the handshake once the backoff has passed
+                    self.init_failures += 1
+                    delay = min(self.retry_max, self.retry_min * 2 ** (self.init_failures - 1))
+                    self._retry_at = time.monotonic() + delay
+                    logger.warning("MCP initialize failed, retrying in %.1fs: %s", delay, exc)
+                    return
+                # Stateless gateways reject the handshake; plain tool calls still work.
+                logger.info("MCP server has no sessions, continuing statelessly: %s", exc)
+            self.initializations += 1
+            self.init_failures = 0
+            self._retry_at = 0.0
+            self._initialized = True
+
+    def reset(self) -> None:
+        self.session_id = None
+        self._initialized = False
+
+    async def messages(self, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Send a JSON-RPC request and yield response messages as they arrive."""
+
+        await self.initialize()
+        for attempt in range(2):
+            had_session = self.session_id is not None
+            client = self._get_client()
+            async with client.stream("POST", self.url, json=payload, headers=self._request_headers()) as resp:
+                if resp.status_code == 404 and had_session and attempt == 0:
+                    await resp.aread()
+                    self.reset()
+                    await self.initialize()
+                    continue
+                if resp.status_code not in (200, 202):
+                    body = await resp.aread()
+                    raise MCPError(resp.status_code, body.decode("utf-8", "replace"))
+                content_type = resp.headers.get("content-type", "")
+                if "text/event-stream" in content_type:
+                    decoder = SSEDecoder()
+                    async for chunk in resp.aiter_bytes():
+                        for _, data in decoder.feed(chunk):
+                            message = _parse_message(data)
+                            if message is not None:
+                                yield message
+                    for _, data in decoder.close():
+                        message = _parse_message(data)
+                        if message is not None:
+                            yield message
+                else:
+                    body = await resp.aread()
+                    if body.strip():
+                        yield json.loads(body)
+            return
+
+    async def call(self, payload: Dict[str, Any]) -> Dict[str, Any] | None:
+        """Return the response matching ``payload['id']`` (or the last message)."""
+
+        request_id = payload.get("id")
+        last: Dict[str, Any] | None = None
+        async with aclosing(self.messages(payload)) as stream:
+            async for message in stream:
+                if request_id is not None and message.get("id") == request_id:
+                    return message
+                last = message
+        return last
+
+    async def aclose(self) -> None:
+        if not self.session_id:
+            return
+        try:
+            await self._get_client().delete(self.url, headers=self._request_headers(), timeout=5.0)
+        except Exception as exc:  # pragma: no cover - shutdown best-effort
+            logger.debug("Failed to close MCP session: %s", exc)
+        self.reset()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessionId": self.session_id,
+            "initialized": self._initialized,
+            "initializations": self.initializations,
+            "initFailures": self.init_failures,
+        }
+
+
+def _parse_message(data: bytes) -> Dict[str, Any] | None:
+    try:
+        message = json.loads(data)
+    except ValueError:
+        logger.debug("Skipping non-JSON SSE frame: %r", data[:80])
+        return None
+    return message if isinstance(message, dict) else None
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Dict
+
+
+class LatencyWindow:
+    """Bounded window of recent latency samples (seconds) with percentile helpers."""
+
+    def __init__(self, size: int = 1024) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, pct: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+        return ordered[idx]
+
+    def snapshot(self) -> Dict[str, Any]:
+        avg = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "avgMs": round(avg * 1000, 3),
+            "p50Ms": round(self.percentile(50) * 1000, 3),
+            "p99Ms": round(self.percentile(99) * 1000, 3),
+        }
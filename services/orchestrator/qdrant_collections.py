@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict
+
+import httpx
+
+logger = logging.getLogger("memmcp.orchestrator.qdrant_collections")
+
+
+class CollectionRegistry:
+    """Remembers which (collection, dim) pairs are known to exist in Qdrant.
+
+    The first ``ensure`` for a pair does the GET (and PUT to create, if
+    needed); concurrent callers for the same pair share that single in-flight
+    check. Later calls are a set lookup until ``invalidate`` is called after a
+    Qdrant error.
+
+    With ``vector_name`` the dense vector is a named one, and ``sparse_vectors``
+    (name -> Qdrant sparse params) are created alongside it; an existing
+    collection missing either is reported rather than silently used.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        get_client: Callable[[], httpx.AsyncClient],
+        *,
+        vector_name: str | None = None,
+        sparse_vectors: Dict[str, Dict[str, Any]] | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self._get_client = get_client
+        self.vector_name = vector_name
+        self.sparse_vectors = dict(sparse_vectors or {})
+        self._ready: set[tuple[str, int]] = set()
+        self._inflight: Dict[tuple[str, int], asyncio.Future] = {}
+        self.checks = 0
+        self.creates = 0
+        self.hits = 0
+        self.invalidations = 0
+
+    def is_ready(self, collection: str, dim: int) -> bool:
+        return (collection, dim) in self._ready
+
+    def invalidate(self, collection: str, dim: int | None = None) -> None:
+        self.invalidations += 1
+        if dim is None:
+            self._ready = {key for key in self._ready if key[0] != collection}
+        else:
+            self._ready.discard((collection, dim))
+
+    async def prime(self, collection: str) -> int | None:
+        """Look the collection up once and cache its dimension, if it exists."""
+
+        resp = await self._get_client().get(f"{self.base_url}/collections/{collection}", timeout=10.0)
+        self.checks += 1
+        if resp.status_code != 200:
+            return None
+        body = resp.json()
+        size = _vector_size(body, self.vector_name)
+        if size and not self._missing_sparse(body):
+            self._ready.add((collection, size))
+        return size
+
+    async def ensure(self, collection: str, dim: int) -> None:
+        key = (collection, dim)
+        if key in self._ready:
+            self.hits += 1
+            return
+        pending = self._inflight.get(key)
+        if pending is not None:
+            await asyncio.shield(pending)
+            return
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            await self._resolve(collection, dim)
+        except BaseException as exc:
+            fut.set_exception(exc)
+            # Mark retrieved so a failure with no concurrent waiters isn't logged as unhandled.
+            fut.exception()
+            raise
+        else:
+            self._ready.add(key)
+            fut.set_result(None)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _resolve(self, collection: str, dim: int) -> None:
+        client = self._get_client()
+        resp = await client.get(f"{self.base_url}/collections/{collection}", timeout=10.0)
+        self.checks += 1
+        if resp.status_code == 200:
+            body = resp.json()
+            current_size = _vector_size(body, self.vector_name)
+            if self.vector_name and current_size is None:
+                raise RuntimeError(
+                    f"Qdrant collection {collection} has no dense vector named {self.vector_name!r}. "
+                    "Hybrid indexing needs a collection created with named vectors; use a new collection."
+                )
+            if current_size and current_size != dim:
+                raise RuntimeError(
+                    "Qdrant collection dimension mismatch: "
+                    f"existing={current_size}, required={dim}. "
+                    "Drop the collection or adjust the embedding model."
+                )
+            missing = self._missing_sparse(body)
+            if missing:
+                raise RuntimeError(
+                    f"Qdrant collection {collection} lacks sparse vectors {missing}. "
+                    "Use a new collection or disable sparse indexing."
+                )
+            return
+        dense = {"size": dim, "distance": "Cosine"}
+        schema: Dict[str, Any] = {
+            "vectors": {self.vector_name: dense} if self.vector_name else dense,
+        }
+        if self.sparse_vectors:
+            schema["sparse_vectors"] = self.sparse_vectors
+        create = await client.put(f"{self.base_url}/collections/{collection}", json=schema)
+        self.creates += 1
+        if create.status_code not in (200, 202):
+            raise RuntimeError(f"Failed to create Qdrant collection: {create.text}")
+
+    def _missing_sparse(self, body: Dict[str, Any]) -> list[str]:
+        existing = body.get("result", {}).get("config", {}).get("params", {}).get("sparse_vectors") or {}
+        return [name for name in self.sparse_vectors if name not in existing]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": [f"{name}:{dim}" for name, dim in sorted(self._ready)],
+            "checks": self.checks,
+            "creates": self.creates,
+            "hits": self.hits,
+            "invalidations": self.invalidations,
+        }
+
+
+def _vector_size(body: Dict[str, Any], name: str | None = None) -> int | None:
+    vectors = body.get("result", {}).get("config", {}).get("params", {}).get("vectors", {})
+    if not isinstance(vectors, dict):
+        return None
+    if name:
+        vectors = vectors.get(name)
+        return vectors.get("size") if isinstance(vectors, dict) else None
+    return vectors.get("size")
+
+
+def is_stale_collection_error(resp: httpx.Response) -> bool:
+    """True when an upsert failed because the cached collection state is wrong."""
+
+    if resp.status_code == 404:
+        return True
+    return resp.status_code == 400 and "dimension" in resp.text.lower()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger("memmcp.orchestrator.qdrant_writer")
+
+SendBatch = Callable[[list[Dict[str, Any]], bool], Awaitable[None]]
+Barrier = Callable[[], Awaitable[None]]
+
+_HISTOGRAM_BOUNDS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class QdrantWriter:
+    """Merge points from concurrent writers into batched Qdrant upserts.
+
+    Points are buffered until ``max_points`` are queued or ``window`` seconds
+    pass, then sent through ``send(points, wait)``. ``wait`` is Qdrant's own
+    flag: with ``qdrant_wait=False`` the server acknowledges before applying,
+    so callers that need read-after-write must ``await flush()`` first.
+    ``barrier`` must then be an update that changes nothing, sent with
+    ``wait=true``; Qdrant applies updates in order, so once it returns every
+    earlier ``wait=false`` batch has landed.
+    """
+
+    def __init__(
+        self,
+        send: SendBatch,
+        *,
+        max_points: int = 64,
+        window: float = 0.01,
+        qdrant_wait: bool = True,
+        barrier: Barrier | None = None,
+    ) -> None:
+        if not qdrant_wait and barrier is None:
+            raise ValueError("qdrant_wait=False needs a barrier for flush()")
+        self._send = send
+        self._barrier = barrier
+        self.max_points = max(1, max_points)
+        self.window = max(0.0, window)
+        self.qdrant_wait = qdrant_wait
+        self._points: list[Dict[str, Any]] = []
+        self._waiters: list[asyncio.Future] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._unapplied = False
+        self.batches = 0
+        self.points = 0
+        self.errors = 0
+        self.barriers = 0
+        self.histogram = {_bucket_label(size): 0 for size in _HISTOGRAM_BOUNDS}
+        self.histogram[f">{_HISTOGRAM_BOUNDS[-1]}"] = 0
+
+    async def upsert(self, points: list[Dict[str, Any]], *, wait: bool = True) -> None:
+        """Queue points; with ``wait`` block until their batch has been sent."""
+
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        self._points.extend(points)
+        self._waiters.append(fut)
+        if len(self._points) >= self.max_points or self.window == 0:
+            self._flush_pending(self.qdrant_wait)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush_pending, self.qdrant_wait)
+        if wait:
+            await fut
+        else:
+            fut.add_done_callback(_log_background_failure)
+
+    def _flush_pending(self, qdrant_wait: bool) -> asyncio.Task | None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._points:
+            return None
+        points, self._points = self._points, []
+        waiters, self._waiters = self._waiters, []
+        task = asyncio.create_task(self._run(points, waiters, qdrant_wait))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, points: list[Dict[str, Any]], waiters: list[asyncio.Future], qdrant_wait: bool) -> None:
+        try:
+            for start in range(0, len(points), self.max_points):
+                chunk = points[start : start + self.max_points]
+                await self._send(chunk, qdrant_wait)
+                self._record(len(chunk))
+        except Exception as exc:
+            self.errors += 1
+            for fut in waiters:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        self._unapplied = self._unapplied or not qdrant_wait
+        for fut in waiters:
+            if not fut.done():
+                fut.set_result(None)
+
+    async def flush(self) -> None:
+        """Barrier: returns once every queued point is sent and applied by Qdrant."""
+
+        self.barriers += 1
+        self._flush_pending(True)
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        if self._unapplied and self._barrier is not None:
+            # not a re-upsert of a point we sent: that would write back stale
+            # data over any later direct edit (payload updates, deletes)
+            await self._barrier()
+            self._unapplied = False
+
+    def _record(self, size: int) -> None:
+        self.batches += 1
+        self.points += size
+        for bound in _HISTOGRAM_BOUNDS:
+            if size <= bound:
+                self.histogram[_bucket_label(bound)] += 1
+                return
+        self.histogram[f">{_HISTOGRAM_BOUNDS[-1]}"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "maxPoints": self.max_points,
+            "windowMs": round(self.window * 1000, 3),
+            "qdrantWait": self.qdrant_wait,
+            "pendingPoints": len(self._points),
+            "inFlightBatches": len(self._tasks),
+            "batches": self.batches,
+            "points": self.points,
+            "avgBatchSize": round(self.points / self.batches, 3) if self.batches else 0.0,
+            "errors": self.errors,
+            "barriers": self.barriers,
+            "batchSizeHistogram": dict(self.histogram),
+        }
+
+
+def _bucket_label(bound: int) -> str:
+    return f"<={bound}"
+
+
+def _log_background_failure(fut: asyncio.Future) -> None:
+    if fut.cancelled():
+        return
+    exc = fut.exception()
+    if exc is not None:
+        logger.warning("Background Qdrant upsert failed: %s", exc)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+try:  # optional: only needed when ORCH_SPARSE_MODEL is set
+    from fastembed import SparseTextEmbedding
+except ImportError:  # pragma: no cover
+    SparseTextEmbedding = None
+
+logger = logging.getLogger("memmcp.orchestrator.sparse_embedding")
+
+
+class SparseEncoder:
+    """FastEmbed sparse model (BM25 / SPLADE) producing Qdrant sparse vectors.
+
+    The model is loaded on first use in a worker thread and encoding also runs
+    off the event loop. An encoder built with an empty ``model_name``, or
+    without ``fastembed`` installed, is disabled and ``enabled`` is false.
+    """
+
+    def __init__(self, model_name: str | None) -> None:
+        self.model_name = model_name or ""
+        self.enabled = bool(self.model_name) and SparseTextEmbedding is not None
+        if self.model_name and SparseTextEmbedding is None:
+            logger.warning("ORCH_SPARSE_MODEL=%s set but fastembed is not installed; sparse indexing off", model_name)
+        self._model: Any = None
+        self._load_lock = asyncio.Lock()
+        self.load_seconds: float | None = None
+        self.encoded = 0
+        self.encode_seconds = 0.0
+
+    @property
+    def uses_idf(self) -> bool:
+        # BM25 vectors carry term frequencies only; Qdrant applies IDF at query time
+        return "bm25" in self.model_name.lower()
+
+    async def _get_model(self) -> Any:
+        if self._model is None:
+            async with self._load_lock:
+                if self._model is None:
+                    started = time.perf_counter()
+                    self._model = await asyncio.to_thread(SparseTextEmbedding, model_name=self.model_name)
+                    self.load_seconds = time.perf_counter() - started
+        return self._model
+
+    async def encode(self, texts: list[str]) -> list[Dict[str, list]]:
+        """Return one ``{"indices": [...], "values": [...]}`` per text."""
+
+        model = await self._get_model()
+        started = time.perf_counter()
+        embeddings = await asyncio.to_thread(lambda: list(model.embed(texts)))
+        self.encode_seconds += time.perf_counter() - started
+        self.encoded += len(texts)
+        return [{"indices": e.indices.tolist(), "values": e.values.tolist()} for e in embeddings]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "model": self.model_name or None,
+            "loadMs": round(self.load_seconds * 1000, 1) if self.load_seconds is not None else None,
+            "encoded": self.encoded,
+            "avgEncodeMs": round(self.encode_seconds / self.encoded * 1000, 3) if self.encoded else 0.0,
+        }
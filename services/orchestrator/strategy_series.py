@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable
+
+import numpy as np
+
+from history_store import to_epoch
+
+FIELDS = ("capital", "win_rate", "daily_pnl")
+STATS = ("last", "avg", "min", "max", "change")
+
+
+def _column(values: np.ndarray) -> list[Any]:
+    """JSON-ready list with NaN (a missing value) as None."""
+
+    return [None if value != value else value for value in values.tolist()]
+
+
+class StrategySeries:
+    """Timestamp-ordered points for one strategy, held in NumPy arrays.
+
+    ``values`` has one column per entry of ``FIELDS``; a missing win rate or
+    daily PnL is stored as NaN. Only the newest ``max_points`` are kept: the
+    arrays grow to twice that and are then compacted in one move, so appends
+    stay amortised O(1).
+    """
+
+    def __init__(self, max_points: int) -> None:
+        self.max_points = max(1, max_points)
+        self._ts = np.empty(0, dtype=np.float64)
+        self._values = np.empty((0, len(FIELDS)), dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return min(self._size, self.max_points)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._ts[self._size - len(self) : self._size]
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values[self._size - len(self) : self._size]
+
+    def append(self, ts: float, row: Iterable[float]) -> None:
+        if self._size == len(self._ts):
+            self._reserve()
+        size = self._size
+        if size and ts < self._ts[size - 1]:
+            # late snapshot (e.g. a replayed backfill): keep the arrays sorted
+            pos = int(np.searchsorted(self._ts[:size], ts, side="right"))
+            self._ts[pos + 1 : size + 1] = self._ts[pos:size]
+            self._values[pos + 1 : size + 1] = self._values[pos:size]
+        else:
+            pos = size
+        self._ts[pos] = ts
+        self._values[pos] = tuple(row)
+        self._size += 1
+
+    def _reserve(self) -> None:
+        keep = len(self)
+        if len(self._ts) >= 2 * self.max_points:
+            # drop everything older than the retained window in one move
+            start = self._size - keep
+            self._ts[:keep] = self._ts[start : self._size]
+            self._values[:keep] = self._values[start : self._size]
+            self._size = keep
+            return
+        capacity = min(max(64, 2 * len(self._ts)), 2 * self.max_points)
+        ts = np.empty(capacity, dtype=np.float64)
+        values = np.empty((capacity, len(FIELDS)), dtype=np.float64)
+        ts[: self._size] = self._ts[: self._size]
+        values[: self._size] = self._values[: self._size]
+        self._ts, self._values = ts, values
+
+    def window(self, since: float | None, until: float | None) -> tuple[np.ndarray, np.ndarray]:
+        ts, values = self.timestamps, self.values
+        lo = 0 if since is None else int(np.searchsorted(ts, since, side="left"))
+        hi = len(ts) if until is None else int(np.searchsorted(ts, until, side="right"))
+        return ts[lo:hi], values[lo:hi]
+
+
+class SeriesIndex:
+    """Per-strategy series built from strategy snapshots, with aggregations.
+
+    Every ``StrategyEntry`` in an ingested snapshot becomes one point in the
+    series for its ``name``. History, bucketing and rankings slice the
+    arrays with ``searchsorted`` and reduce them with vectorised NumPy rather
+    than walking snapshot dicts. At most ``max_strategies`` series are kept;
+    beyond that the one that was updated least recently is dropped.
+    """
+
+    def __init__(self, *, max_points: int = 10_000, max_strategies: int = 512) -> None:
+        self.max_points = max_points
+        self.max_strategies = max(1, max_strategies)
+        self._series: Dict[str, StrategySeries] = {}
+        self.version = 0
+        self.points = 0
+        self.evicted = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._series
+
+    def add_snapshot(self, snapshot: Dict[str, Any]) -> int:
+        """Index every strategy in ``snapshot``; returns the number of points added."""
+
+        ts = to_epoch(snapshot.get("timestamp"))
+        if ts is None:
+            return 0
+        added = 0
+        for entry in snapshot.get("strategies") or ():
+            name = entry.get("name")
+            if name is None:
+                continue
+            name = str(name)
+            series = self._series.pop(name, None)
+            if series is None:
+                series = StrategySeries(self.max_points)
+                if len(self._series) >= self.max_strategies:
+                    # dicts keep insertion order and series are re-inserted on
+                    # update, so the first key is the least recently updated
+                    del self._series[next(iter(self._series))]
+                    self.evicted += 1
+            self._series[name] = series
+            series.append(ts, (_number(entry.get(field)) for field in FIELDS))
+            added += 1
+        if added:
+            self.version += 1
+            self.points += added
+        return added
+
+    def summary(self) -> list[Dict[str, Any]]:
+        rows = []
+        for name, series in sorted(self._series.items()):
+            if not len(series):
+                continue
+            ts = series.timestamps
+            last = dict(zip(FIELDS, _column(series.values[-1])))
+            rows.append({"name": name, "points": len(series), "first": ts[0].item(), "last": ts[-1].item(), **last})
+        return rows
+
+    def history(
+        self,
+        name: str,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int = 500,
+    ) -> Dict[str, Any]:
+        """Newest ``limit`` points of ``name`` in [since, until] as parallel columns, oldest first."""
+
+        ts, values = self._get(name).window(since, until)
+        if len(ts) > limit:
+            ts, values = ts[-limit:], values[-limit:]
+        page: Dict[str, Any] = {"name": name, "timestamps": ts.tolist()}
+        for i, field in enumerate(FIELDS):
+            page[field] = _column(values[:, i])
+        return page
+
+    def buckets(
+        self,
+        name: str,
+        interval: float,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int = 288,
+    ) -> list[Dict[str, Any]]:
+        """Newest ``limit`` epoch-aligned buckets of ``interval`` seconds with min/max/last/avg per field."""
+
+        if not interval > 0:
+            raise ValueError("interval must be positive")
+        ts, values = self._get(name).window(since, until)
+        if not len(ts):
+            return []
+        ids = np.floor(ts / interval)
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        if len(starts) > limit:
+            # drop whole buckets from the old end before reducing anything
+            cut = starts[-limit]
+            ts, values, ids, starts = ts[cut:], values[cut:], ids[cut:], starts[-limit:] - cut
+        ends = np.r_[starts[1:], len(ts)]
+
+        present = ~np.isnan(values)
+        counts = np.add.reduceat(present, starts, axis=0)
+        sums = np.add.reduceat(np.where(present, values, 0.0), starts, axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avgs = np.where(counts > 0, sums / counts, np.nan)
+        # fmin/fmax skip NaN unless a whole bucket is missing the field
+        mins = np.fmin.reduceat(values, starts, axis=0)
+        maxs = np.fmax.reduceat(values, starts, axis=0)
+        # index of the latest non-missing value at or before each row
+        latest = np.maximum.accumulate(np.where(present, np.arange(len(ts))[:, None], -1), axis=0)
+        last_idx = latest[ends - 1]
+        lasts = np.where(
+            last_idx >= starts[:, None],
+            np.take_along_axis(values, np.maximum(last_idx, 0), axis=0),
+            np.nan,
+        )
+
+        columns = {
+            "min": mins.T.tolist(),
+            "max": maxs.T.tolist(),
+            "last": lasts.T.tolist(),
+            "avg": avgs.T.tolist(),
+        }
+        bucket_starts = (ids[starts] * interval).tolist()
+        bucket_counts = (ends - starts).tolist()
+        rows = []
+        for b, start in enumerate(bucket_starts):
+            row: Dict[str, Any] = {"start": start, "count": bucket_counts[b]}
+            for i, field in enumerate(FIELDS):
+                row[field] = {stat: _scalar(column[i][b]) for stat, column in columns.items()}
+            rows.append(row)
+        return rows
+
+    def rank(
+        self,
+        field: str,
+        stat: str = "last",
+        *,
+        since: float | None = None,
+        limit: int = 10,
+        ascending: bool = False,
+    ) -> list[Dict[str, Any]]:
+        """Strategies ordered by ``stat`` of ``field`` over points since ``since``."""
+
+        if field not in FIELDS:
+            raise ValueError(f"field must be one of {', '.join(FIELDS)}")
+        if stat not in STATS:
+            raise ValueError(f"stat must be one of {', '.join(STATS)}")
+        col = FIELDS.index(field)
+        names: list[str] = []
+        scores: list[float] = []
+        for name, series in self._series.items():
+            _, values = series.window(since, None)
+            column = values[:, col]
+            column = column[~np.isnan(column)]
+            if not len(column):
+                continue
+            if stat == "last":
+                score = column[-1]
+            elif stat == "avg":
+                score = column.mean()
+            elif stat == "min":
+                score = column.min()
+            elif stat == "max":
+                score = column.max()
+            else:
+                score = column[-1] - column[0]
+            names.append(name)
+            scores.append(float(score))
+        if not scores:
+            return []
+        order = np.argsort(np.asarray(scores), kind="stable")
+        if not ascending:
+            order = order[::-1]
+        return [{"name": names[i], "value": scores[i]} for i in order[:limit].tolist()]
+
+    def _get(self, name: str) -> StrategySeries:
+        series = self._series.get(name)
+        if series is None:
+            raise KeyError(name)
+        return series
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "strategies": len(self._series),
+            "maxStrategies": self.max_strategies,
+            "maxPoints": self.max_points,
+            "retained": sum(len(series) for series in self._series.values()),
+            "points": self.points,
+            "evicted": self.evicted,
+            "version": self.version,
+        }
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _scalar(value: float) -> float | None:
+    return None if value != value else value
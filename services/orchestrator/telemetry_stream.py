@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Iterable
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger("memmcp.orchestrator.telemetry_stream")
+
+_REMOVED = object()
+
+
+class StreamFull(RuntimeError):
+    """Raised by ``subscribe`` when ``max_subscribers`` streams are open."""
+
+
+def keyed(items: Iterable[Dict[str, Any]], key: Callable[[Dict[str, Any]], str]) -> Dict[str, Dict[str, Any]]:
+    """``{key: item}`` in list order. A repeated key gets its occurrence number
+    appended (``SOL``, ``SOL#1``, ...) so no item is collapsed away."""
+
+    out: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        k = key(item)
+        if k in out:
+            n = 1
+            while f"{k}#{n}" in out:
+                n += 1
+            k = f"{k}#{n}"
+        out[k] = item
+    return out
+
+
+def diff_items(
+    old: Iterable[Dict[str, Any]],
+    new: Iterable[Dict[str, Any]],
+    key: Callable[[Dict[str, Any]], str],
+) -> tuple[Dict[str, Dict[str, Any]], list[str]]:
+    """Items of ``new`` that are added or changed, and keys gone from ``old``."""
+
+    before = keyed(old, key)
+    after = keyed(new, key)
+    upserts = {k: item for k, item in after.items() if before.get(k) != item}
+    removals = [k for k in before if k not in after]
+    return upserts, removals
+
+
+class _Subscriber:
+    """Pending changes for one stream, coalesced to the latest value per key."""
+
+    def __init__(self, snapshot: bytes) -> None:
+        self.snapshot: bytes | None = snapshot
+        self.fields: Dict[str, Dict[str, Any]] = {}
+        self.items: Dict[tuple[str, str], Dict[Hashable, Any]] = {}
+        self.wakeup = asyncio.Event()
+        self.changes = 0  # changes merged since the last delta was taken
+
+    def merge(
+        self,
+        section: str,
+        fields: Dict[str, Any] | None,
+        collection: str | None,
+        upserts: Dict[Hashable, Any] | None,
+        removals: Iterable[Hashable] | None,
+    ) -> None:
+        if fields:
+            self.fields.setdefault(section, {}).update(fields)
+            self.changes += len(fields)
+        if collection is not None:
+            pending = self.items.setdefault((section, collection), {})
+            for k, item in (upserts or {}).items():
+                pending[k] = item
+                self.changes += 1
+            for k in removals or ():
+                pending[k] = _REMOVED
+                self.changes += 1
+        self.wakeup.set()
+
+    def take_delta(self) -> tuple[Dict[str, Any] | None, int]:
+        """The pending delta (None if empty) and how many changes were merged away."""
+
+        if not self.fields and not self.items:
+            return None, 0
+        delta: Dict[str, Any] = {section: {"fields": fields} for section, fields in self.fields.items()}
+        entries = sum(len(fields) for fields in self.fields.values())
+        for (section, collection), pending in self.items.items():
+            delta.setdefault(section, {})[collection] = {
+                "upsert": [{"key": k, "item": item} for k, item in pending.items() if item is not _REMOVED],
+                "remove": [k for k, item in pending.items() if item is _REMOVED],
+            }
+            entries += len(pending)
+        coalesced = self.changes - entries
+        self.fields, self.items, self.changes = {}, {}, 0
+        return delta, coalesced
+
+
+class TelemetryHub:
+    """Fan telemetry changes out to Server-Sent Events subscribers.
+
+    A new stream first gets a ``snapshot`` event holding the full state, then
+    ``delta`` events with the fields that changed per section and, for keyed
+    collections (positions, strategies), the ``{"key", "item"}`` pairs that
+    were upserted and the keys that were removed. Keys are computed here
+    only; the snapshot carries them alongside each collection so clients
+    never derive their own. Changes are merged into each subscriber's pending delta, so a
+    slow consumer skips intermediate values instead of building a backlog;
+    ``min_interval`` caps how often one stream is written to.
+    """
+
+    def __init__(self, *, max_subscribers: int = 64, min_interval: float = 0.25, keepalive: float = 15.0) -> None:
+        self.max_subscribers = max_subscribers
+        self.min_interval = max(0.0, min_interval)
+        self.keepalive = keepalive
+        self._subscribers: set[_Subscriber] = set()
+        self.version = 0
+        self.published = 0
+        self.opened = 0
+        self.rejected = 0
+        self.deltas_sent = 0
+        self.coalesced = 0
+
+    @property
+    def active(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, snapshot: Dict[str, Any]) -> _Subscriber:
+        if len(self._subscribers) >= self.max_subscribers:
+            self.rejected += 1
+            raise StreamFull(f"{self.max_subscribers} telemetry streams already open")
+        subscriber = _Subscriber(_encode(snapshot))
+        self._subscribers.add(subscriber)
+        self.opened += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: _Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def response(self, subscriber: _Subscriber) -> "StreamResponse":
+        """SSE response for ``subscriber`` that unsubscribes it however the request ends."""
+
+        return StreamResponse(self, subscriber)
+
+    def publish(
+        self,
+        section: str,
+        *,
+        fields: Dict[str, Any] | None = None,
+        collection: str | None = None,
+        upserts: Dict[Hashable, Any] | None = None,
+        removals: Iterable[Hashable] | None = None,
+    ) -> None:
+        if not (fields or upserts or removals):
+            return
+        self.version += 1
+        self.published += 1
+        removals = list(removals or ())
+        for subscriber in self._subscribers:
+            subscriber.merge(section, fields, collection, upserts, removals)
+
+    async def stream(self, subscriber: _Subscriber) -> AsyncIterator[bytes]:
+        """SSE byte stream for ``subscriber``; unsubscribes when the client goes away."""
+
+        try:
+            snapshot, subscriber.snapshot = subscriber.snapshot, None
+            yield _event("snapshot", self.version, snapshot)
+            last_sent = time.monotonic()
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.wakeup.wait(), timeout=self.keepalive)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                # let a burst of ingests collapse into one delta
+                wait = last_sent + self.min_interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                subscriber.wakeup.clear()
+                delta, coalesced = subscriber.take_delta()
+                if delta is None:
+                    continue
+                self.coalesced += coalesced
+                self.deltas_sent += 1
+                yield _event("delta", self.version, _encode(delta))
+                last_sent = time.monotonic()
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "maxSubscribers": self.max_subscribers,
+            "minIntervalMs": round(self.min_interval * 1000, 1),
+            "version": self.version,
+            "published": self.published,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "deltasSent": self.deltas_sent,
+            "coalesced": self.coalesced,
+        }
+
+
+class StreamResponse(StreamingResponse):
+    """Streams ``TelemetryHub.stream`` and unsubscribes even if the body never starts.
+
+    A client that disconnects before the first byte cancels the response
+    before Starlette iterates the generator, so its ``finally`` alone would
+    leave the subscriber counted against ``max_subscribers`` for good.
+    """
+
+    def __init__(self, hub: TelemetryHub, subscriber: _Subscriber) -> None:
+        super().__init__(
+            hub.stream(subscriber),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.hub = hub
+        self.subscriber = subscriber
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.hub.unsubscribe(self.subscriber)
+
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _event(name: str, version: int, data: bytes) -> bytes:
+    return b"event: " + name.encode() + b"\nid: " + str(version).encode() + b"\ndata: " + data + b"\n\n"
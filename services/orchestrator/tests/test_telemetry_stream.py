@@ -0,0 +1,53 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from telemetry_stream import StreamFull, TelemetryHub  # noqa: E402
+
+SCOPE = {"type": "http", "asgi": {"version": "3.0", "spec_version": "2.3"}, "method": "GET", "path": "/telemetry/stream"}
+
+
+async def _disconnected():
+    return {"type": "http.disconnect"}
+
+
+def test_disconnect_before_first_byte_unsubscribes():
+    hub = TelemetryHub(max_subscribers=1)
+
+    async def send(message):
+        # the client is already gone when the response starts
+        raise OSError("client disconnected")
+
+    async def run():
+        response = hub.response(hub.subscribe({}))
+        with pytest.raises(Exception):
+            await response(SCOPE, _disconnected, send)
+
+    asyncio.run(run())
+    assert hub.stats()["subscribers"] == 0
+    hub.subscribe({})  # the slot is free again, not StreamFull
+
+
+def test_disconnect_while_streaming_unsubscribes():
+    hub = TelemetryHub(max_subscribers=1, keepalive=60)
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        await asyncio.wait_for(hub.response(hub.subscribe({"a": 1}))(SCOPE, _disconnected, send), timeout=5)
+
+    asyncio.run(run())
+    assert hub.stats()["subscribers"] == 0
+
+
+def test_subscriber_cap():
+    hub = TelemetryHub(max_subscribers=1)
+    hub.subscribe({})
+    with pytest.raises(StreamFull):
+        hub.subscribe({})
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any, Callable, Dict
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+# ETags embed a per-process id because versions restart at zero on boot
+_BOOT = uuid.uuid4().hex[:8]
+
+
+def make_etag(*parts: Any) -> str:
+    return 'W/"' + "-".join([_BOOT, *(str(part) for part in parts)]) + '"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # weak comparison, as RFC 9110 asks for If-None-Match
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def json_response(request: Request, etag: str, body: bytes | Callable[[], bytes]) -> Response:
+    """``304`` if the client already has ``etag``, else ``body`` (built lazily) as JSON."""
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body() if callable(body) else body, media_type="application/json", headers=headers)
+
+
+def encode(payload: Any) -> bytes:
+    return orjson.dumps(payload, default=str)
+
+
+class VersionedState:
+    """A mutable state dict with a version counter and a cached JSON body.
+
+    Writers mutate ``data`` and call ``bump()``; the body is encoded once per
+    version, on the first read after a change, and every reader of that
+    version shares the same bytes and ETag.
+    """
+
+    def __init__(self, name: str, data: Dict[str, Any]) -> None:
+        self.name = name
+        self.data = data
+        self.version = 0
+        self._body: bytes | None = None
+        self.encodes = 0
+        self.reads = 0
+        self.not_modified = 0
+
+    def bump(self) -> None:
+        self.version += 1
+        self._body = None
+
+    @property
+    def etag(self) -> str:
+        return make_etag(self.name, self.version)
+
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = encode(self.data)
+            self.encodes += 1
+        return self._body
+
+    def response(self, request: Request) -> Response:
+        self.reads += 1
+        response = json_response(request, self.etag, self.body)
+        if response.status_code == 304:
+            self.not_modified += 1
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "reads": self.reads,
+            "notModified": self.not_modified,
+            "encodes": self.encodes,
+        }
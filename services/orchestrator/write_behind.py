@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger("memmcp.orchestrator.write_behind")
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+@dataclass
+class _Job:
+    payload: Dict[str, Any]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+
+class WriteBehindQueue:
+    """Bounded asyncio queue drained by workers that retry with backoff.
+
+    ``submit`` never blocks: when the queue is full it returns ``False`` so the
+    caller can push back (HTTP 429). Jobs that exhaust their retries, or are
+    still queued at shutdown, are appended to ``dead_letter_path`` as NDJSON.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        *,
+        maxsize: int = 1000,
+        workers: int = 4,
+        max_attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        dead_letter_path: Path | None = None,
+    ) -> None:
+        self.name = name
+        self._handler = handler
+        self._queue: asyncio.Queue[_Job] | None = None
+        self.maxsize = maxsize
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.dead_letter_path = dead_letter_path
+        self._tasks: list[asyncio.Task] = []
+        self._in_flight = 0
+        self._interrupted: list[_Job] = []
+        self.updated_at: str | None = None
+        self.last_lag = 0.0
+        self.totals = {
+            "enqueued": 0,
+            "dropped": 0,
+            "attempts": 0,  # handler calls, retries included
+            "completed": 0,  # jobs the handler accepted
+            "retries": 0,
+            "deadLettered": 0,
+        }
+
+    @property
+    def queue(self) -> asyncio.Queue[_Job]:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        return self._queue
+
+    def has_capacity(self) -> bool:
+        return not self.queue.full()
+
+    def submit(self, payload: Dict[str, Any]) -> bool:
+        try:
+            self.queue.put_nowait(_Job(payload))
+        except asyncio.QueueFull:
+            self.totals["dropped"] += 1
+            return False
+        self.totals["enqueued"] += 1
+        return True
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"write-behind-{self.name}-{idx}")
+            for idx in range(self.workers)
+        ]
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Write-behind queue %s did not drain within %.1fs", self.name, drain_timeout)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        leftovers, self._interrupted = self._interrupted, []
+        while not self.queue.empty():
+            leftovers.append(self.queue.get_nowait())
+            self.queue.task_done()
+        if leftovers:
+            await self._dead_letter(leftovers, "shutdown")
+
+    async def _worker(self) -> None:
+        queue = self.queue
+        while True:
+            job = await queue.get()
+            self._in_flight += 1
+            try:
+                await self._process(job)
+            except asyncio.CancelledError:
+                self._interrupted.append(job)
+                raise
+            finally:
+                self._in_flight -= 1
+                queue.task_done()
+
+    async def _process(self, job: _Job) -> None:
+        while True:
+            job.attempts += 1
+            self.totals["attempts"] += 1
+            try:
+                await self._handler(job.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if job.attempts >= self.max_attempts:
+                    logger.warning(
+                        "Write-behind %s job failed after %d attempts: %s", self.name, job.attempts, exc
+                    )
+                    await self._dead_letter([job], str(exc))
+                    return
+                self.totals["retries"] += 1
+                delay = min(self.backoff_max, self.backoff_base * (2 ** (job.attempts - 1)))
+                await asyncio.sleep(delay * (0.5 + random.random() / 2))
+                continue
+            self.totals["completed"] += 1
+            self.last_lag = time.monotonic() - job.enqueued_at
+            self.updated_at = datetime.now(timezone.utc).isoformat()
+            return
+
+    async def dead_letter(self, payload: Dict[str, Any], reason: str) -> None:
+        """Record a payload that could not be queued so it can be replayed later."""
+
+        await self._dead_letter([_Job(payload)], reason)
+
+    async def _dead_letter(self, jobs: list[_Job], reason: str) -> None:
+        self.totals["deadLettered"] += len(jobs)
+        if self.dead_letter_path is None:
+            return
+        lines = "".join(
+            json.dumps(
+                {
+                    "queue": self.name,
+                    "reason": reason,
+                    "attempts": job.attempts,
+                    "failedAt": datetime.now(timezone.utc).isoformat(),
+                    "payload": job.payload,
+                },
+                default=str,
+            )
+            + "\n"
+            for job in jobs
+        )
+
+        def _append(path: Path, payload: str) -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(payload)
+
+        try:
+            await asyncio.to_thread(_append, self.dead_letter_path, lines)
+        except Exception as exc:  # pragma: no cover - disk full, etc.
+            logger.warning("Failed to write dead-letter entries for %s: %s", self.name, exc)
+
+    def stats(self) -> Dict[str, Any]:
+        """Depth, lag and job counters; jobs are handled one at a time, not batched."""
+
+        return {
+            "updatedAt": self.updated_at,
+            "queueDepth": self.queue.qsize() + self._in_flight,
+            "totals": dict(self.totals),
+            "lagMs": round(self.last_lag * 1000, 3),
+            "capacity": self.maxsize,
+            "workers": self.workers,
+        }